@@ -0,0 +1,57 @@
+''' Measure the startup time of RLCard in fresh Python processes
+
+For each environment, a new interpreter is started that imports rlcard and
+makes the environment, which is what a short-lived evaluation worker pays.
+The time of a bare `import rlcard` is reported as a baseline.
+'''
+import argparse
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(code, repeats):
+    ''' Time a Python snippet in fresh interpreters
+
+    Args:
+        code (str): The code to time. It runs after the interpreter has started.
+        repeats (int): The number of interpreters to start
+
+    Returns:
+        (list): The times in milliseconds
+    '''
+    program = ('import time; start = time.perf_counter()\n'
+               '{}\n'
+               'print((time.perf_counter() - start) * 1000)').format(code)
+    times = []
+    for _ in range(repeats):
+        output = subprocess.check_output([sys.executable, '-c', program], cwd=ROOT, universal_newlines=True)
+        times.append(float(output.splitlines()[-1]))
+    return times
+
+def run(args):
+    sys.path.insert(0, ROOT)
+    from rlcard.envs.registration import registry
+    env_ids = args.env or list(registry.env_specs)
+
+    rows = [('import rlcard', measure('import rlcard', args.repeats))]
+    for env_id in env_ids:
+        code = 'import rlcard\nrlcard.make({!r})'.format(env_id)
+        rows.append(('make {}'.format(env_id), measure(code, args.repeats)))
+
+    print('{:<28}{:>12}{:>12}'.format('', 'median (ms)', 'min (ms)'))
+    for name, times in rows:
+        print('{:<28}{:>12.1f}{:>12.1f}'.format(name, np.median(times), np.min(times)))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Startup benchmark in RLCard")
+    parser.add_argument('--env', type=str, nargs='*', default=None,
+            help='The environments to make. All the registered environments are used by default.')
+    parser.add_argument('--repeats', type=int, default=5)
+
+    args = parser.parse_args()
+
+    run(args)
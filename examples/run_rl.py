@@ -10,7 +10,7 @@ from datetime import datetime
 import rlcard
 from rlcard import models
 from rlcard.agents import RandomAgent
-from rlcard.utils import get_device, set_seed, tournament_random_opponents, reorganize, Logger, plot_curve
+from rlcard.utils import get_device, set_seed, tournament_random_opponents, TrajectoryBuffer, Logger, plot_curve
 
 def train(args):
 
@@ -61,6 +61,9 @@ def train(args):
     # rule_agent_v3 = models.load('go-fish-v3').agents[0]
     # opponent_agents.append(rule_agent_v3)
 
+    # Record the games of the agent in columns
+    buffer = TrajectoryBuffer(env.state_shape[0], env.num_actions, obs_dtype=env.obs_dtype)
+
     # Start training
     start_time = datetime.now()
     best_reward = 0
@@ -74,17 +77,14 @@ def train(args):
             if args.algorithm == 'nfsp':
                 agents[0].sample_episode_policy()
 
-            # Generate data from the environment
-            trajectories, payoffs = env.run(is_training=True)
-
-            # Reorganaize the data to be state, action, reward, next_state, done
-            trajectories = reorganize(trajectories, payoffs)
+            # Generate data from the environment. Here, we assume that the agent
+            # always plays the first position and the other players play randomly (if any)
+            buffer.clear()
+            buffer.record(env, is_training=True, player_ids=[0])
 
-            # Feed transitions into agent memory, and train the agent
-            # Here, we assume that DQN always plays the first position
-            # and the other players play randomly (if any)
-            for ts in trajectories[0]:
-                agent.feed(ts)
+            # Feed the transitions (state, action, reward, next_state, done) into
+            # agent memory, and train the agent
+            agent.feed_batch(buffer.transitions())
 
             # Evaluate the performance. Play with random agents.
             if episode % args.evaluate_every == 0:
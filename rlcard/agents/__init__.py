@@ -1,20 +1,53 @@
-import subprocess
-import sys
-from distutils.version import LooseVersion
+''' The agents of RLCard
 
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
+The agents that need torch, and the human agents that import the games they
+are made for, are only imported the first time they are accessed, e.g. by
+`from rlcard.agents import DQNAgent`, so importing this package stays cheap.
+'''
+import importlib
+import importlib.util
 
-if 'torch' in installed_packages:
-    from rlcard.agents.dqn_agent import DQNAgent as DQNAgent
-    from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
-
-from rlcard.agents.cfr_agent import CFRAgent
-from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
-from rlcard.agents.human_agents.nolimit_holdem_human_agent import HumanAgent as NolimitholdemHumanAgent
-from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as LeducholdemHumanAgent
-from rlcard.agents.human_agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgent
-from rlcard.agents.human_agents.uno_human_agent import HumanAgent as UnoHumanAgent
-from rlcard.agents.human_agents.go_fish_human_agent import HumanAgent as GoFishHumanAgent
-from rlcard.agents.human_agents.hearts_human_agent import HumanAgent as HeartsHumanAgent
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.agents.cfr_agent import CFRAgent
+
+# The location of each lazy agent, with the optional modules it needs
+_LAZY_AGENTS = {
+    'DQNAgent': ('rlcard.agents.dqn_agent:DQNAgent', ('torch',)),
+    'NFSPAgent': ('rlcard.agents.nfsp_agent:NFSPAgent', ('torch',)),
+    'DMCTrainer': ('rlcard.agents.dmc_agent:DMCTrainer', ('torch', 'git')),
+    'ISMCTSAgent': ('rlcard.agents.ismcts_agent:ISMCTSAgent', ()),
+    'GoFishEndgameAgent': ('rlcard.agents.go_fish_endgame_agent:GoFishEndgameAgent', ()),
+    'LimitholdemHumanAgent': ('rlcard.agents.human_agents.limit_holdem_human_agent:HumanAgent', ()),
+    'NolimitholdemHumanAgent': ('rlcard.agents.human_agents.nolimit_holdem_human_agent:HumanAgent', ()),
+    'LeducholdemHumanAgent': ('rlcard.agents.human_agents.leduc_holdem_human_agent:HumanAgent', ()),
+    'BlackjackHumanAgent': ('rlcard.agents.human_agents.blackjack_human_agent:HumanAgent', ()),
+    'UnoHumanAgent': ('rlcard.agents.human_agents.uno_human_agent:HumanAgent', ()),
+    'GoFishHumanAgent': ('rlcard.agents.human_agents.go_fish_human_agent:HumanAgent', ()),
+    'HeartsHumanAgent': ('rlcard.agents.human_agents.hearts_human_agent:HumanAgent', ()),
+}
+
+# The package that installs each optional module. All of them are in the
+# torch extra of rlcard.
+_INSTALL_NAMES = {
+    'torch': 'torch',
+    'git': 'GitPython',
+}
+
+def __getattr__(name):
+    ''' Import a lazy agent the first time it is accessed
+    '''
+    if name not in _LAZY_AGENTS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    entry_point, requirements = _LAZY_AGENTS[name]
+    missing = [module for module in requirements if importlib.util.find_spec(module) is None]
+    if missing:
+        packages = ' '.join(_INSTALL_NAMES.get(module, module) for module in missing)
+        raise ImportError('{} requires the missing modules {}. Install them with `pip install {}`, '
+                          'or with `pip install rlcard[torch]`'.format(name, ', '.join(missing), packages))
+    mod_name, class_name = entry_point.split(':')
+    agent = getattr(importlib.import_module(mod_name), class_name)
+    globals()[name] = agent
+    return agent
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_AGENTS))
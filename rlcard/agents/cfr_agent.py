@@ -4,19 +4,24 @@ import collections
 import os
 import pickle
 
+from rlcard.utils import seeding
 from rlcard.utils.utils import *
 
 class CFRAgent():
     ''' Implement CFR (chance sampling) algorithm
     '''
 
-    def __init__(self, env, model_path='./cfr_model'):
+    def __init__(self, env, model_path='./cfr_model', seed=None):
         ''' Initilize Agent
 
         Args:
             env (Env): Env class
+            seed (int or numpy.random.SeedSequence): The seed of the random stream
+                that samples the actions of the average policy. The global numpy
+                random state is used if it is None.
         '''
         self.use_raw = False
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
         self.env = env
         self.model_path = model_path
 
@@ -153,8 +158,8 @@ class CFRAgent():
             action (int): Predicted action
             info (dict): A dictionary containing information
         '''
-        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()), self.average_policy)
-        action = np.random.choice(len(probs), p=probs)
+        probs = self.action_probs(_get_obs_key(state['obs']), list(state['legal_actions'].keys()), self.average_policy)
+        action = self.np_random.choice(len(probs), p=probs)
 
         info = {}
         info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
@@ -173,7 +178,7 @@ class CFRAgent():
                 legal_actions (list): Indices of legal actions
         '''
         state = self.env.get_state(player_id)
-        return state['obs'].tostring(), list(state['legal_actions'].keys())
+        return _get_obs_key(state['obs']), list(state['legal_actions'].keys())
 
     def save(self):
         ''' Save model
@@ -219,3 +224,8 @@ class CFRAgent():
         self.iteration = pickle.load(iteration_file)
         iteration_file.close()
 
+def _get_obs_key(obs):
+    ''' Get the key of an observation in the policy, the same whatever the
+    dtype of the observations of the environment
+    '''
+    return obs.astype(np.float64).tobytes()
@@ -71,7 +71,8 @@ class DMCAgent:
         action = action_keys[action_idx]
 
         info = {}
-        info['values'] = {state['raw_legal_actions'][i]: float(values[i]) for i in range(len(action_keys))}
+        values = dict(zip(action_keys, values))
+        info['values'] = {raw_action: float(values[action]) for action, raw_action in zip(state['legal_actions'], state['raw_legal_actions'])}
 
         return action, info
 
@@ -87,15 +88,21 @@ class DMCAgent:
     def predict(self, state):
         # Prepare obs and actions
         obs = state['obs'].astype(np.float32)
-        legal_actions = state['legal_actions']
-        action_keys = np.array(list(legal_actions.keys()))
-        action_values = list(legal_actions.values())
-        # One-hot encoding if there is no action features
-        for i in range(len(action_values)):
-            if action_values[i] is None:
-                action_values[i] = np.zeros(self.action_shape[0])
-                action_values[i][action_keys[i]] = 1
-        action_values = np.array(action_values, dtype=np.float32)
+        legal_mask = state.get('legal_mask')
+        if legal_mask is not None and len(legal_mask) == self.action_shape[0]:
+            # One-hot encoding if there is no action features
+            action_keys = np.flatnonzero(legal_mask)
+            action_values = np.eye(self.action_shape[0], dtype=np.float32)[action_keys]
+        else:
+            legal_actions = state['legal_actions']
+            action_keys = np.array(list(legal_actions.keys()))
+            action_values = list(legal_actions.values())
+            # One-hot encoding if there is no action features
+            for i in range(len(action_values)):
+                if action_values[i] is None:
+                    action_values[i] = np.zeros(self.action_shape[0])
+                    action_values[i][action_keys[i]] = 1
+            action_values = np.array(action_values, dtype=np.float32)
 
         obs = np.repeat(obs[np.newaxis, :], len(action_keys), axis=0)
 
@@ -32,9 +32,10 @@ import torch.nn as nn
 from collections import namedtuple
 from copy import deepcopy
 
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils import seeding
+from rlcard.utils.utils import get_legal_mask, remove_illegal
 
-Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'legal_actions', 'done'])
+Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'legal_mask', 'done'])
 
 
 class DQNAgent(object):
@@ -56,7 +57,8 @@ class DQNAgent(object):
                  train_every=1,
                  mlp_layers=None,
                  learning_rate=0.00005,
-                 device=None):
+                 device=None,
+                 seed=None):
 
         '''
         Q-Learning algorithm for off-policy TD control using Function Approximation.
@@ -81,8 +83,11 @@ class DQNAgent(object):
             mlp_layers (list): The layer number and the dimension of each layer in MLP
             learning_rate (float): The learning rate of the DQN agent.
             device (torch.device): whether to use the cpu or gpu
+            seed (int or numpy.random.SeedSequence): The seed of the random stream
+              of the exploration. The global numpy random state is used if it is None.
         '''
         self.use_raw = False
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
         self.replay_memory_init_size = replay_memory_init_size
         self.update_target_estimator_every = update_target_estimator_every
         self.discount_factor = discount_factor
@@ -124,7 +129,25 @@ class DQNAgent(object):
             ts (list): a list of 5 elements that represent the transition
         '''
         (state, action, reward, next_state, done) = tuple(ts)
-        self.feed_memory(state['obs'], action, reward, next_state['obs'], list(next_state['legal_actions'].keys()), done)
+        self.feed_memory(state['obs'], action, reward, next_state['obs'], get_legal_mask(next_state, self.num_actions), done)
+        self._count_step()
+
+    def feed_batch(self, transitions):
+        ''' Store a batch of transitions in to replay buffer and train the agent
+            as `feed` does for each of them
+
+        Args:
+            transitions (dict): The columns 'obs', 'actions', 'rewards', 'next_obs',
+                'next_legal_masks' and 'dones', e.g. from `TrajectoryBuffer.transitions`
+        '''
+        for obs, action, reward, next_obs, legal_mask, done in zip(transitions['obs'], transitions['actions'],
+                transitions['rewards'], transitions['next_obs'], transitions['next_legal_masks'], transitions['dones']):
+            self.memory.save(obs, int(action), float(reward), next_obs, legal_mask, bool(done))
+            self._count_step()
+
+    def _count_step(self):
+        ''' Count a fed transition and train the agent every several timesteps
+        '''
         self.total_t += 1
         tmp = self.total_t - self.replay_memory_init_size
         if tmp>=0 and tmp%self.train_every == 0:
@@ -142,13 +165,12 @@ class DQNAgent(object):
         '''
         q_values = self.predict(state)
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        legal_actions = list(state['legal_actions'].keys())
-        probs = np.ones(len(legal_actions), dtype=float) * epsilon / len(legal_actions)
-        best_action_idx = legal_actions.index(np.argmax(q_values))
-        probs[best_action_idx] += (1.0 - epsilon)
-        action_idx = np.random.choice(np.arange(len(probs)), p=probs)
+        legal_mask = get_legal_mask(state, self.num_actions)
+        probs = legal_mask * (epsilon / np.count_nonzero(legal_mask))
+        probs[np.argmax(q_values)] += (1.0 - epsilon)
+        action = self.np_random.choice(self.num_actions, p=probs)
 
-        return legal_actions[action_idx]
+        return int(action)
 
     def eval_step(self, state):
         ''' Predict the action for evaluation purpose.
@@ -168,6 +190,50 @@ class DQNAgent(object):
 
         return best_action, info
 
+    def step_batch(self, states):
+        ''' Predict the actions for generating training data for a batch of states
+            with a single forward pass
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            actions (list): a list of action ids
+        '''
+        q_values = self.predict_batch(states)
+        epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
+        actions = []
+        for state, state_q_values in zip(states, q_values):
+            if self.np_random.random_sample() < epsilon:
+                legal_actions = np.flatnonzero(get_legal_mask(state, self.num_actions))
+                actions.append(int(legal_actions[self.np_random.randint(len(legal_actions))]))
+            else:
+                actions.append(int(np.argmax(state_q_values)))
+        return actions
+
+    def eval_step_batch(self, states):
+        ''' Predict the actions for evaluation purpose for a batch of states
+            with a single forward pass
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            actions (list): a list of action ids
+            infos (list): a list of dictionaries containing information
+        '''
+        q_values = self.predict_batch(states)
+        actions = np.argmax(q_values, axis=1)
+
+        infos = []
+        for state, state_q_values in zip(states, q_values):
+            legal_actions = list(state['legal_actions'].keys())
+            info = {}
+            info['values'] = {state['raw_legal_actions'][i]: float(state_q_values[legal_actions[i]]) for i in range(len(legal_actions))}
+            infos.append(info)
+
+        return [int(action) for action in actions], infos
+
     def predict(self, state):
         ''' Predict the masked Q-values
 
@@ -177,11 +243,20 @@ class DQNAgent(object):
         Returns:
             q_values (numpy.array): a 1-d array where each entry represents a Q value
         '''
-        
-        q_values = self.q_estimator.predict_nograd(np.expand_dims(state['obs'], 0))[0]
-        masked_q_values = -np.inf * np.ones(self.num_actions, dtype=float)
-        legal_actions = list(state['legal_actions'].keys())
-        masked_q_values[legal_actions] = q_values[legal_actions]
+        return self.predict_batch([state])[0]
+
+    def predict_batch(self, states):
+        ''' Predict the masked Q-values of a batch of states
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            q_values (numpy.array): a 2-d array of shape (batch, num_actions)
+        '''
+        q_values = self.q_estimator.predict_nograd(np.stack([state['obs'] for state in states]))
+        legal_masks = np.stack([get_legal_mask(state, self.num_actions) for state in states])
+        masked_q_values = np.where(legal_masks, q_values, -np.inf)
 
         return masked_q_values
 
@@ -191,16 +266,11 @@ class DQNAgent(object):
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, legal_actions_batch, done_batch = self.memory.sample()
+        state_batch, action_batch, reward_batch, next_state_batch, legal_mask_batch, done_batch = self.memory.sample()
 
         # Calculate best next actions using Q-network (Double DQN)
         q_values_next = self.q_estimator.predict_nograd(next_state_batch)
-        legal_actions = []
-        for b in range(self.batch_size):
-            legal_actions.extend([i + b * self.num_actions for i in legal_actions_batch[b]])
-        masked_q_values = -np.inf * np.ones(self.num_actions * self.batch_size, dtype=float)
-        masked_q_values[legal_actions] = q_values_next.flatten()[legal_actions]
-        masked_q_values = masked_q_values.reshape((self.batch_size, self.num_actions))
+        masked_q_values = np.where(legal_mask_batch, q_values_next, -np.inf)
         best_actions = np.argmax(masked_q_values, axis=1)
 
         # Evaluate best next actions using Target-network (Double DQN)
@@ -229,10 +299,15 @@ class DQNAgent(object):
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_actions (numpy.array or list): the legal actions of the next state,
+                as a boolean mask or a list of action ids
             done (boolean): whether the episode is finished
         '''
-        self.memory.save(state, action, reward, next_state, legal_actions, done)
+        legal_mask = np.asarray(legal_actions)
+        if legal_mask.dtype != np.bool_:
+            legal_mask = np.zeros(self.num_actions, dtype=bool)
+            legal_mask[legal_actions] = True
+        self.memory.save(state, action, reward, next_state, legal_mask, done)
 
     def set_device(self, device):
         self.device = device
@@ -386,7 +461,7 @@ class Memory(object):
         self.batch_size = batch_size
         self.memory = []
 
-    def save(self, state, action, reward, next_state, legal_actions, done):
+    def save(self, state, action, reward, next_state, legal_mask, done):
         ''' Save transition into memory
 
         Args:
@@ -394,12 +469,12 @@ class Memory(object):
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_mask (numpy.array): the boolean mask of the legal actions of the next state
             done (boolean): whether the episode is finished
         '''
         if len(self.memory) == self.memory_size:
             self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, legal_actions, done)
+        transition = Transition(state, action, reward, next_state, legal_mask, done)
         self.memory.append(transition)
 
     def sample(self):
@@ -410,6 +485,7 @@ class Memory(object):
             action_batch (list): a batch of actions
             reward_batch (list): a batch of rewards
             next_state_batch (list): a batch of states
+            legal_mask_batch (list): a batch of legal action masks
             done_batch (list): a batch of dones
         '''
         samples = random.sample(self.memory, self.batch_size)
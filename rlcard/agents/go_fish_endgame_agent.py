@@ -0,0 +1,63 @@
+''' An agent that plays the Go Fish endgame exactly
+'''
+from rlcard import models
+from rlcard.games.go_fish.endgame import GoFishEndgameSolver
+
+class GoFishEndgameAgent(object):
+    ''' An agent that plays with `GoFishEndgameSolver` once the deck is
+    empty, and with a fallback agent before
+    '''
+
+    def __init__(self, env, max_hidden_cards=8, fallback_agent=None, max_table_size=100000, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            env (Env): The Go Fish environment the agent plays in. The agent
+                reads the game, but only what the player to act knows of it.
+            max_hidden_cards (int): The largest number of cards that are not
+                public for which the endgame is solved
+            fallback_agent (object): The agent that plays when the endgame
+                is not solved. By default, the Go Fish V3 rule agent.
+            max_table_size (int): The number of beliefs the transposition
+                table of the solver may hold before it is cleared
+            seed (int or numpy.random.SeedSequence): The seed of the default
+                fallback agent. The global numpy random state is used if it is None.
+        '''
+        self.use_raw = False
+        self.env = env
+        self.solver = GoFishEndgameSolver(max_hidden_cards, max_table_size)
+        if fallback_agent is None:
+            fallback_agent = models.load('go-fish-v3', seed=seed).agents[0]
+        self.fallback_agent = fallback_agent
+
+    def step(self, state):
+        ''' Predict the action given the current state of the environment
+
+        Args:
+            state (dict): The state of the player to act
+
+        Returns:
+            action (int): The action id
+        '''
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        ''' Predict the action given the current state of the environment
+
+        Args:
+            state (dict): The state of the player to act
+
+        Returns:
+            action (int): The action id
+            info (dict): The expected final books of the player after each
+                request, if the endgame is solved
+        '''
+        game = self.env.game
+        if not self.solver.can_solve(game):
+            action = self.fallback_agent.step(state)
+            if self.fallback_agent.use_raw:
+                action = game.action_space[action]
+            return action, {}
+        action_values = self.solver.get_action_values(game)
+        raw_action = max(action_values, key=action_values.get)
+        return game.action_space[raw_action], {'values': action_values}
@@ -62,7 +62,7 @@ class HumanAgent(object):
                 print('\tNone')
 
             if i == 0:
-                hand_list = sorted(list(raw_state['player_hand']), key=lambda card: '{:02d}{}'.format(Card.valid_rank.index(card.rank), card.suit))
+                hand_list = sorted(list(raw_state['player_hand']), key=lambda card: '{:02d}{}'.format(card.rank_index, card.suit))
                 print_card(hand_list)
             else:
                 print_card([None] * raw_state['card_counts'][i])
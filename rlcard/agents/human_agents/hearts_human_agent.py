@@ -42,7 +42,7 @@ class HumanAgent(object):
             print_card(trick)
 
         print('\n===============   Your Hand   ===============')
-        hand_list = sorted(list(raw_state['player_hand']), key=lambda card: '{}{:02d}'.format(card.suit, Card.valid_rank.index(card.rank)))
+        hand_list = sorted(list(raw_state['player_hand']), key=lambda card: '{}{:02d}'.format(card.suit, card.rank_index))
         print_card(hand_list)
 
         print('\n=========== Actions You Can Choose ===========')
@@ -0,0 +1,317 @@
+''' Information set Monte Carlo tree search (ISMCTS)
+
+The agent searches a single tree of the actions seen from the information
+set of the player to act. Each iteration determinizes the game, i.e. deals
+the cards hidden from the player at random, consistently with what the player
+knows, then goes down the tree with UCT on the actions that are legal in
+this deal, adds one node, and plays the game to the end with a rule model.
+Since an action is not legal in every deal, the exploration term of an action
+counts the visits of its parent in which the action was available.
+
+The game is searched in place: the environment is snapshotted before the
+search and restored after every iteration, so it is left as it was found.
+'''
+import itertools
+import pickle
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rlcard import models
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils import seeding
+from rlcard.utils.worlds import sample_worlds
+
+# The rule model that plays the rollouts of each environment. The other
+# environments are played out at random.
+_ROLLOUT_MODELS = {
+    'go_fish': 'go-fish-v3',
+    'uno': 'uno-rule-v1',
+    'gin-rummy': 'gin-rummy-novice-rule',
+}
+
+# The environments whose payoffs are only utilities for training, e.g.
+# the evaluation payoffs of Hearts are the points taken
+_TRAINING_PAYOFF_ENVS = ('go_fish', 'hearts')
+
+class _Node(object):
+    ''' A node of the tree, reached by an action of the player that the
+    value is summed for
+    '''
+
+    __slots__ = ('children', 'visits', 'availability', 'value')
+
+    def __init__(self):
+        self.children = {} # action id -> _Node
+        self.visits = 0
+        self.availability = 0
+        self.value = 0.0
+
+class ISMCTSAgent(object):
+    ''' An agent that searches the game with ISMCTS before each move
+    '''
+
+    def __init__(self, env, num_iterations=1000, time_limit=None, exploration=0.7,
+                 rollout_agent=None, num_worlds=64, num_workers=1, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            env (Env): The environment the agent plays in. Its game must
+                either describe the hidden cards with `get_world_constraints`
+                and `apply_world`, e.g. Go Fish, Hearts and Gin Rummy, or
+                deal them again with `shuffle_hidden_cards`, e.g. Uno.
+            num_iterations (int): The number of iterations of a search, or
+                None to search until the time limit
+            time_limit (float): The number of seconds a search may take, or
+                None for no limit. The search stops at whichever of the two
+                budgets is spent first, and at least one must be given.
+            exploration (float): The UCT exploration constant, relative to the
+                range of the payoffs seen in the search
+            rollout_agent (object): The agent that plays the rollouts. By
+                default, the rule model of the game, or a random agent.
+            num_worlds (int): The number of worlds sampled at once. The
+                worlds are drawn again among them by their importance weights.
+            num_workers (int): The number of processes that search at once.
+                Each of them spends the whole budget on its own tree, and the
+                visits of the moves are summed. The processes are shut down
+                by `close`, or on leaving a `with` block of the agent.
+            seed (int): The seed of the agent's own random stream. The global
+                numpy random state is used if it is None.
+        '''
+        if num_iterations is None and time_limit is None:
+            raise ValueError('The search needs a number of iterations or a time limit')
+        self.use_raw = False
+        self.env = env
+        self.num_iterations = num_iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
+        if rollout_agent is None:
+            # A random stream of its own, so that it can be sent to the workers
+            rollout_seed = int(self.np_random.randint(2 ** 31))
+            if env.name in _ROLLOUT_MODELS:
+                rollout_agent = models.load(_ROLLOUT_MODELS[env.name], seed=rollout_seed).agents[0]
+            else:
+                rollout_agent = RandomAgent(env.num_actions, seed=rollout_seed)
+        self.rollout_agent = rollout_agent
+        self.num_worlds = num_worlds
+        self.num_workers = num_workers
+        self._executor = None
+        self._shutdown = None
+
+    def step(self, state):
+        ''' Search the current state of the environment for the best action
+
+        Args:
+            state (dict): The state of the player to act
+
+        Returns:
+            action (int): The most visited action
+        '''
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        ''' Search the current state of the environment for the best action
+
+        Args:
+            state (dict): The state of the player to act
+
+        Returns:
+            action (int): The most visited action
+            info (dict): The 'visits' and mean 'values' of the raw legal actions
+        '''
+        legal_actions = list(state['legal_actions'])
+        if len(legal_actions) == 1:
+            return legal_actions[0], {}
+        if self.num_workers > 1:
+            stats = self._search_in_parallel()
+        else:
+            stats = self.search()
+
+        visits = [stats.get(action, (0, 0.0))[0] for action in legal_actions]
+        action = legal_actions[int(np.argmax(visits))]
+        info = {'visits': {}, 'values': {}}
+        for legal_action, raw_action in zip(legal_actions, state['raw_legal_actions']):
+            action_visits, value = stats.get(legal_action, (0, 0.0))
+            info['visits'][raw_action] = action_visits
+            info['values'][raw_action] = value / action_visits if action_visits else 0.0
+        return action, info
+
+    def search(self):
+        ''' Search from the current state of the environment, which is left unchanged
+
+        Returns:
+            (dict): For each action of the player to act, its number of visits
+                and the sum of the payoffs of the player in them
+        '''
+        env = self.env
+        player_id = env.get_player_id()
+        timestep, game_log = env.timestep, env.game_log
+        allow_step_back = env.game.allow_step_back
+        # The games played in the search are not real games, and their steps
+        # are not stepped back. The snapshot is taken without step back, so
+        # that restoring it keeps it off.
+        env.game_log = None
+        env.game.allow_step_back = False
+        root_snapshot = env.snapshot()
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self._payoff_range = [np.inf, -np.inf]
+        root = _Node()
+        worlds = []
+        try:
+            iterations = itertools.count() if self.num_iterations is None else range(self.num_iterations)
+            for _ in iterations:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if not worlds:
+                    worlds = self._sample_worlds(player_id)
+                self._determinize(player_id, worlds.pop())
+                self._iterate(root)
+                env.restore(root_snapshot)
+        finally:
+            env.restore(root_snapshot)
+            env.timestep, env.game_log = timestep, game_log
+            env.game.allow_step_back = allow_step_back
+        return {action: (child.visits, child.value) for action, child in root.children.items()}
+
+    def close(self):
+        ''' Shut the worker processes down
+        '''
+        if self._executor is not None:
+            self._shutdown()
+            self._executor = None
+            self._shutdown = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _sample_worlds(self, player_id):
+        ''' Sample worlds for the player in the current state of the game
+
+        Returns:
+            (list): The worlds, or Nones if the game deals the hidden cards itself
+        '''
+        game = self.env.game
+        if not hasattr(game, 'get_world_constraints'):
+            return [None] * self.num_worlds
+        worlds, weights = sample_worlds(game, player_id, self.num_worlds, self.np_random)
+        return list(worlds[self.np_random.choice(self.num_worlds, self.num_worlds, p=weights)])
+
+    def _determinize(self, player_id, world):
+        ''' Deal the cards hidden from the player, and the chance events to come, at random
+        '''
+        game = self.env.game
+        if world is None:
+            game.shuffle_hidden_cards(player_id, self.np_random)
+        else:
+            game.apply_world(world)
+        # The random state of the game is the one of the root, which would replay the same chance events
+        game.np_random.seed(self.np_random.randint(2 ** 31))
+        self.env._invalidate_states()
+
+    def _iterate(self, root):
+        ''' Go down the tree, add a node, play the game out and back the payoffs up
+        '''
+        env = self.env
+        node = root
+        path = [] # (node, id of the player of its action)[]
+        is_expanded = False
+        while not env.is_over() and not is_expanded:
+            player_id = env.get_player_id()
+            legal_actions = list(env.get_state(player_id)['legal_actions'])
+            untried_actions = [action for action in legal_actions if action not in node.children]
+            if untried_actions:
+                action = untried_actions[self.np_random.randint(len(untried_actions))]
+                node.children[action] = _Node()
+                is_expanded = True
+            else:
+                action = self._select(node, legal_actions)
+            for legal_action in legal_actions:
+                if legal_action in node.children:
+                    node.children[legal_action].availability += 1
+            node = node.children[action]
+            path.append((node, player_id))
+            env.step(action)
+
+        while not env.is_over():
+            state = env.get_state(env.get_player_id())
+            env.step(self.rollout_agent.step(state), self.rollout_agent.use_raw)
+
+        payoffs = self._get_payoffs()
+        self._payoff_range[0] = min(self._payoff_range[0], np.min(payoffs))
+        self._payoff_range[1] = max(self._payoff_range[1], np.max(payoffs))
+        for node, player_id in path:
+            node.visits += 1
+            node.value += payoffs[player_id]
+
+    def _select(self, node, legal_actions):
+        ''' Pick the legal child with the highest upper confidence bound
+        '''
+        scale = self._payoff_range[1] - self._payoff_range[0]
+        if not scale > 0:
+            scale = 1.0
+        children = [node.children[action] for action in legal_actions]
+        visits = np.array([child.visits for child in children], dtype=np.float64)
+        values = np.array([child.value for child in children])
+        availability = np.array([child.availability for child in children], dtype=np.float64)
+        bounds = values / visits + self.exploration * scale * np.sqrt(np.log(availability) / visits)
+        return legal_actions[int(np.argmax(bounds))]
+
+    def _get_payoffs(self):
+        if self.env.name in _TRAINING_PAYOFF_ENVS:
+            return self.env.get_payoffs(is_training=True)
+        return self.env.get_payoffs()
+
+    def _search_in_parallel(self):
+        ''' Search in each worker process from a copy of the environment
+
+        Returns:
+            (dict): The visits and the payoffs of each action, summed over the workers
+        '''
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.num_workers)
+            # The workers are shut down with the agent if it is not closed
+            self._shutdown = weakref.finalize(self, self._executor.shutdown)
+        env = self.env
+        # The agents and the log of the environment stay in this process
+        agents = env.__dict__.pop('agents', None)
+        game_log, env.game_log = env.game_log, None
+        try:
+            env_bytes = pickle.dumps(env)
+        finally:
+            env.game_log = game_log
+            if agents is not None:
+                env.agents = agents
+        config = {
+            'num_iterations': self.num_iterations,
+            'time_limit': self.time_limit,
+            'exploration': self.exploration,
+            'rollout_agent': self.rollout_agent,
+            'num_worlds': self.num_worlds,
+        }
+        seeds = self.np_random.randint(2 ** 31, size=self.num_workers)
+        futures = [self._executor.submit(_search_worker, env_bytes, config, int(seed)) for seed in seeds]
+        stats = {}
+        for future in futures:
+            for action, (visits, value) in future.result().items():
+                total_visits, total_value = stats.get(action, (0, 0.0))
+                stats[action] = (total_visits + visits, total_value + value)
+        return stats
+
+def _search_worker(env_bytes, config, seed):
+    ''' Search a copy of an environment in a worker process
+    '''
+    env = pickle.loads(env_bytes)
+    # The rollout agents without a stream of their own draw from the global
+    # random state, which the workers inherit. Those with one get a copy of
+    # it in every worker, which is seeded again.
+    np.random.seed(seed)
+    rollout_random = getattr(config['rollout_agent'], 'np_random', None)
+    if isinstance(rollout_random, np.random.RandomState):
+        rollout_random.seed(seed)
+    return ISMCTSAgent(env, seed=seed, **config).search()
@@ -28,7 +28,8 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from rlcard.agents.dqn_agent import DQNAgent
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils import seeding
+from rlcard.utils.utils import get_legal_mask, remove_illegal
 
 Transition = collections.namedtuple('Transition', 'info_state action_probs')
 
@@ -62,7 +63,8 @@ class NFSPAgent(object):
                  q_train_every=1,
                  q_mlp_layers=None,
                  evaluate_with='average_policy',
-                 device=None):
+                 device=None,
+                 seed=None):
         ''' Initialize the NFSP agent.
 
         Args:
@@ -89,8 +91,13 @@ class NFSPAgent(object):
             q_train_step (int): Train the model every X steps.
             q_mlp_layers (list): The layer sizes of inner DQN agent.
             device (torch.device): Whether to use the cpu or gpu
+            seed (int or numpy.random.SeedSequence): The seed from which the random
+              streams of the agent and of the inner DQN agent are spawned. The
+              global numpy random state is used if it is None.
         '''
         self.use_raw = False
+        seeds = [None, None] if seed is None else seeding.spawn_seeds(seed, 2)
+        self.np_random = np.random if seed is None else seeding.np_random(seeds[0])[0]
         self._num_actions = num_actions
         self._state_shape = state_shape
         self._layer_sizes = hidden_layers_sizes + [num_actions]
@@ -120,7 +127,7 @@ class NFSPAgent(object):
         self._rl_agent = DQNAgent(q_replay_memory_size, q_replay_memory_init_size, \
             q_update_target_estimator_every, q_discount_factor, q_epsilon_start, q_epsilon_end, \
             q_epsilon_decay_steps, q_batch_size, num_actions, state_shape, q_train_every, q_mlp_layers, \
-            rl_learning_rate, device)
+            rl_learning_rate, device, seeds[1])
 
         # Build the average policy supervised model
         self._build_model()
@@ -152,6 +159,22 @@ class NFSPAgent(object):
             ts (list): A list of 5 elements that represent the transition.
         '''
         self._rl_agent.feed(ts)
+        self._count_step()
+
+    def feed_batch(self, transitions):
+        ''' Feed a batch of transitions to inner RL agent
+
+        Args:
+            transitions (dict): The columns 'obs', 'actions', 'rewards', 'next_obs',
+                'next_legal_masks' and 'dones', e.g. from `TrajectoryBuffer.transitions`
+        '''
+        for i in range(len(transitions['actions'])):
+            self._rl_agent.feed_batch({key: column[i:i+1] for key, column in transitions.items()})
+            self._count_step()
+
+    def _count_step(self):
+        ''' Count a fed transition and train the average policy every several timesteps
+        '''
         self.total_t += 1
         if self.total_t>0 and len(self._reservoir_buffer) >= self._min_buffer_size_to_learn and self.total_t%self._train_every == 0:
             sl_loss  = self.train_sl()
@@ -167,7 +190,7 @@ class NFSPAgent(object):
             action (int): An action id
         '''
         obs = state['obs']
-        legal_actions = list(state['legal_actions'].keys())
+        legal_mask = get_legal_mask(state, self._num_actions)
         if self._mode == 'best_response':
             action = self._rl_agent.step(state)
             one_hot = np.zeros(self._num_actions)
@@ -176,8 +199,8 @@ class NFSPAgent(object):
 
         elif self._mode == 'average_policy':
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
-            action = np.random.choice(len(probs), p=probs)
+            probs = remove_illegal(probs, legal_mask)
+            action = self.np_random.choice(len(probs), p=probs)
 
         return action
 
@@ -195,10 +218,9 @@ class NFSPAgent(object):
             action, info = self._rl_agent.eval_step(state)
         elif self.evaluate_with == 'average_policy':
             obs = state['obs']
-            legal_actions = list(state['legal_actions'].keys())
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
-            action = np.random.choice(len(probs), p=probs)
+            probs = remove_illegal(probs, get_legal_mask(state, self._num_actions))
+            action = self.np_random.choice(len(probs), p=probs)
             info = {}
             info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
         else:
@@ -208,7 +230,7 @@ class NFSPAgent(object):
     def sample_episode_policy(self):
         ''' Sample average/best_response policy
         '''
-        if np.random.rand() < self._anticipatory_param:
+        if self.np_random.rand() < self._anticipatory_param:
             self._mode = 'best_response'
         else:
             self._mode = 'average_policy'
@@ -1,21 +1,24 @@
 import numpy as np
 
+from rlcard.utils import seeding
 
 class RandomAgent(object):
     ''' A random agent. Random agents is for running toy examples on the card games
     '''
 
-    def __init__(self, num_actions):
+    def __init__(self, num_actions, seed=None):
         ''' Initilize the random agent
 
         Args:
             num_actions (int): The size of the ouput action space
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
         '''
         self.use_raw = False
         self.num_actions = num_actions
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
-    @staticmethod
-    def step(state):
+    def step(self, state):
         ''' Predict the action given the curent state in gerenerating training data.
 
         Args:
@@ -24,7 +27,7 @@ class RandomAgent(object):
         Returns:
             action (int): The action predicted (randomly chosen) by the random agent
         '''
-        return np.random.choice(list(state['legal_actions'].keys()))
+        return self.np_random.choice(list(state['legal_actions'].keys()))
 
     def eval_step(self, state):
         ''' Predict the action given the current state for evaluation.
@@ -0,0 +1,237 @@
+''' Throughput benchmark of the registered environments
+
+Every environment plays games between random agents under a fixed seed, and
+the results are written as a JSON report that can be diffed between versions:
+
+    python -m rlcard.bench --output report.json
+    python -m rlcard.bench --env leduc-holdem go_fish --games 500
+    python -m rlcard.bench --baseline old_report.json
+    python -m rlcard.bench --env go_fish --num-players 4 5 6
+
+For each environment, the report holds the number of players, the games and
+steps per second, the peak resident memory of the process, and the memory
+allocated by a step, measured with tracemalloc in a separate pass:
+'alloc_peak_bytes_per_step' is the mean peak of the memory allocated while
+a step runs (the agent choosing the action and the environment stepping),
+and 'alloc_blocks_per_step' is the mean number of memory blocks still
+allocated after it, as counted by `sys.getallocatedblocks`.
+'''
+import argparse
+import concurrent.futures
+import json
+import multiprocessing as mp
+import platform
+import random
+import sys
+import time
+import traceback
+import tracemalloc
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.envs.registration import registry
+
+def bench_env(env_id, num_games=100, alloc_games=5, seed=0, num_players=None):
+    ''' Measure the throughput of an environment with random agents
+
+    Args:
+        env_id (string): The name of the environment
+        num_games (int): The number of games to time
+        alloc_games (int): The number of games to trace the allocations of
+        seed (int): The seed of the environment and of the agents
+        num_players (int): The number of players, passed as 'game_num_players'.
+            The default number of the environment is used if it is None.
+
+    Returns:
+        (dict): The results of the environment
+    '''
+    config = {'seed': seed}
+    if num_players is not None:
+        config['game_num_players'] = num_players
+    env = rlcard.make(env_id, config=config)
+    env.set_agents([RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)])
+    np.random.seed(seed)
+    random.seed(seed)
+
+    # Throughput
+    num_steps = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        num_steps += _play(env)
+    elapsed = time.perf_counter() - start
+
+    # Allocations of the steps
+    alloc_steps = 0
+    alloc_peak = 0
+    alloc_blocks = 0
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_games):
+            state, player_id = env.reset()
+            while not env.is_over():
+                blocks = sys.getallocatedblocks()
+                _reset_traced_peak()
+                current, _ = tracemalloc.get_traced_memory()
+                action = env._act(player_id, state, False)
+                state, player_id = env.step(action, env.agents[player_id].use_raw)
+                alloc_peak += tracemalloc.get_traced_memory()[1] - current
+                alloc_blocks += sys.getallocatedblocks() - blocks
+                alloc_steps += 1
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'num_players': env.num_players,
+        'num_games': num_games,
+        'num_steps': num_steps,
+        'seconds': elapsed,
+        'games_per_second': num_games / elapsed,
+        'steps_per_second': num_steps / elapsed,
+        'peak_rss_mb': _peak_rss_mb(),
+        'alloc_peak_bytes_per_step': alloc_peak / max(1, alloc_steps),
+        'alloc_blocks_per_step': alloc_blocks / max(1, alloc_steps),
+    }
+
+def run_benchmarks(env_ids=None, num_games=100, alloc_games=5, seed=0, isolate=True, num_players=None):
+    ''' Benchmark several environments
+
+    Args:
+        env_ids (list): The names of the environments. All the registered environments are used by default.
+        num_games (int): The number of games to time for each environment
+        alloc_games (int): The number of games to trace the allocations of
+        seed (int): The seed of the environments and of the agents
+        isolate (boolean): True if each environment should run in a new process,
+            so that its peak memory is not mixed with the others
+        num_players (list): The numbers of players to benchmark each environment
+            with. The default number of each environment is used if it is None.
+
+    Returns:
+        (dict): The report, with the versions and the settings in 'meta' and
+            the results of each environment in 'envs'. An environment that
+            fails holds its traceback in 'error'. With several numbers of
+            players, the results of n players are under '<env_id>-<n>p'.
+    '''
+    if env_ids is None:
+        env_ids = list(registry.env_specs)
+    results = {}
+    for env_id in env_ids:
+        for players in (num_players or [None]):
+            key = env_id if players is None else '{}-{}p'.format(env_id, players)
+            try:
+                if isolate:
+                    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context('spawn')) as executor:
+                        results[key] = executor.submit(bench_env, env_id, num_games, alloc_games, seed, players).result()
+                else:
+                    results[key] = bench_env(env_id, num_games, alloc_games, seed, players)
+            except Exception:
+                results[key] = {'error': traceback.format_exc()}
+
+    return {
+        'meta': {
+            'rlcard': rlcard.__version__,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'num_games': num_games,
+            'alloc_games': alloc_games,
+            'seed': seed,
+            'num_players': num_players,
+        },
+        'envs': results,
+    }
+
+def compare_reports(baseline, report):
+    ''' Compare the results of two reports
+
+    Args:
+        baseline (dict): The report of the reference version
+        report (dict): The report of the new version
+
+    Returns:
+        (dict): For each environment in both reports, the ratio new / baseline
+            of 'steps_per_second' and 'alloc_peak_bytes_per_step'
+    '''
+    ratios = {}
+    for env_id, result in report['envs'].items():
+        old_result = baseline['envs'].get(env_id, {})
+        if 'error' in result or 'error' in old_result or not old_result:
+            continue
+        ratios[env_id] = {}
+        for key in ('steps_per_second', 'alloc_peak_bytes_per_step'):
+            if old_result[key] > 0:
+                ratios[env_id][key] = result[key] / old_result[key]
+    return ratios
+
+def _play(env):
+    ''' Play a game and return the number of steps '''
+    num_steps = 0
+    state, player_id = env.reset()
+    while not env.is_over():
+        action = env._act(player_id, state, False)
+        state, player_id = env.step(action, env.agents[player_id].use_raw)
+        num_steps += 1
+    return num_steps
+
+def _reset_traced_peak():
+    ''' Reset the peak of the traced memory to the current size
+    '''
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    else:
+        # Before Python 3.9, the traces are cleared instead, and the peak starts again from 0
+        tracemalloc.stop()
+        tracemalloc.start()
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / 2 ** 20
+    return peak / 2 ** 10
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("Throughput benchmark of the RLCard environments")
+    parser.add_argument('--env', type=str, nargs='*', default=None,
+            help='The environments to benchmark. All the registered environments are used by default.')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--alloc-games', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--num-players', type=int, nargs='*', default=None,
+            help='The numbers of players to benchmark each environment with, e.g. 4 5 6 for go_fish')
+    parser.add_argument('--no-isolate', action='store_true',
+            help='Run all the environments in this process')
+    parser.add_argument('--output', type=str, default=None,
+            help='The path of the JSON report. It is printed if it is not given.')
+    parser.add_argument('--baseline', type=str, default=None,
+            help='The path of a previous JSON report to compare with')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.env, args.games, args.alloc_games, args.seed, not args.no_isolate, args.num_players)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        for env_id, result in report['envs'].items():
+            if 'error' in result:
+                print('{:<20}error'.format(env_id))
+            else:
+                print('{:<20}{:>10.1f} games/s{:>12.1f} steps/s'.format(env_id, result['games_per_second'], result['steps_per_second']))
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print('\nCompared with {} (new / baseline):'.format(args.baseline))
+        for env_id, ratios in compare_reports(baseline, report).items():
+            print('{:<20}{:>8.2f}x steps/s{:>8.2f}x allocated per step'.format(
+                env_id, ratios.get('steps_per_second', float('nan')), ratios.get('alloc_peak_bytes_per_step', float('nan'))))
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ DEFAULT_GAME_CONFIG = {
 class BlackjackEnv(Env):
     ''' Blackjack Environment
     '''
+    obs_dtype = np.int8
 
     def __init__(self, config):
         ''' Initialize the Blackjack environment
@@ -45,9 +46,28 @@ class BlackjackEnv(Env):
         Returns:
             observation (list): combine the player's score and dealer's observable score for observation
         '''
+        obs = self._extract_obs(state)
+
+        legal_actions = OrderedDict({i: None for i in range(len(self.actions))})
+        extracted_state = {'obs': obs, 'legal_actions': legal_actions}
+        extracted_state['raw_obs'] = state
+        extracted_state['raw_legal_actions'] = [a for a in self.actions]
+        extracted_state['action_record'] = self.action_recorder
+        return extracted_state
+
+    def _extract_obs(self, state):
+        obs = np.zeros(2, dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        ''' Write the player's score and dealer's observable score into an array in place
+
+        Args:
+            state (dict): Original state from the game
+            out (numpy.array): The array to write into
+        '''
         cards = state['state']
-        my_cards = cards[0]
-        dealer_cards = cards[1]
 
         def get_scores_and_A(hand):
             score = 0
@@ -60,16 +80,8 @@ class BlackjackEnv(Env):
                 score -= 10
             return score, has_a
 
-        my_score, _ = get_scores_and_A(my_cards)
-        dealer_score, _ = get_scores_and_A(dealer_cards)
-        obs = np.array([my_score, dealer_score])
-
-        legal_actions = OrderedDict({i: None for i in range(len(self.actions))})
-        extracted_state = {'obs': obs, 'legal_actions': legal_actions}
-        extracted_state['raw_obs'] = state
-        extracted_state['raw_legal_actions'] = [a for a in self.actions]
-        extracted_state['action_record'] = self.action_recorder
-        return extracted_state
+        out[0], _ = get_scores_and_A(cards[0])
+        out[1], _ = get_scores_and_A(cards[1])
 
     def get_payoffs(self):
         ''' Get the payoff of a game
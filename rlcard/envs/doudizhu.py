@@ -117,6 +117,27 @@ class DoudizhuEnv(Env):
         legal_actions = {self._ACTION_2_ID[action]: _cards2array(action) for action in legal_actions}
         return legal_actions
 
+    def _get_legal_mask(self):
+        ''' Get all legal actions for current state as a mask, without computing the action features
+
+        Returns:
+            legal_mask (numpy.array): boolean array of length num_actions
+        '''
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[self._ACTION_2_ID[action] for action in self.game.state['actions']]] = True
+        return legal_mask
+
+    def _legal_actions_from_mask(self, legal_mask):
+        ''' Get the legal action ids with their features from a mask
+
+        Args:
+            legal_mask (numpy.array): boolean array of length num_actions
+
+        Returns:
+            legal_actions (dict): the legal action ids mapped to their features
+        '''
+        return {int(action_id): _cards2array(self._ID_2_ACTION[action_id]) for action_id in np.flatnonzero(legal_mask)}
+
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
 
@@ -1,3 +1,6 @@
+import time
+from collections import OrderedDict
+
 from rlcard.utils import *
 
 class Env(object):
@@ -6,6 +9,10 @@ class Env(object):
     we should base on this class and implement as many functions
     as we can.
     '''
+    # The type of the observation arrays. Child classes override it with a
+    # compact type that holds their observations exactly.
+    obs_dtype = np.float32
+
     def __init__(self, config):
         ''' Initialize the environment
 
@@ -15,6 +22,15 @@ class Env(object):
                 'seed' (int) - A environment local random seed.
                 'allow_step_back' (boolean) - True if allowing
                  step_back.
+                'fast_mode' (boolean) - True if the states should only
+                 hold 'obs' and 'legal_mask'. The other fields are
+                 computed when they are first accessed. Dou Dizhu,
+                 Mahjong and Gin Rummy always return full states.
+                'profile' (boolean) - True if the time spent in the game,
+                 the state extraction and the agents should be recorded.
+                 See `get_profile`.
+                'game_log' (string) - The path of a binary log that the
+                 finished games are appended to. See `rlcard.utils.game_log`.
                 There can be some game specific configurations, e.g., the
                 number of players in the game. These fields should start with
                 'game_', e.g., 'game_num_players' which specify the number of
@@ -25,18 +41,26 @@ class Env(object):
                 TODO: Support more game configurations in the future.
         '''
         self.allow_step_back = self.game.allow_step_back = config['allow_step_back']
+        self.fast_mode = config.get('fast_mode', False)
         self.action_recorder = []
 
+        # The states returned by get_state since the game last changed. The
+        # version counts the changes, i.e. resets, steps, step backs and restores.
+        self.state_version = 0
+        self._state_cache = {}
+
         # Game specific configurations
         # Currently only support blackjack、limit-holdem、no-limit-holdem
         # TODO support game configurations for all the games
         supported_envs = ['blackjack', 'leduc-holdem', 'limit-holdem', 'no-limit-holdem', 'go_fish', 'hearts']
+        self.game_config = {}
         if self.name in supported_envs:
             _game_config = self.default_game_config.copy()
             for key in config:
                 if key in _game_config:
                     _game_config[key] = config[key]
             self.game.configure(_game_config)
+            self.game_config = _game_config
 
         # Get the number of players/actions in this game
         self.num_players = self.game.get_num_players()
@@ -48,6 +72,19 @@ class Env(object):
         # Set random seed, default is None
         self.seed(config['seed'])
 
+        # Profiling, default is off
+        self.profiler = None
+        if config.get('profile', False):
+            self._enable_profiling()
+
+        # Game logging, default is off
+        self.game_log = None
+        self.logged_actions = []
+        self.episode_seed = None
+        self.episode_config = None
+        if config.get('game_log') is not None:
+            self.game_log = GameLogWriter(config['game_log'])
+
 
     def reset(self):
         ''' Start a new game
@@ -58,9 +95,16 @@ class Env(object):
                 (numpy.array): The begining state of the game
                 (int): The begining player
         '''
+        if self.game_log is not None:
+            # Every logged game starts from its own seed so that it can be replayed alone
+            self.episode_seed = int(self.np_random.randint(2 ** 63, dtype=np.int64))
+            seeding.reseed(self.np_random, self.episode_seed)
+            self.episode_config = self._get_episode_config()
+            self.logged_actions = []
         state, player_id = self.game.init_game()
         self.action_recorder = []
-        return self._extract_state(state), player_id
+        self._invalidate_states()
+        return self._build_state(state), player_id
 
     def step(self, action, raw_action=False):
         ''' Step forward
@@ -75,6 +119,8 @@ class Env(object):
                 (dict): The next state
                 (int): The ID of the next player
         '''
+        if self.game_log is not None:
+            self.logged_actions.append(self._encode_action(action) if raw_action else int(action))
         if not raw_action:
             action = self._decode_action(action)
 
@@ -82,8 +128,13 @@ class Env(object):
         # Record the action for human interface
         self.action_recorder.append((self.get_player_id(), action))
         next_state, player_id = self.game.step(action)
+        self._invalidate_states()
+
+        if self.game_log is not None and self.game.is_over():
+            self.game_log.write(GameRecord(self.name, self.episode_config, self.episode_seed,
+                                           self.get_payoffs(), self.logged_actions))
 
-        return self._extract_state(next_state), player_id
+        return self._build_state(next_state), player_id
 
     def step_back(self):
         ''' Take one step backward.
@@ -101,12 +152,39 @@ class Env(object):
 
         if not self.game.step_back():
             return False
+        self._invalidate_states()
+        if self.action_recorder:
+            self.action_recorder.pop()
+        if self.logged_actions:
+            self.logged_actions.pop()
 
         player_id = self.get_player_id()
         state = self.get_state(player_id)
 
         return state, player_id
 
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the environment. Unlike
+            `step_back`, it does not need `allow_step_back`, and a snapshot
+            can be restored any number of times, e.g. in a tree search.
+
+        Returns:
+            (tuple): The snapshot of the game and the recorded actions
+        '''
+        return self.game.snapshot(), list(self.action_recorder), list(self.logged_actions)
+
+    def restore(self, snapshot):
+        ''' Restore the environment to a snapshot
+
+        Args:
+            snapshot (tuple): A snapshot returned by `snapshot`
+        '''
+        game_snapshot, action_recorder, logged_actions = snapshot
+        self.game.restore(game_snapshot)
+        self._invalidate_states()
+        self.action_recorder = list(action_recorder)
+        self.logged_actions = list(logged_actions)
+
     def set_agents(self, agents):
         '''
         Set the agents that will interact with the environment.
@@ -140,10 +218,7 @@ class Env(object):
         trajectories[player_id].append(state)
         while not self.is_over():
             # Agent plays
-            if not is_training:
-                action, _ = self.agents[player_id].eval_step(state)
-            else:
-                action = self.agents[player_id].step(state)
+            action = self._act(player_id, state, is_training)
 
             # Environment steps
             next_state, next_player_id = self.step(action, self.agents[player_id].use_raw)
@@ -164,10 +239,85 @@ class Env(object):
             trajectories[player_id].append(state)
 
         # Payoffs
-        payoffs = self.get_payoffs(is_training)
+        payoffs = self._get_run_payoffs(is_training)
 
         return trajectories, payoffs
 
+    def rollout(self, is_training=False):
+        '''
+        Run a complete game and yield the transitions of the players as soon as they are complete.
+
+        Args:
+            is_training (boolean): True if for training purpose.
+
+        Yields:
+            (tuple): Tuple containing:
+
+                (int): The id of the player of the transition
+                (tuple): The transition (obs, action, reward, next_obs, next_legal_mask, done)
+
+        Returns:
+            (list): A list payoffs, as the value of the generator. Each entry corresponds to one player.
+
+        Note: A transition is complete when its player acts again, or when the game is over.
+              The last transition of each player has the payoff as reward and done set to True.
+              The transitions are the same as those of `run` followed by `reorganize`, but only
+              the last observation and action of each player are kept in memory.
+        '''
+        pending = [None for _ in range(self.num_players)]
+        state, player_id = self.reset()
+
+        # Loop to play the game
+        while not self.is_over():
+            # The transition of the player that acts now is complete
+            if pending[player_id] is not None:
+                obs, action = pending[player_id]
+                yield player_id, (obs, action, 0, state['obs'], state['legal_mask'], False)
+
+            # Agent plays
+            action = self._act(player_id, state, is_training)
+            pending[player_id] = (state['obs'], action)
+
+            # Environment steps
+            state, player_id = self.step(action, self.agents[player_id].use_raw)
+
+        # Payoffs
+        payoffs = self._get_run_payoffs(is_training)
+
+        # The last transitions end in the final state of each player
+        for player_id in range(self.num_players):
+            if pending[player_id] is not None:
+                obs, action = pending[player_id]
+                state = self.get_state(player_id)
+                yield player_id, (obs, action, payoffs[player_id], state['obs'], state['legal_mask'], True)
+
+        return payoffs
+
+    def get_profile(self):
+        ''' Get the time spent in each profiled part since the environment was
+            made or the profile was reset. The parts are 'game.step',
+            'game.get_state', '_extract_state', '_extract_obs',
+            '_get_legal_actions', '_get_legal_mask' and, for the agents
+            run by `run` and `rollout`, 'agent<player_id>.step' or
+            'agent<player_id>.eval_step'. The times are inclusive, e.g.
+            'game.step' includes the calls of 'game.get_state' it makes.
+
+        Returns:
+            (dict): For each part, a dictionary with the number of 'calls'
+                and the total 'time' in seconds. Profiles can be summed
+                with `rlcard.utils.merge_profiles`.
+        '''
+        if self.profiler is None:
+            raise Exception('Profiling is off. To use get_profile, please set profile=True in rlcard.make')
+        return self.profiler.get_profile()
+
+    def reset_profile(self):
+        ''' Set the profile to zero
+        '''
+        if self.profiler is None:
+            raise Exception('Profiling is off. To use reset_profile, please set profile=True in rlcard.make')
+        self.profiler.reset()
+
     def is_over(self):
         ''' Check whether the curent game is over
 
@@ -186,15 +336,23 @@ class Env(object):
 
 
     def get_state(self, player_id):
-        ''' Get the state given player id
+        ''' Get the state given player id. The state is computed once per
+            position: until the game changes, the same state is returned.
 
         Args:
             player_id (int): The player id
 
         Returns:
             (numpy.array): The observed state of the player
+
+        Note: The game should only be changed through the environment
+              (`reset`, `step`, `step_back` and `restore`), or the cached
+              states must be dropped with `_invalidate_states`.
         '''
-        return self._extract_state(self.game.get_state(player_id))
+        state = self._state_cache.get(player_id)
+        if state is None:
+            state = self._state_cache[player_id] = self._build_state(self.game.get_state(player_id))
+        return state
 
     def get_payoffs(self):
         ''' Get the payoffs of players. Must be implemented in the child class.
@@ -206,6 +364,16 @@ class Env(object):
         '''
         raise NotImplementedError
 
+    def _get_run_payoffs(self, is_training):
+        ''' Get the payoffs at the end of a run
+
+        Only some environments (e.g. Go Fish and Hearts) have separate payoffs
+        for training, so the flag is only passed along when it is set.
+        '''
+        if is_training:
+            return self.get_payoffs(is_training)
+        return self.get_payoffs()
+
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
 
@@ -230,6 +398,157 @@ class Env(object):
         self.game.np_random = self.np_random
         return seed
 
+    def set_deck_batch(self, deck_batch):
+        ''' Take the shuffles of the decks of the next games from a batch
+        of decks shuffled at once, e.g. for a copy of a vectorized environment
+
+        Args:
+            deck_batch (DeckBatch): The batch, or None to shuffle with the random state of the environment again
+        '''
+        if not hasattr(self.game, 'deck_batch'):
+            raise ValueError('{} does not deal its decks by their ids'.format(self.name))
+        if deck_batch is not None and self.game_log is not None:
+            raise ValueError('Cannot log games dealt from a deck batch, since their seeds do not replay them')
+        self.game.deck_batch = deck_batch
+
+    def close(self):
+        ''' Close the game log, if the games are logged. The games played
+        after are not logged.
+        '''
+        if self.game_log is not None:
+            self.game_log.close()
+            self.game_log = None
+
+    def encode_into(self, out, player_id=None):
+        ''' Encode the observation of a player directly into a caller-provided array,
+            e.g. a row of a replay buffer or of a vectorized environment batch.
+
+        Args:
+            out (numpy.array): An array of shape state_shape[player_id] to write into
+            player_id (int): The player id. Defaults to the current player.
+
+        Returns:
+            (numpy.array): The array that was written into
+        '''
+        if player_id is None:
+            player_id = self.get_player_id()
+        state = self._state_cache.get(player_id)
+        if state is not None:
+            out[...] = state['obs']
+        else:
+            self._encode_obs(self.game.get_state(player_id), out)
+        return out
+
+    def _encode_obs(self, state, out):
+        ''' Write the observation of a raw state into an array. Child classes should
+            override this to encode in place; by default the observation is
+            extracted and then copied.
+
+        Args:
+            state (dict): The raw state
+            out (numpy.array): The array to write into
+        '''
+        out[...] = self._extract_obs(state)
+
+    def _extract_obs(self, state):
+        ''' Get the observation of a raw state. Child classes that encode their
+            observations in place should override this too.
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (numpy.array): The observation
+        '''
+        return self._extract_state(state)['obs']
+
+    def _act(self, player_id, state, is_training):
+        ''' Let the agent of a player choose an action
+
+        Args:
+            player_id (int): The id of the player
+            state (dict): The state of the player
+            is_training (boolean): True if the agent should use `step`, else `eval_step`
+
+        Returns:
+            (int or string): The action of the agent
+        '''
+        agent = self.agents[player_id]
+        if self.profiler is None:
+            if is_training:
+                return agent.step(state)
+            return agent.eval_step(state)[0]
+
+        start = time.perf_counter()
+        if is_training:
+            action = agent.step(state)
+            name = 'agent{}.step'.format(player_id)
+        else:
+            action = agent.eval_step(state)[0]
+            name = 'agent{}.eval_step'.format(player_id)
+        self.profiler.record(name, time.perf_counter() - start)
+        return action
+
+    def _enable_profiling(self):
+        ''' Time the hot methods of the environment and of its game. The
+            methods are replaced by timed wrappers on the instances, so
+            nothing is added to the calls when profiling is off.
+        '''
+        self.profiler = Profiler()
+        for name in ('step', 'get_state'):
+            setattr(self.game, name, self.profiler.wrap('game.' + name, getattr(self.game, name)))
+        for name in ('_extract_state', '_extract_obs', '_get_legal_actions', '_get_legal_mask'):
+            setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+
+    def _invalidate_states(self):
+        ''' Drop the cached states after the game changed
+        '''
+        self.state_version += 1
+        self._state_cache = {}
+
+    def _build_state(self, state):
+        ''' Build the state returned to the agents, which is either a full
+            extracted state or, in fast mode, a lazy one. Both hold the legal
+            actions as a boolean mask in 'legal_mask'.
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (dict): The extracted state
+        '''
+        if self.fast_mode and type(self)._extract_obs is not Env._extract_obs:
+            return LazyState(self, state, self._extract_obs(state), self._get_legal_mask())
+        # The environments that do not encode their observations on their
+        # own (Dou Dizhu, Mahjong and Gin Rummy) are not accelerated by fast
+        # mode. Their extraction reads the game, so it is done right away.
+        extracted_state = self._extract_state(state)
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[list(extracted_state['legal_actions'])] = True
+        extracted_state['legal_mask'] = legal_mask
+        return extracted_state
+
+    def _get_legal_mask(self):
+        ''' Get the legal actions for the current state as a mask
+
+        Returns:
+            (numpy.array): A boolean array of length num_actions
+        '''
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[list(self._get_legal_actions())] = True
+        return legal_mask
+
+    def _legal_actions_from_mask(self, legal_mask):
+        ''' Get the legal actions in the format of `_extract_state` from a mask
+
+        Args:
+            legal_mask (numpy.array): A boolean array of length num_actions
+
+        Returns:
+            (OrderedDict): The legal action ids
+        '''
+        return OrderedDict((int(action_id), None) for action_id in np.flatnonzero(legal_mask))
+
     def _extract_state(self, state):
         ''' Extract useful information from state for RL. Must be implemented in the child class.
 
@@ -254,6 +573,29 @@ class Env(object):
         '''
         raise NotImplementedError
 
+    def _get_episode_config(self):
+        ''' Get the config that a logged game is replayed with. Child classes
+            add the game state that is kept from one game to the next.
+
+        Returns:
+            (dict): The game configuration
+        '''
+        return dict(self.game_config)
+
+    def _encode_action(self, action):
+        ''' Get the id of a raw action, by decoding the legal action ids
+
+        Args:
+            action: The raw action, as passed to the game
+
+        Returns:
+            (int): The id of the action
+        '''
+        for action_id in np.flatnonzero(self._get_legal_mask()):
+            if self._decode_action(int(action_id)) == action:
+                return int(action_id)
+        raise ValueError('Cannot find the id of the action {}'.format(action))
+
     def _get_legal_actions(self):
         ''' Get all legal actions for current state.
 
@@ -263,3 +605,48 @@ class Env(object):
         Note: Must be implemented in the child class.
         '''
         raise NotImplementedError
+
+
+class LazyState(dict):
+    ''' The state of an environment in fast mode. It only holds 'obs' and
+        'legal_mask'. 'legal_actions' is built from the mask, and the raw fields
+        ('raw_obs', 'raw_legal_actions', 'action_record', ...) are extracted
+        from the raw state the first time one of them is accessed, so they
+        are the fields of the position of the state even after the
+        environment stepped.
+
+    Note: The legal actions are ordered by id.
+    '''
+
+    def __init__(self, env, raw_state, obs, legal_mask):
+        super().__init__(obs=obs, legal_mask=legal_mask)
+        self._env = env
+        self._raw_state = raw_state
+
+    def __missing__(self, key):
+        if key == 'legal_actions':
+            self[key] = self._env._legal_actions_from_mask(self['legal_mask'])
+            return self[key]
+
+        extracted_state = self._env._extract_state(self._raw_state)
+        for extracted_key, value in extracted_state.items():
+            if extracted_key not in self and extracted_key != 'legal_actions':
+                self[extracted_key] = value
+        # Keep the raw legal actions aligned with the legal action ids. The
+        # mask is the one of the player to act, so the state of another
+        # player, e.g. at the end of a game, keeps the extracted order.
+        legal_action_ids = list(extracted_state['legal_actions'])
+        raw_legal_actions = extracted_state.get('raw_legal_actions')
+        if raw_legal_actions is not None and len(raw_legal_actions) == len(legal_action_ids) \
+                and set(legal_action_ids) == set(self['legal_actions']):
+            raw_legal_actions = dict(zip(legal_action_ids, raw_legal_actions))
+            self['raw_legal_actions'] = [raw_legal_actions[action_id] for action_id in self['legal_actions']]
+        if key not in self:
+            raise KeyError(key)
+        return self[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
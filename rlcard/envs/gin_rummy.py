@@ -24,6 +24,17 @@ class GinRummyEnv(Env):
         self.state_shape = [[5, 52] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
 
+    def __getstate__(self):
+        # The utils module does not pickle, e.g. when an environment is sent to another process
+        state = dict(self.__dict__)
+        del state['_utils']
+        return state
+
+    def __setstate__(self, state):
+        from rlcard.games.gin_rummy.utils import utils
+        self.__dict__.update(state)
+        self._utils = utils
+
     def _extract_state(self, state):  # 200213 don't use state ???
         ''' Encode state
 
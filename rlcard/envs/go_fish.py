@@ -12,6 +12,9 @@ DEFAULT_GAME_CONFIG = {
 }
 
 class GoFishEnv(Env):
+    # The observation only holds small counts. As before, expected values and
+    # percentages are truncated to integers.
+    obs_dtype = np.int8
 
     def __init__(self, config):
         self.name = 'go_fish'
@@ -30,45 +33,59 @@ class GoFishEnv(Env):
         self.action_shape = [None for _ in range(self.num_players)]
 
     def _extract_state(self, state):
-        obs_list = []
-        player_id = self.game.current_player_turn
-        obs_list.extend(state['card_counts'])
-        # obs_list.extend([card_count / (52 / self.num_players) for card_count in state['card_counts']])
-        obs_list.extend(state['books'])
-        # obs_list.extend([book / 6.5 - 1 for book in state['books'] ])
-        expected_values = [self.rank_quantity_dict_to_list(player_expected_values, 4) for player_expected_values in state['players_rank_expected_values']]
-        obs_list.extend([x for y in expected_values for x in y])
-        obs_list.append(state['deck_size'])
-        # obs_list.append(state['deck_size'] / (52 - 5 * self.num_players))
-        player_hand = self.rank_quantity_dict_to_list(state['player_hand_by_rank'], 3)
-        obs_list.extend(player_hand)
-        player_public_hand = self.rank_quantity_dict_to_list(state['public_cards'][0], 3)
-        obs_list.extend(player_public_hand)
-
-        public_not_revealed_count = state['card_counts'][0] - sum(player_public_hand) + len(state['public_possible_cards_of_rank'][0])
-        player_public_not_possible_percentage = []
+        obs = self._extract_obs(state)
+
+        legal_action_ids = OrderedDict((self.game.action_space[action], None) for action in state['legal_actions'])
+        extracted_state = {'obs': obs, 'legal_actions': legal_action_ids}
+        extracted_state['raw_obs'] = state
+        extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
+        extracted_state['action_record'] = self.action_recorder
+        return extracted_state
+
+    def _build_state(self, state):
+        extracted_state = super()._build_state(state)
+        # The arrays that the vector rule agents act on are taken from the
+        # game now, while it is at the position of the state, and even in
+        # fast mode, so that reading them does not extract the whole state
+        extracted_state.update(self.game.get_rank_arrays())
+        return extracted_state
+
+    def _extract_obs(self, state):
+        obs = np.zeros((self.state_shape_num_elements), dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        num_players = self.num_players
+        out[0:num_players] = state['card_counts']
+        index = num_players
+        # out[0:num_players] = [card_count / (52 / self.num_players) for card_count in state['card_counts']]
+        out[index:index + num_players] = state['books']
+        index += num_players
+        # out[index:index + num_players] = [book / 6.5 - 1 for book in state['books'] ]
+        for player_expected_values in state['players_rank_expected_values']:
+            index = self._encode_rank_quantities(out, index, player_expected_values)
+        out[index] = state['deck_size']
+        index += 1
+        # out[index] = state['deck_size'] / (52 - 5 * self.num_players)
+        index = self._encode_rank_quantities(out, index, state['player_hand_by_rank'])
+        player_public_hand = state['public_cards'][0]
+        index = self._encode_rank_quantities(out, index, player_public_hand)
+
+        public_not_revealed_count = state['card_counts'][0] - sum(player_public_hand.values()) + len(state['public_possible_cards_of_rank'][0])
         not_possible = state['public_not_possible_cards_of_rank'][0]
+        remaining_ranks = state['remaining_ranks']
         for rank in Card.valid_rank:
-            if rank not in state['remaining_ranks'] or public_not_revealed_count == 0:
+            if rank not in remaining_ranks or public_not_revealed_count == 0:
                 percentage = 1
             elif rank not in not_possible:
                 percentage = 0
             else:
                 percentage = not_possible[rank] / public_not_revealed_count
-            player_public_not_possible_percentage.append(percentage)
-        obs_list.extend(player_public_not_possible_percentage)
+            out[index] = percentage
+            index += 1
 
-        obs = np.zeros((self.state_shape_num_elements), dtype=int)
-        obs[0:] = obs_list
-
-        legal_action_ids = self._get_legal_actions()
-        extracted_state = {'obs': obs, 'legal_actions': legal_action_ids}
-        extracted_state['raw_obs'] = state
-        extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
-        extracted_state['action_record'] = self.action_recorder
-        return extracted_state
-
-    def get_payoffs(self, is_training):
+    def get_payoffs(self, is_training=False):
         return np.array(self.game.get_payoffs(is_training))
 
     def _decode_action(self, action_id):
@@ -80,6 +97,17 @@ class GoFishEnv(Env):
         legal_ids = {self.game.action_space[action]: None for action in legal_actions}
         return OrderedDict(legal_ids)
 
+    def _get_legal_mask(self):
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[self.game.action_space[action] for action in self.game.get_legal_actions()]] = True
+        return legal_mask
+
+    @staticmethod
+    def _encode_rank_quantities(out, offset, rank_dict):
+        for i, rank in enumerate(Card.valid_rank):
+            out[offset + i] = rank_dict.get(rank, 0)
+        return offset + 13
+
     @staticmethod
     def rank_quantity_dict_to_list(rank_dict, normalization=1):
         rank_list = []
@@ -5,7 +5,7 @@ from collections import OrderedDict
 
 from rlcard.envs import Env
 from rlcard.games.hearts import Game
-from rlcard.games.base import Card
+from rlcard.games.base import Card, CardSet
 from rlcard.utils.utils import print_card
 
 DEFAULT_GAME_CONFIG = {
@@ -18,6 +18,8 @@ DEFAULT_GAME_CONFIG = {
 SUITS = ['S', 'H', 'D', 'C']
 
 class HeartsEnv(Env):
+    # Scores are at most 126 (a game ends once a score is over 100), so they fit in int8
+    obs_dtype = np.int8
 
     def __init__(self, config):
         self.name = 'hearts'
@@ -41,42 +43,42 @@ class HeartsEnv(Env):
         self.action_shape = [None for _ in range(self.num_players)]
 
     def _extract_state(self, state):
-        obs = np.zeros((self.state_shape_num_elements), dtype=int)
-        obs[0] = state['hearts_are_broken']
-        obs[1] = state['passing_cards']
-        obs[2] = state['passing_cards_players_to_left']
-        obs[3] = state['is_lead']
-        obs[4] = state['can_sluff']
+        obs = self._extract_obs(state)
+
+        return {
+            'obs': obs,
+            'legal_actions': OrderedDict((self.game.action_space[action], None) for action in state['legal_actions']),
+            'raw_obs': state,
+            'raw_legal_actions': [a for a in state['legal_actions']],
+            'action_record': self.action_recorder
+        }
+
+    def _extract_obs(self, state):
+        obs = np.zeros((self.state_shape_num_elements), dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        out[...] = 0
+        out[0] = state['hearts_are_broken']
+        out[1] = state['passing_cards']
+        out[2] = state['passing_cards_players_to_left']
+        out[3] = state['is_lead']
+        out[4] = state['can_sluff']
         index = 5
         for round_score in state['round_scores']:
-            obs[index] = round_score
+            out[index] = round_score
             index += 1
         for game_score in state['game_scores']:
-            obs[index] = game_score
+            out[index] = game_score
             index += 1
         for public_void_suits in state['public_void_suits']:
             for suit in SUITS:
                 if public_void_suits[suit]:
-                    obs[index] = 1
+                    out[index] = 1
                 index += 1
-        index = self._apply_cards_to_obs(obs, index, state['passed_cards'])
-        index = self._apply_cards_to_obs(obs, index, state['trick'])
-        index = self._apply_cards_to_obs(obs, index, state['player_hand'])
-        for played_cards in state['played_cards']:
-            index = self._apply_cards_to_obs(obs, index, played_cards)
-
-        return {
-            'obs': obs,
-            'legal_actions': self._get_legal_actions(),
-            'raw_obs': state,
-            'raw_legal_actions': [a for a in state['legal_actions']],
-            'action_record': self.action_recorder
-        }
-
-    def _apply_cards_to_obs(self, obs, offset, cards):
-        for card in cards:
-            obs[offset + card.get_numeric_index()] = 1
-        return offset + 52
+        card_sets = [state['passed_cards'], state['trick'], state['player_hand']] + state['played_cards']
+        CardSet.encode_many(card_sets, out[index:index + 52 * len(card_sets)].reshape(len(card_sets), 52))
 
     def step(self, action, raw_action=False):
         state, player_id = Env.step(self, action, raw_action)
@@ -96,7 +98,7 @@ class HeartsEnv(Env):
         for _ in range(num_lines):
             print('')
 
-    def get_payoffs(self, is_training):
+    def get_payoffs(self, is_training=False):
         return np.array(self.game.get_payoffs(is_training))
 
     def _decode_action(self, action_id):
@@ -108,6 +110,11 @@ class HeartsEnv(Env):
         legal_ids = {self.game.action_space[action]: None for action in legal_actions}
         return OrderedDict(legal_ids)
 
+    def _get_legal_mask(self):
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[self.game.action_space[action] for action in self.game.get_legal_actions()]] = True
+        return legal_mask
+
     @staticmethod
     def rank_quantity_dict_to_list(rank_dict):
         rank_list = []
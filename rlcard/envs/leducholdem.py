@@ -38,6 +38,16 @@ class LeducholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_mask(self):
+        ''' Get all leagal actions as a mask
+
+        Returns:
+            legal_mask (numpy.array): boolean array of length num_actions
+        '''
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[self.actions.index(a) for a in self.game.get_legal_actions()]] = True
+        return legal_mask
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -54,14 +64,7 @@ class LeducholdemEnv(Env):
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
 
-        public_card = state['public_card']
-        hand = state['hand']
-        obs = np.zeros(36)
-        obs[self.card2index[hand]] = 1
-        if public_card:
-            obs[self.card2index[public_card]+3] = 1
-        obs[state['my_chips']+6] = 1
-        obs[state['all_chips'][1]+20] = 1
+        obs = self._extract_obs(state)
         extracted_state['obs'] = obs
 
         extracted_state['raw_obs'] = state
@@ -70,6 +73,26 @@ class LeducholdemEnv(Env):
 
         return extracted_state
 
+    def _extract_obs(self, state):
+        obs = np.zeros(36, dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        ''' Write the state representation into an array in place
+
+        Args:
+            state (dict): Original state from the game
+            out (numpy.array): The array to write into
+        '''
+        out[...] = 0
+        public_card = state['public_card']
+        out[self.card2index[state['hand']]] = 1
+        if public_card:
+            out[self.card2index[public_card]+3] = 1
+        out[state['my_chips']+6] = 1
+        out[state['all_chips'][1]+20] = 1
+
     def get_payoffs(self):
         ''' Get the payoff of a game
 
@@ -37,6 +37,16 @@ class LimitholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_mask(self):
+        ''' Get all leagal actions as a mask
+
+        Returns:
+            legal_mask (numpy.array): boolean array of length num_actions
+        '''
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[self.actions.index(a) for a in self.game.get_legal_actions()]] = True
+        return legal_mask
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -53,15 +63,7 @@ class LimitholdemEnv(Env):
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
 
-        public_cards = state['public_cards']
-        hand = state['hand']
-        raise_nums = state['raise_nums']
-        cards = public_cards + hand
-        idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(72)
-        obs[idx] = 1
-        for i, num in enumerate(raise_nums):
-            obs[52 + i * 5 + num] = 1
+        obs = self._extract_obs(state)
         extracted_state['obs'] = obs
 
         extracted_state['raw_obs'] = state
@@ -70,6 +72,25 @@ class LimitholdemEnv(Env):
 
         return extracted_state
 
+    def _extract_obs(self, state):
+        obs = np.zeros(72, dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        ''' Write the state representation into an array in place
+
+        Args:
+            state (dict): Original state from the game
+            out (numpy.array): The array to write into
+        '''
+        out[...] = 0
+        cards = state['public_cards'] + state['hand']
+        idx = [self.card2index[card] for card in cards]
+        out[idx] = 1
+        for i, num in enumerate(state['raise_nums']):
+            out[52 + i * 5 + num] = 1
+
     def get_payoffs(self):
         ''' Get the payoff of a game
 
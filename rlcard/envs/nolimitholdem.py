@@ -42,6 +42,16 @@ class NolimitholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_mask(self):
+        ''' Get all leagal actions as a mask
+
+        Returns:
+            legal_mask (numpy.array): boolean array of length num_actions
+        '''
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[action.value for action in self.game.get_legal_actions()]] = True
+        return legal_mask
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -58,16 +68,7 @@ class NolimitholdemEnv(Env):
         legal_actions = OrderedDict({action.value: None for action in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
 
-        public_cards = state['public_cards']
-        hand = state['hand']
-        my_chips = state['my_chips']
-        all_chips = state['all_chips']
-        cards = public_cards + hand
-        idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(54)
-        obs[idx] = 1
-        obs[52] = float(my_chips)
-        obs[53] = float(max(all_chips))
+        obs = self._extract_obs(state)
         extracted_state['obs'] = obs
 
         extracted_state['raw_obs'] = state
@@ -76,6 +77,25 @@ class NolimitholdemEnv(Env):
 
         return extracted_state
 
+    def _extract_obs(self, state):
+        obs = np.zeros(54, dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        ''' Write the state representation into an array in place
+
+        Args:
+            state (dict): Original state from the game
+            out (numpy.array): The array to write into
+        '''
+        out[...] = 0
+        cards = state['public_cards'] + state['hand']
+        idx = [self.card2index[card] for card in cards]
+        out[idx] = 1
+        out[52] = float(state['my_chips'])
+        out[53] = float(max(state['all_chips']))
+
     def get_payoffs(self):
         ''' Get the payoff of a game
 
@@ -84,6 +104,18 @@ class NolimitholdemEnv(Env):
         '''
         return np.array(self.game.get_payoffs())
 
+    def _get_episode_config(self):
+        ''' Get the config that a logged game is replayed with. The dealer
+            chosen in the first game is kept for the next games.
+
+        Returns:
+            (dict): The game configuration
+        '''
+        episode_config = dict(self.game_config)
+        if self.game.dealer_id is not None:
+            episode_config['dealer_id'] = int(self.game.dealer_id)
+        return episode_config
+
     def _decode_action(self, action_id):
         ''' Decode the action for applying to the game
 
@@ -4,6 +4,9 @@ import importlib
 DEFAULT_CONFIG = {
         'allow_step_back': False,
         'seed': None,
+        'fast_mode': False,
+        'profile': False,
+        'game_log': None,
         }
 
 class EnvSpec(object):
@@ -18,8 +21,21 @@ class EnvSpec(object):
             entry_point (string): A string the indicates the location of the envronment class
         '''
         self.env_id = env_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self.entry_point = entry_point
+        self._mod_name, self._class_name = entry_point.split(':')
+        self._env_class = None
+
+    def load(self):
+        ''' Import the environment class. The module of the environment is
+        only imported the first time it is needed, so that registering all
+        the games at import time stays cheap.
+
+        Returns:
+            (class): The environment class
+        '''
+        if self._env_class is None:
+            self._env_class = getattr(importlib.import_module(self._mod_name), self._class_name)
+        return self._env_class
 
     def make(self, config=DEFAULT_CONFIG):
         ''' Instantiates an instance of the environment
@@ -28,7 +44,7 @@ class EnvSpec(object):
             env (Env): An instance of the environemnt
             config (dict): A dictionary of the environment settings
         '''
-        env = self._entry_point(config)
+        env = self.load()(config)
         return env
 
 class EnvRegistry(object):
@@ -87,3 +103,49 @@ def make(env_id, config={}):
         _config[key] = config[key]
 
     return registry.make(env_id, _config)
+
+def make_vec(env_id, num_envs, config={}, num_workers=0, batch_deals=False):
+    ''' Create a vectorized environment running several copies of one game
+
+    Args:
+        env_id (string): The name of the environment
+        num_envs (int): The number of copies of the environment
+        config (dict): A dictionary of the environment settings. If a seed is
+            given, the i-th copy is seeded with the i-th of the independent
+            seeds spawned from it, so that the copies do not play the same
+            games and the i-th copy plays the same games for any
+            num_workers. The copies run in fast mode unless
+            'fast_mode' is set to False, since only the observations and the
+            legal action masks are read.
+        num_workers (int): The number of worker processes to shard the copies
+            across. The copies run in the current process if it is 0.
+        batch_deals (boolean): True if the decks of each copy should be
+            shuffled many games at a time by a DeckBatch of its own, instead
+            of by its random state. The i-th copy then deals the same games
+            for any num_workers, but not the same as without batch_deals,
+            and the games cannot be logged.
+
+    Returns:
+        (VectorEnv or SubprocVectorEnv): The vectorized environment
+    '''
+    from rlcard.utils.seeding import spawn_seeds
+
+    seeds = [None for _ in range(num_envs)]
+    deck_seeds = None
+    if config.get('seed') is not None:
+        # The deck batches are seeded from one more seed, so the copies keep theirs
+        seeds = spawn_seeds(config['seed'], num_envs + 1)
+        deck_seeds = spawn_seeds(seeds.pop(), num_envs)
+    configs = []
+    for seed in seeds:
+        _config = dict(config)
+        _config.setdefault('fast_mode', True)
+        _config['seed'] = seed
+        configs.append(_config)
+
+    if num_workers > 0:
+        from rlcard.envs.subproc_vec_env import SubprocVectorEnv
+        return SubprocVectorEnv(env_id, configs, num_workers, batch_deals=batch_deals, deck_seeds=deck_seeds)
+
+    from rlcard.envs.vec_env import VectorEnv
+    return VectorEnv([make(env_id, _config) for _config in configs], batch_deals=batch_deals, deck_seeds=deck_seeds)
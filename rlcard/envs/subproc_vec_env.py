@@ -0,0 +1,213 @@
+import ctypes
+import multiprocessing as mp
+import traceback
+
+import numpy as np
+
+from rlcard.envs.vec_env import buffer_specs
+from rlcard.utils.profiler import merge_profiles
+
+
+class SubprocVectorEnv(object):
+    ''' Run several copies of the same environment in a pool of worker processes.
+
+    The games are sharded across the workers. Every worker steps its own games
+    and writes the observations, legal action masks, player ids, payoffs and
+    done flags straight into arrays in shared memory, so no state is pickled
+    between the processes. The interface is the same as VectorEnv.
+    '''
+
+    def __init__(self, env_id, configs, num_workers, start_method=None, batch_deals=False, deck_seeds=None):
+        ''' Initialize the vectorized environment and start the workers
+
+        Args:
+            env_id (string): The name of the environment
+            configs (list): A config dictionary for each copy of the environment
+            num_workers (int): The number of worker processes
+            start_method (string): The multiprocessing start method, e.g. 'fork' or 'spawn'.
+                The platform default is used if it is None.
+            batch_deals (boolean): True if the decks of each environment should
+                be shuffled many games at a time, see VectorEnv
+            deck_seeds (list): The seed of the DeckBatch of each environment.
+                Random seeds are used if it is None.
+        '''
+        from rlcard.envs.registration import make
+
+        self.num_envs = len(configs)
+        if self.num_envs == 0:
+            raise ValueError('SubprocVectorEnv needs at least one environment')
+        num_workers = max(1, min(num_workers, self.num_envs))
+
+        # Build one environment locally to know the shapes of the buffers
+        env = make(env_id, configs[0])
+        env.close()
+        self.name = env.name
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+        state_shapes = [list(shape) for shape in env.state_shape]
+        if any(shape != state_shapes[0] for shape in state_shapes):
+            raise ValueError('Cannot vectorize {}: the state shape differs between players'.format(self.name))
+        self.state_shape = state_shapes[0]
+
+        ctx = mp.get_context(start_method)
+        specs = buffer_specs(self.num_envs, self.state_shape, self.num_actions, self.num_players, env.obs_dtype)
+        specs['actions'] = ((self.num_envs,), np.int64)
+        self._shared = {key: _allocate_shared(ctx, shape, dtype) for key, (shape, dtype) in specs.items()}
+        self._buffers = {key: _as_array(raw, *specs[key]) for key, raw in self._shared.items()}
+        self.obs = self._buffers['obs']
+        self.legal_masks = self._buffers['legal_masks']
+        self.player_ids = self._buffers['player_ids']
+        self.payoffs = self._buffers['payoffs']
+        self.dones = self._buffers['dones']
+        self.actions = self._buffers['actions']
+
+        if deck_seeds is None:
+            deck_seeds = [None for _ in configs]
+
+        self._remotes = []
+        self._processes = []
+        for shard in np.array_split(np.arange(self.num_envs), num_workers):
+            start, end = int(shard[0]), int(shard[-1]) + 1
+            remote, worker_remote = ctx.Pipe()
+            process = ctx.Process(target=_worker,
+                                  args=(worker_remote, env_id, configs[start:end], start, end, self._shared, specs,
+                                        batch_deals, deck_seeds[start:end]))
+            process.daemon = True
+            process.start()
+            worker_remote.close()
+            self._remotes.append(remote)
+            self._processes.append(process)
+        self.num_workers = len(self._processes)
+        self.closed = False
+        self._gather()
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The observations, of shape (num_envs, *state_shape)
+                (numpy.array): The legal action masks, of shape (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, of shape (num_envs,)
+
+        Note: The returned arrays live in shared memory and are reused by the next
+              call to `reset` or `step`. Copy them if they need to be kept.
+        '''
+        self._broadcast(('reset', None))
+        return self.obs, self.legal_masks, self.player_ids
+
+    def step(self, actions, is_training=False):
+        ''' Take one step in every environment. Finished games are reset.
+
+        Args:
+            actions (numpy.array): The action id taken by the current player of each environment
+            is_training (boolean): True if the payoffs are used for training
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The observations, of shape (num_envs, *state_shape)
+                (numpy.array): The legal action masks, of shape (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, of shape (num_envs,)
+                (numpy.array): The payoffs of the games that just ended, of shape (num_envs, num_players)
+                (numpy.array): True for the games that just ended, of shape (num_envs,)
+
+        Note: The returned arrays live in shared memory and are reused by the next
+              call to `reset` or `step`. Copy them if they need to be kept.
+        '''
+        self.actions[:] = actions
+        self._broadcast(('step', is_training))
+        return self.obs, self.legal_masks, self.player_ids, self.payoffs, self.dones
+
+    def get_profile(self):
+        ''' Get the profile of all the environments, made with profile=True
+
+        Returns:
+            (dict): The sum of the profiles of the environments of all the workers
+        '''
+        return merge_profiles(self._broadcast(('get_profile', None)))
+
+    def reset_profile(self):
+        ''' Set the profiles of all the environments to zero
+        '''
+        self._broadcast(('reset_profile', None))
+
+    def close(self):
+        ''' Stop the worker processes, which close their environments
+        '''
+        if self.closed:
+            return
+        for remote in self._remotes:
+            try:
+                remote.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join()
+        self.closed = True
+
+    def _broadcast(self, message):
+        if self.closed:
+            raise RuntimeError('Cannot use a closed SubprocVectorEnv')
+        for remote in self._remotes:
+            remote.send(message)
+        return self._gather()
+
+    def _gather(self):
+        results = [remote.recv() for remote in self._remotes]
+        for status, payload in results:
+            if status == 'error':
+                self.close()
+                raise RuntimeError('A SubprocVectorEnv worker failed:\n{}'.format(payload))
+        return [payload for _, payload in results]
+
+def _allocate_shared(ctx, shape, dtype):
+    return ctx.RawArray(ctypes.c_byte, max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+
+def _as_array(raw, shape, dtype):
+    return np.frombuffer(raw, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+def _worker(remote, env_id, configs, start, end, shared, specs, batch_deals, deck_seeds):
+    ''' Step a shard of the environments and write the results into shared memory
+    '''
+    try:
+        from rlcard.envs.registration import make
+        from rlcard.envs.vec_env import VectorEnv
+
+        arrays = {key: _as_array(raw, *specs[key]) for key, raw in shared.items()}
+        buffers = {key: array[start:end] for key, array in arrays.items()}
+        vec_env = VectorEnv([make(env_id, config) for config in configs], buffers=buffers,
+                            batch_deals=batch_deals, deck_seeds=deck_seeds)
+        actions = buffers['actions']
+        remote.send(('ok', None))
+    except Exception:
+        remote.send(('error', traceback.format_exc()))
+        remote.close()
+        return
+
+    while True:
+        try:
+            command, data = remote.recv()
+        except EOFError:
+            break
+        try:
+            if command == 'reset':
+                vec_env.reset()
+                remote.send(('ok', None))
+            elif command == 'step':
+                vec_env.step(actions, is_training=data)
+                remote.send(('ok', None))
+            elif command == 'get_profile':
+                remote.send(('ok', vec_env.get_profile()))
+            elif command == 'reset_profile':
+                vec_env.reset_profile()
+                remote.send(('ok', None))
+            elif command == 'close':
+                break
+            else:
+                raise ValueError('Unknown command: {}'.format(command))
+        except Exception:
+            remote.send(('error', traceback.format_exc()))
+    vec_env.close()
+    remote.close()
@@ -12,6 +12,7 @@ DEFAULT_GAME_CONFIG = {
         }
 
 class UnoEnv(Env):
+    obs_dtype = np.int8
 
     def __init__(self, config):
         self.name = 'uno'
@@ -22,16 +23,24 @@ class UnoEnv(Env):
         self.action_shape = [None for _ in range(self.num_players)]
 
     def _extract_state(self, state):
-        obs = np.zeros((4, 4, 15), dtype=int)
-        encode_hand(obs[:3], state['hand'])
-        encode_target(obs[3], state['target'])
-        legal_action_id = self._get_legal_actions()
+        obs = self._extract_obs(state)
+        legal_action_id = OrderedDict((ACTION_SPACE[action], None) for action in state['legal_actions'])
         extracted_state = {'obs': obs, 'legal_actions': legal_action_id}
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
         extracted_state['action_record'] = self.action_recorder
         return extracted_state
 
+    def _extract_obs(self, state):
+        obs = np.zeros((4, 4, 15), dtype=self.obs_dtype)
+        self._encode_obs(state, obs)
+        return obs
+
+    def _encode_obs(self, state, out):
+        out[...] = 0
+        encode_hand(out[:3], state['hand'])
+        encode_target(out[3], state['target'])
+
     def get_payoffs(self):
 
         return np.array(self.game.get_payoffs())
@@ -49,6 +58,11 @@ class UnoEnv(Env):
         legal_ids = {ACTION_SPACE[action]: None for action in legal_actions}
         return OrderedDict(legal_ids)
 
+    def _get_legal_mask(self):
+        legal_mask = np.zeros(self.num_actions, dtype=bool)
+        legal_mask[[ACTION_SPACE[action] for action in self.game.get_legal_actions()]] = True
+        return legal_mask
+
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
 
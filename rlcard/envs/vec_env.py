@@ -0,0 +1,165 @@
+import numpy as np
+
+from rlcard.utils.dealing import DeckBatch
+from rlcard.utils.profiler import merge_profiles
+
+# The number of decks that the DeckBatch of each environment shuffles at once
+DECK_BATCH_SIZE = 64
+
+
+class VectorEnv(object):
+    ''' Run several copies of the same environment in lockstep.
+
+    The states of all the copies are stacked into preallocated NumPy arrays so
+    that an agent can act on a whole batch of games at once. A game that is
+    over is automatically reset, so every row always holds a live game.
+    '''
+
+    def __init__(self, envs, buffers=None, batch_deals=False, deck_seeds=None):
+        ''' Initialize the vectorized environment
+
+        Args:
+            envs (list): A list of Env instances of the same game and configuration
+            buffers (dict): Optional preallocated arrays to write the results into,
+                with the keys 'obs', 'legal_masks', 'player_ids', 'payoffs' and 'dones'.
+                By default new arrays are allocated.
+            batch_deals (boolean): True if the decks of each environment should be
+                shuffled many games at a time, by a DeckBatch of its own, instead
+                of by its random state
+            deck_seeds (list): The seed of the DeckBatch of each environment.
+                Random seeds are used if it is None.
+        '''
+        if len(envs) == 0:
+            raise ValueError('VectorEnv needs at least one environment')
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.name = envs[0].name
+        self.num_players = envs[0].num_players
+        self.num_actions = envs[0].num_actions
+        self.deck_batches = None
+        if batch_deals:
+            if deck_seeds is None:
+                deck_seeds = [None for _ in envs]
+            self.deck_batches = [DeckBatch(DECK_BATCH_SIZE, deck_seed) for deck_seed in deck_seeds]
+            for env, deck_batch in zip(envs, self.deck_batches):
+                env.set_deck_batch(deck_batch)
+
+        # All the players must observe states of the same shape to be stacked
+        state_shapes = [list(shape) for shape in envs[0].state_shape]
+        if any(shape != state_shapes[0] for shape in state_shapes):
+            raise ValueError('Cannot vectorize {}: the state shape differs between players'.format(self.name))
+        self.state_shape = state_shapes[0]
+
+        if buffers is None:
+            buffers = allocate_buffers(self.num_envs, self.state_shape, self.num_actions, self.num_players, envs[0].obs_dtype)
+        self.obs = buffers['obs']
+        self.legal_masks = buffers['legal_masks']
+        self.player_ids = buffers['player_ids']
+        self.payoffs = buffers['payoffs']
+        self.dones = buffers['dones']
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The observations, of shape (num_envs, *state_shape)
+                (numpy.array): The legal action masks, of shape (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, of shape (num_envs,)
+
+        Note: The returned arrays are reused by the next call to `reset` or `step`.
+              Copy them if they need to be kept.
+        '''
+        for i, env in enumerate(self.envs):
+            state, player_id = env.reset()
+            self._write_state(i, state, player_id)
+        self.payoffs[:] = 0
+        self.dones[:] = False
+        return self.obs, self.legal_masks, self.player_ids
+
+    def step(self, actions, is_training=False):
+        ''' Take one step in every environment. Finished games are reset.
+
+        Args:
+            actions (numpy.array): The action id taken by the current player of each environment
+            is_training (boolean): True if the payoffs are used for training
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The observations, of shape (num_envs, *state_shape)
+                (numpy.array): The legal action masks, of shape (num_envs, num_actions)
+                (numpy.array): The ids of the players to act, of shape (num_envs,)
+                (numpy.array): The payoffs of the games that just ended, of shape (num_envs, num_players)
+                (numpy.array): True for the games that just ended, of shape (num_envs,)
+
+        Note: The returned arrays are reused by the next call to `reset` or `step`.
+              Copy them if they need to be kept. The row of a finished game already
+              holds the first state of the next game.
+        '''
+        self.payoffs[:] = 0
+        for i, env in enumerate(self.envs):
+            state, player_id = env.step(int(actions[i]))
+            done = env.is_over()
+            self.dones[i] = done
+            if done:
+                self.payoffs[i] = env._get_run_payoffs(is_training)
+                state, player_id = env.reset()
+            self._write_state(i, state, player_id)
+        return self.obs, self.legal_masks, self.player_ids, self.payoffs, self.dones
+
+    def get_profile(self):
+        ''' Get the profile of all the environments, made with profile=True
+
+        Returns:
+            (dict): The sum of the profiles of the environments
+        '''
+        return merge_profiles([env.get_profile() for env in self.envs])
+
+    def reset_profile(self):
+        ''' Set the profiles of all the environments to zero
+        '''
+        for env in self.envs:
+            env.reset_profile()
+
+    def close(self):
+        ''' Close the environments, e.g. their game logs
+        '''
+        for env in self.envs:
+            env.close()
+
+    def _write_state(self, index, state, player_id):
+        ''' Copy an extracted state into the stacked arrays
+
+        Args:
+            index (int): The index of the environment
+            state (dict): The extracted state of the environment
+            player_id (int): The id of the player to act
+        '''
+        self.obs[index] = state['obs']
+        self.legal_masks[index] = state['legal_mask']
+        self.player_ids[index] = player_id
+
+def buffer_specs(num_envs, state_shape, num_actions, num_players, obs_dtype=np.float32):
+    ''' Get the shapes and types of the arrays written by a vectorized environment
+
+    Returns:
+        (dict): A dictionary of (shape, dtype) tuples
+    '''
+    return {
+        'obs': (tuple([num_envs] + list(state_shape)), obs_dtype),
+        'legal_masks': ((num_envs, num_actions), np.bool_),
+        'player_ids': ((num_envs,), np.int64),
+        'payoffs': ((num_envs, num_players), np.float32),
+        'dones': ((num_envs,), np.bool_),
+    }
+
+def allocate_buffers(num_envs, state_shape, num_actions, num_players, obs_dtype=np.float32):
+    ''' Allocate the arrays written by a vectorized environment
+
+    Returns:
+        (dict): A dictionary of numpy arrays
+    '''
+    specs = buffer_specs(num_envs, state_shape, num_actions, num_players, obs_dtype)
+    return {key: np.zeros(shape, dtype=dtype) for key, (shape, dtype) in specs.items()}
@@ -1,5 +1,7 @@
 ''' Game-related base classes
 '''
+import numpy as np
+
 class Card:
     '''
     Card stores the suit and rank of a single card
@@ -7,35 +9,75 @@ class Card:
     Note:
         The suit variable in a standard card game should be one of [S, H, D, C, BJ, RJ] meaning [Spades, Hearts, Diamonds, Clubs, Black Joker, Red Joker]
         Similarly the rank variable should be one of [A, 2, 3, 4, 5, 6, 7, 8, 9, T, J, Q, K]
+
+        There is a single immutable Card object for each card, created when
+        the module is imported, and `Card(suit, rank)` returns it. Comparing
+        and hashing cards only reads their precomputed integers.
     '''
-    suit = None
-    rank = None
+    __slots__ = ('suit', 'rank', 'str', 'rank_index', 'suit_index', '_index', '_order')
+
     valid_suit = ['S', 'H', 'D', 'C', 'BJ', 'RJ']
     valid_rank = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 
-    def __init__(self, suit, rank):
-        ''' Initialize the suit and rank of a card
+    # The interned cards, by (suit, rank) and by index
+    _cards = {}
+    _cards_by_index = []
+
+    def __new__(cls, suit, rank):
+        ''' Get the card of a suit and a rank
 
         Args:
             suit: string, suit of the card, should be one of valid_suit
-            rank: string, rank of the card, should be one of valid_rank
+            rank: string, rank of the card, should be one of valid_rank, or '' for a joker
+        '''
+        try:
+            return cls._cards[suit, rank]
+        except KeyError:
+            raise ValueError('Invalid card: suit {!r}, rank {!r}'.format(suit, rank)) from None
+
+    def __init__(self, suit, rank):
+        # The card was initialized when it was interned
+        pass
+
+    @classmethod
+    def from_index(cls, index):
+        ''' Get a card from its index
+
+        Args:
+            index (int): The index of the card, suit_index * 13 + rank_index
+                for the 52 standard cards, 52 for the black joker and 53
+                for the red joker
+
+        Returns:
+            (Card): The card
         '''
-        self.suit = suit
-        self.rank = rank
-        self.str = self.rank + self.suit
-        # self._hash = Card.valid_rank.index(self.rank) + 100 * Card.valid_suit.index(self.suit)
-        self._index = Card.valid_suit.index(self.suit) * 13 + Card.valid_rank.index(self.rank)
+        return cls._cards_by_index[index]
+
+    @classmethod
+    def _intern(cls, suit, rank, index):
+        card = object.__new__(cls)
+        suit_index = cls.valid_suit.index(suit)
+        # The jokers are ranked above the aces
+        rank_index = cls.valid_rank.index(rank) if rank else len(cls.valid_rank)
+        for name, value in (('suit', suit), ('rank', rank), ('str', rank + suit), ('rank_index', rank_index),
+                            ('suit_index', suit_index), ('_index', index), ('_order', rank_index * len(cls.valid_suit) + suit_index)):
+            object.__setattr__(card, name, value)
+        cls._cards[suit, rank] = card
+        cls._cards_by_index.append(card)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Card objects are immutable')
+
+    def __reduce__(self):
+        # Copies and unpickled cards are the interned cards
+        return (Card.from_index, (self._index,))
 
     def __lt__(self, other):
-        self_rank_index = Card.valid_rank.index(self.rank)
-        other_rank_index = Card.valid_rank.index(other.rank)
-        if self_rank_index == other_rank_index:
-            return Card.valid_suit.index(self.suit) < Card.valid_suit.index(other.suit)
-        return self_rank_index < other_rank_index
+        return self._order < other._order
 
     def __eq__(self, other):
         if isinstance(other, Card):
-            return self.rank == other.rank and self.suit == other.suit
+            return self._index == other._index
         else:
             # don't attempt to compare against unrelated types
             return NotImplemented
@@ -79,3 +121,215 @@ class Card:
         if self.is_a_heart():
             return 1
         return 0
+
+for _suit in Card.valid_suit[:4]:
+    for _rank in Card.valid_rank:
+        Card._intern(_suit, _rank, len(Card._cards_by_index))
+Card._intern('BJ', '', 52)
+Card._intern('RJ', '', 53)
+
+class CardSet:
+    '''
+    CardSet is a mutable set of cards stored as the bits of an integer, bit i
+    being set if the card of index i is in the set
+
+    Note:
+        It supports the operations of a set of cards that the games use,
+        and iterates over the cards in the order of their indices. The
+        union, intersection and difference of two card sets, their sizes
+        and their one-hot encodings do not look at the cards one by one.
+    '''
+    __slots__ = ('mask',)
+
+    def __init__(self, cards=()):
+        ''' Initialize the set
+
+        Args:
+            cards (iterable): The cards of the set
+        '''
+        self.mask = _mask_of(cards)
+
+    @classmethod
+    def from_mask(cls, mask):
+        ''' Get the set of the cards whose bits are set in a mask
+
+        Args:
+            mask (int): The mask of the set
+
+        Returns:
+            (CardSet): The set
+        '''
+        card_set = cls.__new__(cls)
+        card_set.mask = mask
+        return card_set
+
+    @staticmethod
+    def of_rank(rank):
+        ''' Get the set of the four cards of a rank
+
+        Args:
+            rank (string): The rank, one of Card.valid_rank
+
+        Returns:
+            (CardSet): The set
+        '''
+        return CardSet.from_mask(RANK_MASKS[rank])
+
+    @staticmethod
+    def of_suit(suit):
+        ''' Get the set of the thirteen cards of a suit
+
+        Args:
+            suit (string): The suit, one of S, H, D and C
+
+        Returns:
+            (CardSet): The set
+        '''
+        return CardSet.from_mask(SUIT_MASKS[suit])
+
+    def add(self, card):
+        self.mask |= 1 << card._index
+
+    def remove(self, card):
+        bit = 1 << card._index
+        if not self.mask & bit:
+            raise KeyError(card)
+        self.mask ^= bit
+
+    def discard(self, card):
+        self.mask &= ~(1 << card._index)
+
+    def update(self, cards):
+        self.mask |= _mask_of(cards)
+
+    def clear(self):
+        self.mask = 0
+
+    def copy(self):
+        return CardSet.from_mask(self.mask)
+
+    def isdisjoint(self, cards):
+        return not self.mask & _mask_of(cards)
+
+    def issubset(self, cards):
+        return not self.mask & ~_mask_of(cards)
+
+    def to_one_hot(self, size=52, dtype=np.int8):
+        ''' Encode the set as a one-hot vector indexed by card index
+
+        Args:
+            size (int): The size of the vector, 52 or 54 with the jokers
+            dtype (numpy.dtype): The type of the vector
+
+        Returns:
+            (numpy.array): The vector
+        '''
+        out = np.zeros(size, dtype=dtype)
+        self.encode_into(out)
+        return out
+
+    def encode_into(self, out):
+        ''' Write the one-hot encoding of the set into an array
+
+        Args:
+            out (numpy.array): The array, of size 52 or 54
+        '''
+        CardSet.encode_many([self], out[None])
+
+    @staticmethod
+    def encode_many(card_sets, out):
+        ''' Write the one-hot encodings of several sets into the rows of an
+        array, all at once
+
+        Args:
+            card_sets (list): The card sets, or other iterables of cards
+            out (numpy.array): The array, of shape (len(card_sets), 52 or 54)
+        '''
+        masks = np.array([_mask_of(cards) for cards in card_sets], dtype='<u8')
+        out[...] = _BYTE_BITS[masks.view(np.uint8)].reshape(len(masks), 64)[:, :out.shape[-1]]
+
+    def __contains__(self, card):
+        try:
+            return self.mask >> card._index & 1 == 1
+        except AttributeError:
+            return False
+
+    def __iter__(self):
+        mask = self.mask
+        cards = ()
+        for byte_cards in _BYTE_CARDS:
+            if not mask:
+                break
+            if mask & 255:
+                cards += byte_cards[mask & 255]
+            mask >>= 8
+        return iter(cards)
+
+    if hasattr(int, 'bit_count'):
+        def __len__(self):
+            return self.mask.bit_count()
+    else:
+        def __len__(self):
+            return bin(self.mask).count('1')
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __eq__(self, other):
+        if isinstance(other, CardSet):
+            return self.mask == other.mask
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(card in self for card in other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __or__(self, cards):
+        return CardSet.from_mask(self.mask | _mask_of(cards))
+
+    def __and__(self, cards):
+        return CardSet.from_mask(self.mask & _mask_of(cards))
+
+    def __sub__(self, cards):
+        return CardSet.from_mask(self.mask & ~_mask_of(cards))
+
+    def __xor__(self, cards):
+        return CardSet.from_mask(self.mask ^ _mask_of(cards))
+
+    def __ior__(self, cards):
+        self.mask |= _mask_of(cards)
+        return self
+
+    def __iand__(self, cards):
+        self.mask &= _mask_of(cards)
+        return self
+
+    def __isub__(self, cards):
+        self.mask &= ~_mask_of(cards)
+        return self
+
+    def __str__(self):
+        return '{' + ', '.join(str(card) for card in self) + '}'
+
+    def __repr__(self):
+        return 'CardSet(' + str(self) + ')'
+
+def _mask_of(cards):
+    if isinstance(cards, CardSet):
+        return cards.mask
+    mask = 0
+    for card in cards:
+        mask |= 1 << card._index
+    return mask
+
+# The masks of the cards of each rank and of each suit
+RANK_MASKS = {rank: sum(1 << (suit_index * 13 + rank_index) for suit_index in range(4))
+              for rank_index, rank in enumerate(Card.valid_rank)}
+SUIT_MASKS = {suit: ((1 << 13) - 1) << (suit_index * 13) for suit_index, suit in enumerate(Card.valid_suit[:4])}
+
+# The bits of each byte, least significant first
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)[:, ::-1]
+
+# The cards of each byte of a mask, for each of the 7 bytes of the 54 cards
+_BYTE_CARDS = [[tuple(Card._cards_by_index[8 * k + i] for i in range(8) if byte >> i & 1 and 8 * k + i < len(Card._cards_by_index))
+                for byte in range(256)] for k in range(7)]
@@ -1,6 +1,7 @@
-from rlcard.utils import init_standard_deck
 import numpy as np
 
+from rlcard.utils.dealing import STANDARD_DECK_IDS, shuffle_deck_ids, cards_from_ids
+
 class BlackjackDealer:
 
     def __init__(self, np_random, num_decks=1):
@@ -8,9 +9,9 @@ class BlackjackDealer:
         '''
         self.np_random = np_random
         self.num_decks = num_decks
-        self.deck = init_standard_deck()
+        self.deck_ids = STANDARD_DECK_IDS
         if self.num_decks not in [0, 1]:  # 0 indicates infinite decks of cards
-            self.deck = self.deck * self.num_decks  # copy m standard decks of cards
+            self.deck_ids = np.tile(STANDARD_DECK_IDS, self.num_decks)  # copy m standard decks of cards
         self.shuffle()
         self.hand = []
         self.status = 'alive'
@@ -19,9 +20,7 @@ class BlackjackDealer:
     def shuffle(self):
         ''' Shuffle the deck
         '''
-        shuffle_deck = np.array(self.deck)
-        self.np_random.shuffle(shuffle_deck)
-        self.deck = list(shuffle_deck)
+        self.deck = cards_from_ids(shuffle_deck_ids(self.np_random, self.deck_ids))
 
     def deal_card(self, player):
         ''' Distribute one card to the player
@@ -29,7 +28,7 @@ class BlackjackDealer:
         Args:
             player_id (int): the target player's id
         '''
-        idx = np.random.choice(len(self.deck))
+        idx = self.np_random.choice(len(self.deck))
         card = self.deck[idx]
         if self.num_decks != 0:  # If infinite decks, do not pop card from deck
             self.deck.pop(idx)
@@ -1,9 +1,9 @@
-from copy import deepcopy
 import numpy as np
 
 from rlcard.games.blackjack import Dealer
 from rlcard.games.blackjack import Player
 from rlcard.games.blackjack import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 class BlackjackGame:
 
@@ -64,10 +64,7 @@ class BlackjackGame:
             int: next plater's id
         '''
         if self.allow_step_back:
-            p = deepcopy(self.players[self.game_pointer])
-            d = deepcopy(self.dealer)
-            w = deepcopy(self.winner)
-            self.history.append((d, p, w))
+            self.history.append(self.snapshot())
 
         next_state = {}
         # Play hit
@@ -130,10 +127,26 @@ class BlackjackGame:
         '''
         #while len(self.history) > 0:
         if len(self.history) > 0:
-            self.dealer, self.players[self.game_pointer], self.winner = self.history.pop()
+            self.restore(self.history.pop())
             return True
         return False
 
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.dealer] + self.players, skip=('history',))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
     def get_num_players(self):
         ''' Return the number of players in blackjack
 
@@ -9,6 +9,7 @@ from rlcard.games.doudizhu.utils import cards2str, doudizhu_sort_card, CARD_RANK
 from rlcard.games.doudizhu import Player
 from rlcard.games.doudizhu import Round
 from rlcard.games.doudizhu import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 
 class DoudizhuGame:
@@ -60,10 +61,6 @@ class DoudizhuGame:
             dict: next player's state
             int: next player's id
         '''
-        if self.allow_step_back:
-            # TODO: don't record game.round, game.players, game.judger if allow_step_back not set
-            pass
-
         # perfrom action
         player = self.players[self.round.current_player]
         self.round.proceed_round(player, action)
@@ -107,6 +104,22 @@ class DoudizhuGame:
         self.state = self.get_state(self.round.current_player)
         return True
 
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.round, self.round.dealer, self.judger] + self.players)
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
     def get_state(self, player_id):
         ''' Return player's state
 
@@ -4,20 +4,27 @@
     Date created: 2/12/2020
 '''
 
+import numpy as np
+
+from rlcard.utils.dealing import shuffle_deck_ids, cards_from_ids
+
 from .player import GinRummyPlayer
 from .utils import utils as utils
 
+# The ids of the cards of utils.get_deck(), in its order
+_DECK_IDS = np.array([utils.get_card_id(card) for card in utils.get_deck()])
+
 
 class GinRummyDealer:
     ''' Initialize a GinRummy dealer class
     '''
-    def __init__(self, np_random):
+    def __init__(self, np_random, deck_batch=None):
         ''' Empty discard_pile, set shuffled_deck, set stock_pile
         '''
         self.np_random = np_random
         self.discard_pile = []  # type: List[Card]
-        self.shuffled_deck = utils.get_deck()  # keep a copy of the shuffled cards at start of new hand
-        self.np_random.shuffle(self.shuffled_deck)
+        # keep a copy of the shuffled cards at start of new hand
+        self.shuffled_deck = cards_from_ids(shuffle_deck_ids(self.np_random, _DECK_IDS, deck_batch))  # type: List[Card]
         self.stock_pile = self.shuffled_deck.copy()  # type: List[Card]
 
     def deal_cards(self, player: GinRummyPlayer, num: int):
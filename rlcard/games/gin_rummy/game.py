@@ -10,6 +10,9 @@ from .player import GinRummyPlayer
 from .round import GinRummyRound
 from .judge import GinRummyJudge
 from .utils.settings import Settings, DealerForRound
+from rlcard.games.base import Card
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+from rlcard.utils.worlds import WorldConstraints
 
 from .utils.action_event import *
 
@@ -28,6 +31,7 @@ class GinRummyGame:
         self.actions = None  # type: List[ActionEvent] or None # must reset in init_game
         self.round = None  # round: GinRummyRound or None, must reset in init_game
         self.num_players = 2
+        self.deck_batch = None  # deck_batch: DeckBatch or None, to take the shuffles of the decks from
 
     def init_game(self):
         ''' Initialize all characters in the game and start round 1
@@ -38,7 +42,8 @@ class GinRummyGame:
         elif self.settings.dealer_for_round == DealerForRound.South:
             dealer_id = 1
         self.actions = []
-        self.round = GinRummyRound(dealer_id=dealer_id, np_random=self.np_random)
+        self.history = []
+        self.round = GinRummyRound(dealer_id=dealer_id, np_random=self.np_random, deck_batch=self.deck_batch)
         for i in range(2):
             num = 11 if i == 0 else 10
             player = self.round.players[(dealer_id + 1 + i) % 2]
@@ -50,6 +55,8 @@ class GinRummyGame:
     def step(self, action: ActionEvent):
         ''' Perform game action and return next player number, and the state for next player
         '''
+        if self.allow_step_back:
+            self.history.append(self.snapshot())
         if isinstance(action, ScoreNorthPlayerAction):
             self.round.score_player_0(action)
         elif isinstance(action, ScoreSouthPlayerAction):
@@ -76,7 +83,65 @@ class GinRummyGame:
     def step_back(self):
         ''' Takes one step backward and restore to the last state
         '''
-        raise NotImplementedError
+        if not self.history:
+            return False
+        self.restore(self.history.pop())
+        return True
+
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.round, self.round.dealer] + self.round.players, skip=('history',))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
+    def get_world_constraints(self, player_id: int):
+        ''' Get the cards hidden from a player and where they may be, to
+        sample worlds with `rlcard.utils.worlds.sample_worlds`
+
+        The hidden cards are the stock pile and the cards of the opponent
+        that the player has not seen picked up from the discard pile. Any of
+        them may be anywhere among them.
+
+        Args:
+            player_id (int): The id of the player
+
+        Returns:
+            (WorldConstraints): The constraints
+        '''
+        opponent = self.round.players[(player_id + 1) % 2]
+        last_action = self.get_last_action()
+        known_cards = opponent.known_cards
+        if isinstance(last_action, ScoreNorthPlayerAction) or isinstance(last_action, ScoreSouthPlayerAction):
+            known_cards = opponent.hand
+        unknown_cards = self.round.dealer.stock_pile + [card for card in opponent.hand if card not in known_cards]
+        hidden_cards = np.array([card.get_numeric_index() for card in unknown_cards], dtype=np.intp)
+        return WorldConstraints(hidden_cards, np.ones((len(hidden_cards), len(hidden_cards)), dtype=bool))
+
+    def apply_world(self, world):
+        ''' Replace the cards of the game by the cards that take their places in a world
+
+        A world sampled for a player with `get_world_constraints` keeps the
+        game consistent with what the player knows.
+
+        Args:
+            world (numpy.array): The ids of the cards that take the place of each card
+        '''
+        world = np.asarray(world).tolist()
+        for player in self.round.players:
+            player.hand[:] = [Card.from_index(world[card.get_numeric_index()]) for card in player.hand]
+            player.did_populate_hand()
+        stock_pile = self.round.dealer.stock_pile
+        stock_pile[:] = [Card.from_index(world[card.get_numeric_index()]) for card in stock_pile]
 
     def get_num_players(self):
         ''' Return the number of players in the game
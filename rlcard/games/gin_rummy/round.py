@@ -31,7 +31,7 @@ from rlcard.games.gin_rummy.utils import utils
 
 class GinRummyRound:
 
-    def __init__(self, dealer_id: int, np_random):
+    def __init__(self, dealer_id: int, np_random, deck_batch=None):
         ''' Initialize the round class
 
             The round class maintains the following instances:
@@ -51,10 +51,11 @@ class GinRummyRound:
 
         Args:
             dealer_id: int
+            deck_batch: DeckBatch or None, to take the shuffle of the deck from
         '''
         self.np_random = np_random
         self.dealer_id = dealer_id
-        self.dealer = GinRummyDealer(self.np_random)
+        self.dealer = GinRummyDealer(self.np_random, deck_batch)
         self.players = [GinRummyPlayer(player_id=0, np_random=self.np_random), GinRummyPlayer(player_id=1, np_random=self.np_random)]
         self.current_player_id = (dealer_id + 1) % 2
         self.is_over = False
@@ -8,7 +8,7 @@ from typing import List, Iterable
 
 import numpy as np
 
-from rlcard.games.base import Card
+from rlcard.games.base import Card, CardSet
 
 from .gin_rummy_error import GinRummyProgramError
 
@@ -27,11 +27,7 @@ def card_from_card_id(card_id: int) -> Card:
      '''
     if not (0 <= card_id < 52):
         raise GinRummyProgramError("card_id is {}: should be 0 <= card_id < 52.".format(card_id))
-    rank_id = card_id % 13
-    suit_id = card_id // 13
-    rank = Card.valid_rank[rank_id]
-    suit = Card.valid_suit[suit_id]
-    return Card(rank=rank, suit=suit)
+    return Card.from_index(card_id)
 
 
 # deck is always in order from AS, 2S, ..., AH, 2H, ..., AD, 2D, ..., AC, 2C, ... QC, KC
@@ -53,17 +49,15 @@ def get_card(card_id: int):
 
 
 def get_card_id(card: Card) -> int:
-    rank_id = get_rank_id(card)
-    suit_id = get_suit_id(card)
-    return rank_id + 13 * suit_id
+    return card.get_numeric_index()
 
 
 def get_rank_id(card: Card) -> int:
-    return Card.valid_rank.index(card.rank)
+    return card.rank_index
 
 
 def get_suit_id(card: Card) -> int:
-    return Card.valid_suit.index(card.suit)
+    return card.suit_index
 
 
 def get_deadwood_value(card: Card) -> int:
@@ -100,8 +94,4 @@ def decode_cards(env_cards: np.ndarray) -> List[Card]:
 
 
 def encode_cards(cards: List[Card]) -> np.ndarray:
-    plane = np.zeros(52, dtype=int)
-    for card in cards:
-        card_id = get_card_id(card)
-        plane[card_id] = 1
-    return plane
+    return CardSet(cards).to_one_hot(dtype=int)
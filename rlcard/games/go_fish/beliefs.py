@@ -0,0 +1,194 @@
+import numpy as np
+
+from rlcard.games.base import Card
+
+_RANK_INDEXES = {rank: i for i, rank in enumerate(Card.valid_rank)}
+
+class GoFishBeliefs:
+    ''' What is publicly known about the hands of the players, kept in
+    arrays, and the expected quantities of each rank that a player gets by
+    requesting it, derived from them.
+
+    The arrays are indexed by card index, by player id and by rank index,
+    in the order of Card.valid_rank. The cards come first so that sums
+    over the cards of a hand add them one after the other, in the order of
+    the cards. The entries of a player are rebuilt from its sets of cards
+    when an event (a request, a transfer, a go fish or a completed book)
+    marks the player as changed, so a step only updates the players it
+    involves, and the expected values of all the other players are
+    computed at once from the arrays.
+    '''
+
+    def __init__(self, players):
+        ''' Initialize the arrays
+
+        Args:
+            players (list): The players of the game
+        '''
+        num_players = len(players)
+        self.players = players
+        # The cards of the hand of the player whose rank is not public and that are not publicly known not to be of each rank, as 1 or 0
+        self.candidates = np.zeros((52, num_players, 13))
+        # The publicly known number of cards of each rank in the hand, counting one card for a rank the player has requested
+        self.public_counts = np.zeros((num_players, 13), dtype=np.int64)
+        # For each rank the player has requested, in the order of the requests, the weight factor of the cards that must hold it, and 1 for the other cards
+        self.weight_factors = np.ones((13, 52, num_players))
+        self.num_weight_factors = [0] * num_players
+        self.changed = set(range(num_players)) # {player_id}
+        self._expected_values = None
+
+    def mark_changed(self, player_id):
+        ''' Mark the public knowledge of a player as changed
+
+        Args:
+            player_id (int): The id of the player
+        '''
+        self.changed.add(player_id)
+        self._expected_values = None
+
+    @staticmethod
+    def get_hand_counts(player):
+        ''' Get the quantity of each rank in the hand of a player
+
+        Args:
+            player (GoFishPlayer): The player
+
+        Returns:
+            (numpy.array): A (13,) array
+        '''
+        hand_counts = [0] * 13
+        for rank, quantity in player.hand_by_rank.items():
+            hand_counts[_RANK_INDEXES[rank]] = quantity
+        return np.array(hand_counts)
+
+    def get_players_rank_expected_values(self, player, other_players, deck_size):
+        ''' Get the expected quantity of each rank of a player's hand that
+        the player ends up with by requesting it from each other player
+
+        Args:
+            player (GoFishPlayer): The player to request
+            other_players (list): The other players, in turn order
+            deck_size (int): The number of cards left in the deck
+
+        Returns:
+            (list): For each other player, a dictionary of rank -> expected quantity
+        '''
+        return self._get_expected_values(player, other_players, deck_size)[1]
+
+    def get_rank_expected_values(self, player, other_players, deck_size):
+        ''' Get the expected quantity of every rank that a player ends up with
+        by requesting it from each other player, as an array laid out like the
+        actions of the game. The entries of the ranks the player does not hold
+        are not meaningful.
+
+        Args:
+            player (GoFishPlayer): The player to request
+            other_players (list): The other players, in turn order
+            deck_size (int): The number of cards left in the deck
+
+        Returns:
+            (numpy.array): A read-only (len(other_players), 13) array
+        '''
+        return self._get_expected_values(player, other_players, deck_size)[0]
+
+    def _get_expected_values(self, player, other_players, deck_size):
+        ''' Compute the expected values of a player, or get them from the cache
+
+        Returns:
+            (tuple): The expected values as an array and as dictionaries
+        '''
+        cache_key = (player.player_id, deck_size)
+        if self._expected_values is not None and self._expected_values[0] == cache_key:
+            return self._expected_values[1]
+        if self.changed:
+            self._update()
+
+        hand_counts = self.get_hand_counts(player)
+        remaining = np.array([rank in player.remaining_ranks for rank in Card.valid_rank])
+        public_counts = self.public_counts
+
+        # Unknown cards
+        # The number of cards of each rank that are in an unknown location (e.g. still in the deck)
+        unknown_cards = 4 - hand_counts - (public_counts.sum(axis=0) - public_counts[player.player_id])
+        is_unknown = remaining & (unknown_cards > 0)
+        unknown_cards = unknown_cards * is_unknown
+        total_unknown_cards = unknown_cards.sum()
+
+        # Card weights
+        # Determine the weight on probabilities associated with each card. If a card is known to be one of n cards that are of a particular rank,
+        # then the probability of the card being of a different rank is reduced. The probability is increased for each rank the card can't be.
+        # A card that can't be of any unknown rank is not a candidate for any rank, so its weight is not used.
+        card_not_possible_quantity = self.candidates @ unknown_cards
+        card_weights = total_unknown_cards / np.maximum(card_not_possible_quantity, 1)
+        for weight_factors in self.weight_factors[:max(self.num_weight_factors)]:
+            card_weights *= weight_factors
+
+        # Player rank points
+        # Sum the weights of the cards of each player that can be of each rank
+        players_rank_points = (card_weights[:, :, None] * self.candidates).sum(axis=0)
+
+        # Total rank points
+        # Determine the total number of points in the game (i.e. in the deck and with the other players) for each rank
+        total_rank_points = deck_size
+        for other_player in other_players:
+            total_rank_points = total_rank_points + players_rank_points[other_player.player_id]
+        total_rank_points = np.where(is_unknown, total_rank_points, 1) # If total_rank_points is 0, then player_rank_points will also be 0. But we don't want a divide by 0, so we default total to 1.
+
+        # Deck top card rank expected_values
+        deck_top_card_expected_value = unknown_cards / total_rank_points
+
+        # Player rank expected values
+        # TODO handle special case where all cards are known, but from different players. Expected value should just be 4
+        expected_value_from_players_known_cards = public_counts
+        expected_value_from_players_unknown_cards = players_rank_points * unknown_cards / total_rank_points
+        expected_value_from_drawing_from_deck = np.where(public_counts > 0, 0, deck_top_card_expected_value) # TODO: I think this value should decrease based on the probability that one of the unknown cards is the desired rank.
+        expected_values = expected_value_from_players_known_cards + expected_value_from_players_unknown_cards + expected_value_from_drawing_from_deck + hand_counts
+        rank_expected_values = expected_values[[other_player.player_id for other_player in other_players]]
+        rank_expected_values.flags.writeable = False
+        expected_values = expected_values.tolist()
+        hand_ranks = [(rank, _RANK_INDEXES[rank]) for rank in player.hand_by_rank.keys()]
+        players_rank_expected_values = [{rank: expected_values[other_player.player_id][i] for rank, i in hand_ranks} for other_player in other_players] # {rank -> expected_value}[]
+
+        self._expected_values = (cache_key, (rank_expected_values, players_rank_expected_values))
+        return self._expected_values[1]
+
+    def _update(self):
+        ''' Rebuild the entries of the players marked as changed
+        '''
+        player_ids = sorted(self.changed)
+        candidate_masks = []
+        public_counts = []
+        possible_cards = [] # (player_id, masks, weight_factors)[]
+        for player_id in player_ids:
+            player = self.players[player_id]
+            non_public_mask = player.non_public_cards_in_hand.mask
+            masks = [non_public_mask] * 13
+            for rank, cards in player.public_not_possible_cards_of_rank.items():
+                masks[_RANK_INDEXES[rank]] = non_public_mask & ~cards.mask
+            candidate_masks.extend(masks)
+            player_public_counts = [0] * 13
+            for rank, cards in player.public_cards.items():
+                player_public_counts[_RANK_INDEXES[rank]] = len(cards)
+            possible_masks = []
+            weight_factors = []
+            for rank, cards in player.public_possible_cards_of_rank.items():
+                player_public_counts[_RANK_INDEXES[rank]] += 1
+                possible_masks.append(cards.mask)
+                weight_factors.append(1 - 1 / len(cards))
+            public_counts.append(player_public_counts)
+            if possible_masks or self.num_weight_factors[player_id] > 0:
+                possible_cards.append((player_id, possible_masks, weight_factors))
+        self.candidates[:, player_ids] = _unpack_masks(candidate_masks).reshape(len(player_ids), 13, 52).transpose(2, 0, 1)
+        self.public_counts[player_ids] = public_counts
+        for player_id, possible_masks, weight_factors in possible_cards:
+            self.weight_factors[:self.num_weight_factors[player_id], :, player_id] = 1
+            if possible_masks:
+                self.weight_factors[:len(possible_masks), :, player_id] = np.where(_unpack_masks(possible_masks), np.array(weight_factors)[:, None], 1)
+            self.num_weight_factors[player_id] = len(possible_masks)
+        self.changed.clear()
+
+def _unpack_masks(masks):
+    ''' Get masks of cards as rows of booleans indexed by card index
+    '''
+    masks = np.array(masks, dtype='<u8').view(np.uint8).reshape(len(masks), 8)
+    return np.unpackbits(masks, axis=1, bitorder='little')[:, :52].view(bool)
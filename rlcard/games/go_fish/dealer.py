@@ -1,21 +1,18 @@
-from rlcard.utils import init_standard_deck
-import numpy as np
+from rlcard.utils.dealing import shuffle_deck_ids, cards_from_ids
 
 class GoFishDealer:
 
-    def __init__(self, np_random):
+    def __init__(self, np_random, deck_batch=None):
         ''' Initialize a GoFish dealer class
         '''
         self.np_random = np_random
-        self.deck = init_standard_deck()
+        self.deck_batch = deck_batch
         self.shuffle()
 
     def shuffle(self):
         ''' Shuffle the deck
         '''
-        shuffle_deck = np.array(self.deck)
-        self.np_random.shuffle(shuffle_deck)
-        self.deck = list(shuffle_deck)
+        self.deck = cards_from_ids(shuffle_deck_ids(self.np_random, deck_batch=self.deck_batch))
 
     def deal_card(self, player):
         ''' Distribute one card to the player
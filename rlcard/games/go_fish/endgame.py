@@ -0,0 +1,301 @@
+''' Exact play of the Go Fish endgame, once the deck is empty.
+
+Without a deck, a request either takes all the cards of a rank from the
+target or passes the turn, and the only thing left to chance is where the
+cards that are not public are. The solver enumerates every deal of them
+that is consistent with the public knowledge, weighted by the number of
+ways to deal the cards, and plays out the rest of the game in all of them at
+once:
+
+- The public belief is the set of deals still consistent with what the
+  players have seen. A request keeps the deals in which the requester holds
+  the rank and the target gives the same number of cards, and transfers the
+  cards in each of them.
+- A player knows their own hand, so the requester picks, for each hand they
+  may hold, the request with the highest expected number of books over the
+  deals of the belief in which they hold it. The belief only learns from
+  what the requests show, like the public knowledge of the game, and not
+  from why a player made them.
+- A request that the requester knows must fail is never made, since it
+  would only pass the turn. Every other request either moves cards into
+  fewer hands or rules deals out, so the play always ends.
+
+A deal is encoded as one integer, the quantity of each rank in each hand in
+2 bits, and the transposition table is keyed on the player to act and the
+deals of the belief with their weights. The books made so far are not part
+of the key: the values are the books still to be made, and the ranks left
+are the ranks in the hands.
+'''
+from math import gcd
+
+import numpy as np
+
+from rlcard.games.base import Card
+
+_RANK_BITS = 2
+_HAND_BITS = 13 * _RANK_BITS
+_HAND_MASK = (1 << _HAND_BITS) - 1
+
+class GoFishEndgameSolver(object):
+    ''' Solve the Go Fish endgame exactly for small numbers of hidden cards
+    '''
+
+    def __init__(self, max_hidden_cards=8, max_table_size=100000):
+        ''' Initialize the solver
+
+        Args:
+            max_hidden_cards (int): The largest number of cards that are not
+                public for which the solver enumerates the deals
+            max_table_size (int): The number of beliefs in the transposition
+                table above which it is cleared before the next solve
+        '''
+        self.max_hidden_cards = max_hidden_cards
+        self.max_table_size = max_table_size
+        # (player id, ((deal, weight), ...)) -> {deal -> books to come of each player}
+        self.table = {}
+        self._num_players = None
+
+    def can_solve(self, game):
+        ''' Check if the solver can solve the current state of a game
+
+        Args:
+            game (GoFishGame): The game
+
+        Returns:
+            (boolean): True if the deck is empty and few enough cards are not public
+        '''
+        if game.is_over() or len(game.dealer.deck) > 0:
+            return False
+        return sum(len(player.non_public_cards_in_hand) for player in game.players) <= self.max_hidden_cards
+
+    def get_action_values(self, game):
+        ''' Get the expected number of books at the end of the game of the
+        current player after each request it may make, given its hand and the
+        public knowledge
+
+        Args:
+            game (GoFishGame): The game, with an empty deck
+
+        Returns:
+            (dict): The expected number of books of each request, for the
+                requests that may succeed, in the order of the legal actions
+        '''
+        num_players = game.num_players
+        player_id = game.current_player_turn
+        belief = self._get_belief(game)
+        hand = _get_hand(self._get_deal(game), player_id)
+        deals = [(deal, weight) for deal, weight in belief.items() if _get_hand(deal, player_id) == hand]
+        total_weight = sum(weight for _, weight in deals)
+        num_books = len(game.players[player_id].books)
+
+        action_values = {}
+        for action in game.get_legal_actions():
+            target_id = (player_id + int(action[0])) % num_players
+            rank_index = Card.valid_rank.index(action[2])
+            values = self._get_request_values(belief, player_id, target_id, rank_index, deals)
+            if values is not None:
+                action_values[action] = num_books + sum(weight * value[player_id] for (_, weight), value in zip(deals, values)) / total_weight
+        return action_values
+
+    def get_values(self, game):
+        ''' Get the number of books of each player at the end of the game,
+        when the rest of the game is played by the solver in the actual deal
+
+        Args:
+            game (GoFishGame): The game, with an empty deck
+
+        Returns:
+            (numpy.array): The number of books of each player
+        '''
+        values = self._solve(game.current_player_turn, self._get_belief(game))[self._get_deal(game)]
+        return np.array([len(player.books) + value for player, value in zip(game.players, values)])
+
+    def get_expected_values(self, game, player_id):
+        ''' Get the expected number of books of each player at the end of the
+        game, given the hand of a player and the public knowledge
+
+        Args:
+            game (GoFishGame): The game, with an empty deck
+            player_id (int): The id of the player whose hand is known
+
+        Returns:
+            (numpy.array): The expected number of books of each player
+        '''
+        belief = self._get_belief(game)
+        hand = _get_hand(self._get_deal(game), player_id)
+        values = self._solve(game.current_player_turn, belief)
+        total_weight = 0
+        expected_values = np.zeros(game.num_players)
+        for deal, weight in belief.items():
+            if _get_hand(deal, player_id) == hand:
+                total_weight += weight
+                expected_values += weight * np.array(values[deal])
+        return np.array([len(player.books) for player in game.players]) + expected_values / total_weight
+
+    def _get_deal(self, game):
+        ''' Encode the hands of a game
+        '''
+        deal = 0
+        for player in game.players:
+            for card in player.hand:
+                deal += 1 << (player.player_id * _HAND_BITS + (card.get_numeric_index() % 13) * _RANK_BITS)
+        return deal
+
+    def _get_belief(self, game):
+        ''' Enumerate the deals consistent with the public knowledge of a game
+
+        Returns:
+            (dict): The weight of each deal, the number of ways to deal the
+                hidden cards that give it
+        '''
+        if len(game.dealer.deck) > 0:
+            raise ValueError('The endgame starts when the deck is empty')
+        if game.num_players != self._num_players or len(self.table) > self.max_table_size:
+            # The deals do not say how many players there are, and the
+            # beliefs of the games already solved rarely come back
+            self.table = {}
+            self._num_players = game.num_players
+        constraints = game.get_world_constraints(None)
+        hidden_ranks = (constraints.hidden_cards % 13).tolist()
+        if len(hidden_ranks) > self.max_hidden_cards:
+            raise ValueError('{} cards are not public, more than the {} the solver enumerates'.format(len(hidden_ranks), self.max_hidden_cards))
+
+        owner_of_card = {card.get_numeric_index(): player.player_id for player in game.players for card in player.non_public_cards_in_hand}
+        owners = [owner_of_card[card] for card in constraints.hidden_cards.tolist()]
+        public_deal = 0
+        for player in game.players:
+            for rank, cards in player.public_cards.items():
+                public_deal += len(cards) << (player.player_id * _HAND_BITS + Card.valid_rank.index(rank) * _RANK_BITS)
+        allowed_ranks = [{hidden_ranks[card] for card in np.flatnonzero(allowed)} for allowed in constraints.allowed]
+        at_least_one = [(places.tolist(), hidden_ranks[int(np.flatnonzero(cards)[0])]) for places, cards in constraints.at_least_one]
+        at_most = {} # (player id, rank index) -> limit
+        for places, cards, limit in constraints.at_most:
+            if len(places) == 0:
+                continue
+            at_most[(owners[int(places[0])], hidden_ranks[int(np.flatnonzero(cards)[0])])] = limit
+        rank_counts = [0] * 13
+        for rank_index in hidden_ranks:
+            rank_counts[rank_index] += 1
+
+        belief = {}
+        assignment = [0] * len(hidden_ranks)
+        def assign(place, deal, weight):
+            if place == len(hidden_ranks):
+                if all(any(assignment[i] == rank_index for i in places) for places, rank_index in at_least_one):
+                    belief[deal] = belief.get(deal, 0) + weight
+                return
+            player_id = owners[place]
+            for rank_index in allowed_ranks[place]:
+                count = rank_counts[rank_index]
+                if count == 0:
+                    continue
+                shift = player_id * _HAND_BITS + rank_index * _RANK_BITS
+                limit = at_most.get((player_id, rank_index))
+                if limit is not None and (deal >> shift & 3) - (public_deal >> shift & 3) >= limit:
+                    continue
+                rank_counts[rank_index] -= 1
+                assignment[place] = rank_index
+                assign(place + 1, deal + (1 << shift), weight * count)
+                rank_counts[rank_index] += 1
+        assign(0, public_deal, 1)
+        if not belief:
+            raise ValueError('No deal is consistent with the public knowledge')
+        return belief
+
+    def _solve(self, player_id, belief):
+        ''' Play the rest of the game from a public belief
+
+        Args:
+            player_id (int): The id of the player to act
+            belief (dict): The weight of each deal
+
+        Returns:
+            (dict): For each deal, the tuple of the books each player makes in the rest of the game
+        '''
+        num_players = self._num_players
+        if next(iter(belief)) == 0:
+            return {0: (0,) * num_players}
+        divisor = 0
+        for weight in belief.values():
+            divisor = gcd(divisor, weight)
+        key = (player_id, tuple(sorted((deal, weight // divisor) for deal, weight in belief.items())))
+        values = self.table.get(key)
+        if values is not None:
+            return values
+
+        hands = {} # hand of the player -> [(deal, weight)]
+        for deal, weight in belief.items():
+            hands.setdefault(_get_hand(deal, player_id), []).append((deal, weight))
+        values = {}
+        for hand, deals in hands.items():
+            best_values, best_value = None, None
+            for target_players_to_left in range(1, num_players):
+                target_id = (player_id + target_players_to_left) % num_players
+                for rank_index in range(13):
+                    if hand >> (rank_index * _RANK_BITS) & 3 == 0:
+                        continue
+                    request_values = self._get_request_values(belief, player_id, target_id, rank_index, deals)
+                    if request_values is None:
+                        continue
+                    value = sum(weight * deal_values[player_id] for (_, weight), deal_values in zip(deals, request_values))
+                    if best_value is None or value > best_value:
+                        best_values, best_value = request_values, value
+            for (deal, _), deal_values in zip(deals, best_values):
+                values[deal] = deal_values
+        self.table[key] = values
+        return values
+
+    def _get_request_values(self, belief, player_id, target_id, rank_index, deals):
+        ''' Get the books each player makes in the rest of the game after a
+        request, in some deals of a belief
+
+        Returns:
+            (list): The values of the deals, or None if the request fails in all of them
+        '''
+        shift = rank_index * _RANK_BITS
+        target_shift = target_id * _HAND_BITS + shift
+        if all(deal >> target_shift & 3 == 0 for deal, _ in deals):
+            return None
+
+        # What the request shows: the number of cards given and whether they complete a book
+        player_shift = player_id * _HAND_BITS + shift
+        observations = {} # (quantity, completes book) -> next belief
+        for deal, weight in belief.items():
+            quantity = deal >> player_shift & 3
+            if quantity == 0:
+                continue
+            given = deal >> target_shift & 3
+            completes_book = quantity + given == 4
+            next_deal = deal - (given << target_shift)
+            next_deal = next_deal - (quantity << player_shift) if completes_book else next_deal + (given << player_shift)
+            observations.setdefault((given, completes_book), {})[next_deal] = weight
+
+        request_values = []
+        for deal, _ in deals:
+            quantity = deal >> player_shift & 3
+            given = deal >> target_shift & 3
+            completes_book = quantity + given == 4
+            next_belief = observations[(given, completes_book)]
+            next_deal = deal - (given << target_shift)
+            next_deal = next_deal - (quantity << player_shift) if completes_book else next_deal + (given << player_shift)
+            next_player_id = player_id
+            if given == 0 or _get_hand(next_deal, player_id) == 0:
+                next_player_id = self._get_next_player(next_deal, player_id)
+            next_values = self._solve(next_player_id, next_belief)[next_deal]
+            if completes_book:
+                next_values = next_values[:player_id] + (next_values[player_id] + 1,) + next_values[player_id + 1:]
+            request_values.append(next_values)
+        return request_values
+
+    def _get_next_player(self, deal, player_id):
+        ''' Get the next player with cards, or the player if none has cards
+        '''
+        num_players = self._num_players
+        for players_to_left in range(1, num_players):
+            next_player_id = (player_id + players_to_left) % num_players
+            if _get_hand(deal, next_player_id) != 0:
+                return next_player_id
+        return player_id
+
+def _get_hand(deal, player_id):
+    return deal >> (player_id * _HAND_BITS) & _HAND_MASK
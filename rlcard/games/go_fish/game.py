@@ -2,7 +2,10 @@ import numpy as np
 
 from rlcard.games.go_fish import Dealer
 from rlcard.games.go_fish import Player
-from rlcard.games.base import Card
+from rlcard.games.go_fish.beliefs import GoFishBeliefs
+from rlcard.games.base import Card, CardSet, RANK_MASKS
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+from rlcard.utils.worlds import WorldConstraints, relabel_card_set
 from rlcard.utils import StatsTracker
 
 class GoFishGame:
@@ -10,7 +13,9 @@ class GoFishGame:
     def __init__(self, allow_step_back=False):
         ''' Initialize the class GoFish Game
         '''
+        self.allow_step_back = allow_step_back
         self.np_random = np.random.RandomState()
+        self.deck_batch = None # A DeckBatch to take the shuffles of the decks from
 
     def configure(self, game_config):
         ''' Specifiy some game specific parameters, such as number of players
@@ -36,19 +41,22 @@ class GoFishGame:
             player_id (int): current player's id
         '''
         self._legal_actions_dirty = True
+        self.history = []
 
         # Setup players
         self.players = []
         for i in range(self.num_players):
             self.players.append(Player(i, self.np_random, self.debug))
+        self.beliefs = GoFishBeliefs(self.players)
 
         # Setup dealer and deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.deck_batch)
         hand_size = 5 if self.num_players >= 4 else 7
         for i in range(hand_size):
             for player in self.players:
                 self.current_player_turn = player.player_id
                 _, completed_books = self.dealer.deal_card(player)
+                self.beliefs.mark_changed(player.player_id)
                 self._report_completed_books_to_other_players(completed_books)
 
         # Choose a random starting player
@@ -66,6 +74,9 @@ class GoFishGame:
             dict: next player's state
             int: next plater's id
         '''
+        if self.allow_step_back:
+            self.history.append(self.snapshot())
+
         self._legal_actions_dirty = True
 
         player = self._get_current_player()
@@ -75,6 +86,8 @@ class GoFishGame:
         self._print('>> Player {} requested {}s from player {}', player.player_id, target_rank, target_player.player_id)
         next_players_turn = True
 
+        self.beliefs.mark_changed(player.player_id)
+        self.beliefs.mark_changed(target_player.player_id)
         player.mark_rank_as_requested(target_rank)
         netted_cards = target_player.remove_cards_of_rank(target_rank)
         completed_books = player.receive_cards(netted_cards, True)
@@ -110,6 +123,7 @@ class GoFishGame:
             if len(self.dealer.deck) > 0:
                 self._print('<< Drew a card because your hand was empty')
                 self.dealer.deal_card(player)
+                self.beliefs.mark_changed(player.player_id)
             # if there are no cards left to draw then the players turn is over
             else:
                 self._print('<< Could not draw a card because there are none left')
@@ -117,7 +131,7 @@ class GoFishGame:
 
         if self.stats_tracker:
             expected_quantity = self._players_rank_expected_values[target_players_to_left - 1][target_rank]
-            final_quantity = 4 if target_rank in player.books else len(set(filter(lambda c: c.rank == target_rank, player.hand)))
+            final_quantity = 4 if target_rank in player.books else len(player.hand & CardSet.of_rank(target_rank))
             self._print('Expected {} {}s and ended with {}', expected_quantity, target_rank, final_quantity)
             self.stats_tracker.update(final_quantity - expected_quantity)
 
@@ -136,6 +150,111 @@ class GoFishGame:
         for book in completed_books:
             for other_player in self._get_other_players():
                 other_player.mark_book_completed(book)
+                self.beliefs.mark_changed(other_player.player_id)
+
+    def step_back(self):
+        ''' Return to the previous state of the game
+
+        Returns:
+            Status (bool): check if the step back is success or not
+        '''
+        if not self.history:
+            return False
+        self.restore(self.history.pop())
+        return True
+
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.dealer, self.beliefs] + self.players, skip=('history', 'action_list', 'action_space', 'stats_tracker'))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
+    def get_world_constraints(self, player_id):
+        ''' Get the cards hidden from a player and where they may be, to
+        sample worlds with `rlcard.utils.worlds.sample_worlds`
+
+        The hidden cards are the cards of the other players that are not
+        public and the cards of the deck. A card of another player can not be
+        of a rank it is publicly known not to be, each set of possible cards
+        of a rank must hold a card of the rank, and a player can not hold the
+        four cards of a rank, since they would be a book.
+
+        Args:
+            player_id (int): The id of the player
+
+        Returns:
+            (WorldConstraints): The constraints
+        '''
+        hidden_cards = [] # card id[]
+        excluded_ranks = [] # [rank index -> boolean][]
+        possible_places = [] # (rank index, place[])[]
+        public_counts = [] # (place[], [rank index -> quantity])[]
+        for player in self.players:
+            if player.player_id == player_id:
+                continue
+            first_place = len(hidden_cards)
+            not_possible_masks = [player.public_not_possible_cards_of_rank[rank].mask if rank in player.public_not_possible_cards_of_rank else 0
+                                  for rank in Card.valid_rank]
+            for card in player.non_public_cards_in_hand:
+                hidden_cards.append(card.get_numeric_index())
+                excluded_ranks.append([mask >> card.get_numeric_index() & 1 == 1 for mask in not_possible_masks])
+            player_places = list(range(first_place, len(hidden_cards)))
+            for rank, cards in player.public_possible_cards_of_rank.items():
+                possible_places.append((Card.valid_rank.index(rank), [place for place in player_places if cards.mask >> hidden_cards[place] & 1]))
+            player_public_counts = [0] * 13
+            for rank, cards in player.public_cards.items():
+                player_public_counts[Card.valid_rank.index(rank)] = len(cards)
+            public_counts.append((player_places, player_public_counts))
+        for card in self.dealer.deck:
+            hidden_cards.append(card.get_numeric_index())
+            excluded_ranks.append([False] * 13)
+
+        hidden_cards = np.array(hidden_cards, dtype=np.intp)
+        hidden_ranks = hidden_cards % 13
+        allowed = ~np.array(excluded_ranks, dtype=bool).reshape(len(hidden_cards), 13)[:, hidden_ranks]
+        at_least_one = [(places, hidden_ranks == rank_index) for rank_index, places in possible_places]
+        at_most = []
+        for places, player_public_counts in public_counts:
+            for rank_index, quantity in enumerate(player_public_counts):
+                cards = hidden_ranks == rank_index
+                if cards.sum() > 3 - quantity:
+                    at_most.append((places, cards, 3 - quantity))
+        return WorldConstraints(hidden_cards, allowed, at_least_one, at_most)
+
+    def apply_world(self, world):
+        ''' Replace the cards of the game by the cards that take their places in a world
+
+        The public knowledge of the players is kept, and refers to the new
+        cards. A world sampled for a player with `get_world_constraints`
+        keeps the game consistent with what the player knows.
+
+        Args:
+            world (numpy.array): The ids of the cards that take the place of each card
+        '''
+        world = np.asarray(world).tolist()
+        for player in self.players:
+            card_sets = [player.hand, player.non_public_cards_in_hand]
+            for public_records in (player.public_cards, player.public_possible_cards_of_rank, player.public_not_possible_cards_of_rank):
+                card_sets.extend(public_records.values())
+            for card_set in card_sets:
+                relabel_card_set(card_set, world)
+            for rank in player.hand_by_rank:
+                player.hand_by_rank[rank] = 0
+            for card in player.hand:
+                player.hand_by_rank[card.rank] = player.hand_by_rank.get(card.rank, 0) + 1
+            self.beliefs.mark_changed(player.player_id)
+        self.dealer.deck[:] = [Card.from_index(world[card.get_numeric_index()]) for card in self.dealer.deck]
+        self._legal_actions_dirty = True
 
     def _get_current_player(self):
         return self.players[self.current_player_turn]
@@ -183,10 +302,8 @@ class GoFishGame:
         if not self._legal_actions_dirty:
             return self._legal_actions
 
-        player_hand = self.players[player_id].hand
-        player_hand_ranks = set()
-        for card in player_hand:
-            player_hand_ranks.add(card.rank)
+        player_hand_mask = self.players[player_id].hand.mask
+        player_hand_ranks = [rank for rank in Card.valid_rank if player_hand_mask & RANK_MASKS[rank]]
         actions = []
         for i in range(self.num_players - 1):
             for player_hand_rank in player_hand_ranks:
@@ -255,87 +372,9 @@ class GoFishGame:
             # Books
             books.append(len(player.books))
 
-        # Unkown cards
-        # Determine the number of cards of each rank that are in an unknown location (e.g. still in the deck)
-        unknown_cards = {} # rank -> quantity
-        for remaining_rank in current_player.remaining_ranks:
-            reamining_cards = 4
-            if remaining_rank in current_player.hand_by_rank:
-                reamining_cards = reamining_cards - current_player.hand_by_rank[remaining_rank]
-            for i, other_player in enumerate(other_players):
-                other_player_public_cards = public_cards[i + 1]
-                if remaining_rank in other_player_public_cards:
-                    reamining_cards = reamining_cards - other_player_public_cards[remaining_rank]
-            if reamining_cards > 0:
-                unknown_cards[remaining_rank] = reamining_cards
-        total_unknown_cards = sum(unknown_cards.values())
-
-        # Card not possible ranks
-        # For each card in the other players' hands, determine the set of ranks the card can't be.
-        card_not_possible_ranks = {} # card -> {rank}
-        for other_player in other_players:
-            for rank, card_set in other_player.public_not_possible_cards_of_rank.items():
-                for card in card_set:
-                    not_possible_ranks = card_not_possible_ranks.get(card, set())
-                    not_possible_ranks.add(rank)
-                    card_not_possible_ranks[card] = not_possible_ranks
-
-
-        # Determine the weight on probabilities associated with each card. If a card is known to be one of n cards that are of a particular rank,
-        # then the probability of the card being of a different rank is reduced. The probability is increased for each rank the card can't be.
-        card_weights = {} # card -> weight
-        for other_player in other_players:
-            for card in other_player.hand:
-                card_possible_ranks = unknown_cards.keys() - card_not_possible_ranks.get(card, set())
-                card_not_possible_quantity = sum(map(lambda r: unknown_cards[r], card_possible_ranks))
-                card_weights[card] = 1 if card_not_possible_quantity == 0 else total_unknown_cards / card_not_possible_quantity
-            for card_set in other_player.public_possible_cards_of_rank.values():
-                weight_factor = 1 - 1 / len(card_set)
-                for card in card_set:
-                    card_weights[card] = card_weights[card] * weight_factor
-
-        # Player rank points
-        # For each other player, determine the cards that can be of each rank. Then sum the weights of those cards for each rank to determine the rank points
-        players_rank_points = [] # {rank -> points}[]
-        for other_player in other_players:
-            player_non_public_cards = other_player.non_public_cards_in_hand
-            player_rank_points = {} # {rank -> points}
-            for remaining_rank in unknown_cards.keys():
-                candidate_cards = player_non_public_cards - other_player.public_not_possible_cards_of_rank.get(remaining_rank, set())
-                points = 0
-                for candidate_card in candidate_cards:
-                    points = points + card_weights[candidate_card]
-                if points > 0:
-                    player_rank_points[remaining_rank] = points
-            players_rank_points.append(player_rank_points)
-
-        # Total rank points
-        # Determine the total number of points in the game (i.e. in the deck and with the other players) for each rank
-        deck_size = len(self.dealer.deck)
-        total_rank_points = {} # {rank -> points}
-        for remaining_rank in unknown_cards.keys():
-            points = deck_size
-            for player_rank_points in players_rank_points:
-                points = points + player_rank_points.get(remaining_rank, 0)
-            total_rank_points[remaining_rank] = points
-
-        # Deck top card rank expected_values
-        deck_top_card_expected_value = {} # {rank -> expected_value}
-        for rank, total_points in total_rank_points.items():
-            deck_top_card_expected_value[rank] = unknown_cards[rank] / total_points
-
         # Player rank expected values
-        players_rank_expected_values = [] # {rank -> expected_value}[]
-        for i, other_player in enumerate(other_players):
-            player_rank_expected_values = {} # {rank -> expected_value}
-            for rank in current_player.hand_by_rank.keys():
-                # TODO handle special case where all cards are known, but from different players. Expected value should just be 4
-                expected_value_from_players_known_cards = public_cards[i + 1].get(rank, 0)
-                expected_value_from_players_unknown_cards = players_rank_points[i].get(rank, 0) * unknown_cards.get(rank, 0) / total_rank_points.get(rank, 1) # If total_rank_points is 0, then player_rank_points will also be 0. But we don't want a divide by 0, so we default total to 1.
-                expected_value_from_drawing_from_deck = 0 if expected_value_from_players_known_cards > 0 else deck_top_card_expected_value.get(rank, 0) # TODO: I think this value should decrease based on the probability that one of the unknown cards is the desired rank.
-                expected_value_from_current_players_hand = current_player.hand_by_rank.get(rank, 0)
-                player_rank_expected_values[rank] = expected_value_from_players_known_cards + expected_value_from_players_unknown_cards + expected_value_from_drawing_from_deck + expected_value_from_current_players_hand
-            players_rank_expected_values.append(player_rank_expected_values)
+        deck_size = len(self.dealer.deck)
+        players_rank_expected_values = self.beliefs.get_players_rank_expected_values(current_player, other_players, deck_size) # {rank -> expected_value}[]
 
         if self.stats_tracker:
             self._players_rank_expected_values = players_rank_expected_values
@@ -355,6 +394,25 @@ class GoFishGame:
 
         return state
 
+    def get_rank_arrays(self):
+        ''' Get the quantities of each rank that the current player's rule
+        agents decide on, as arrays, for the agents that act on many games at once
+
+        Returns:
+            (dict): The arrays
+                'rank_expected_values', numpy.array - The expected number of cards to end up with by guessing every rank of each other player, as a read-only (num_players - 1, 13) array laid out like the actions
+                'public_rank_counts', numpy.array - The public quantity of every rank in each player's hand, as a (num_players, 13) array in the order of 'public_cards'
+                'hand_rank_counts', numpy.array - The quantity of every rank in the current player's hand, as a (13,) array
+        '''
+        current_player = self._get_current_player()
+        deck_size = len(self.dealer.deck)
+        rank_expected_values = self.beliefs.get_rank_expected_values(current_player, self._get_other_players(), deck_size)
+        return {
+            'rank_expected_values': rank_expected_values,
+            'public_rank_counts': np.roll(self.beliefs.public_counts, -current_player.player_id, axis=0),
+            'hand_rank_counts': self.beliefs.get_hand_counts(current_player),
+        }
+
     def get_payoffs(self, is_training=False):
         if is_training:
             payoffs = []
@@ -1,5 +1,4 @@
-from rlcard.games.base import Card
-import itertools
+from rlcard.games.base import Card, CardSet
 
 class GoFishPlayer:
 
@@ -11,9 +10,9 @@ class GoFishPlayer:
         '''
         self.np_random = np_random
         self.player_id = player_id
-        self.hand = set() # {card}
+        self.hand = CardSet() # {card}
         self.hand_by_rank = {} # rank -> quantity
-        self.non_public_cards_in_hand = set() # {card}
+        self.non_public_cards_in_hand = CardSet() # {card}
         self.public_cards = {} # rank -> {card}
         self.public_possible_cards_of_rank = {} # rank -> {card}
         self.public_not_possible_cards_of_rank = {} # rank -> {card}
@@ -60,12 +59,11 @@ class GoFishPlayer:
         # Mark all remaining cards as not being of the requested rank
         if rank in self.public_not_possible_cards_of_rank:
             self._print('Removing {} public not possible cards of rank {} for player {}', len(self.public_not_possible_cards_of_rank[rank]), rank, self.player_id)
-        non_public_cards_in_hand = set(self.non_public_cards_in_hand)
+        non_public_cards_in_hand = self.non_public_cards_in_hand.copy()
         self._print('Marking {} as not of rank {} for player {}', non_public_cards_in_hand, rank, self.player_id)
         self.public_not_possible_cards_of_rank[rank] = non_public_cards_in_hand
-        for card in non_public_cards_in_hand:
-            if card.rank == rank:
-                raise Exception('Attempted to mark a card as not being of its rank')
+        if not non_public_cards_in_hand.isdisjoint(CardSet.of_rank(rank)):
+            raise Exception('Attempted to mark a card as not being of its rank')
 
         self._reveal_cards_by_process_of_elimination()
 
@@ -91,20 +89,20 @@ class GoFishPlayer:
 
         # Otherwise, all cards that are not public should be marked as being of the given rank
         # But exclude cards that are already known to not be of the given rank
-        non_public_cards_in_hand = set(self.non_public_cards_in_hand)
+        non_public_cards_in_hand = self.non_public_cards_in_hand.copy()
         if rank in self.public_not_possible_cards_of_rank:
-            for not_possible_card in self.public_not_possible_cards_of_rank[rank]:
-                non_public_cards_in_hand.remove(not_possible_card)
+            non_public_cards_in_hand -= self.public_not_possible_cards_of_rank[rank]
         self._print('Marking {} as containing at least one card of rank {} for player {}', non_public_cards_in_hand, rank, self.player_id)
         self.public_possible_cards_of_rank[rank] = non_public_cards_in_hand
 
         self._reveal_cards_by_process_of_elimination()
 
     def reveal_card(self, card):
-        self._reveal_card(card)
-        self._reveal_cards_by_process_of_elimination()
+        self._reveal_cards_by_process_of_elimination(self._reveal_card(card))
 
     def _reveal_card(self, card):
+        ''' Returns the mask of the cards that are left to be revealed
+        '''
         rank = card.rank
 
         # Remove from non-public cards
@@ -112,7 +110,7 @@ class GoFishPlayer:
 
         # Add card to public cards
         self._print('Adding {} to public cards of rank {} for player {}', card, rank, self.player_id)
-        public_cards_of_rank = self.public_cards.get(rank, set())
+        public_cards_of_rank = self.public_cards.get(rank, CardSet())
         public_cards_of_rank.add(card)
         self.public_cards[rank] = public_cards_of_rank
 
@@ -123,7 +121,7 @@ class GoFishPlayer:
                 del self.public_possible_cards_of_rank[rank]
 
         # Clean up the card from the public possible and public not possible data
-        self._clean_up_card(card)
+        return self._clean_up_card(card)
 
     def mark_book_completed(self, book):
         self.remaining_ranks.remove(book)
@@ -134,7 +132,7 @@ class GoFishPlayer:
         ''' Remove all record of the given rank from this player.
             Returns any removed cards. (There should not be any returned cards if this function is called bacuse another player completed a book)
         '''
-        removed_cards = set()
+        removed_cards = CardSet()
 
         if rank in self.public_cards:
             self._print('Removing {} public cards of rank {} for player {}', len(self.public_cards[rank]), rank, self.player_id)
@@ -145,91 +143,116 @@ class GoFishPlayer:
         if rank in self.public_not_possible_cards_of_rank:
             self._print('Removing {} public not possible cards of rank {} for player {}', len(self.public_not_possible_cards_of_rank[rank]), rank, self.player_id)
             del self.public_not_possible_cards_of_rank[rank]
-        for card in list(self.hand):
-            if card.rank == rank:
-                self._print('Removing {} from the hand of player {}', card, self.player_id)
-                self._remove_card_from_hand(card)
-                removed_cards.add(card)
+        for card in self.hand & CardSet.of_rank(rank):
+            self._print('Removing {} from the hand of player {}', card, self.player_id)
+            self._remove_card_from_hand(card)
+            removed_cards.add(card)
 
         # Remove other records of the removed cards
         for removed_card in removed_cards:
-            self._clean_up_card(removed_card)
+            cards_to_reveal = self._clean_up_card(removed_card)
+            if cards_to_reveal:
+                self._reveal_cards_by_process_of_elimination(cards_to_reveal)
 
         return removed_cards
 
-    def _reveal_cards_by_process_of_elimination(self):
+    def _reveal_cards_by_process_of_elimination(self, cards_to_reveal=0):
+        ''' Reveal the given cards, then every card whose rank follows from the public knowledge, until nothing more follows
+
+        The public knowledge is a matrix of the cards by the ranks they can be, kept rank by rank as bitmasks: the sets of cards
+        that must not be of each rank, and the sets of cards that hold at least one card of each requested rank. The cards left
+        to be revealed are a worklist mask, so revealing a card only looks at the sets the card is in, and the matrix is only
+        searched for new deductions once the worklist is empty.
+
+        Args:
+            cards_to_reveal (int): The mask of the cards to reveal first
+        '''
         while True:
-            cards_to_reveal = set()
-
-            # Look if there are any cards that can only be one possible rank based on what it can't be
-            for card in self.non_public_cards_in_hand:
-                possible_ranks = set(self.remaining_ranks) # TODO: Ideally any ranks with all 4 cards fully accounted for should be excluded from this list, but that requires more information from other players
-                for rank, not_possible_cards in self.public_not_possible_cards_of_rank.items():
-                    if card in not_possible_cards:
-                        possible_ranks.remove(rank)
-                if len(possible_ranks) == 1:
-                    cards_to_reveal.add(card)
-
-            # Look for matching possible card sets (e.g. if there are 2 possible card sets each with only the same two cards, those cards can be revealed)
-            card_sets_by_length = {} # length -> {cards}[] // A list of sets
-            for rank, card_set in self.public_possible_cards_of_rank.items():
-                length = len(card_set)
-                card_sets_of_length = card_sets_by_length.get(length, [])
-                card_sets_of_length.append(card_set)
-                card_sets_by_length[length] = card_sets_of_length
-            for length, card_sets in card_sets_by_length.items():
-                if len(card_sets) < length:
-                    continue
-                combinations = itertools.combinations(card_sets, length)
-                for combination in combinations:
-                    matching_combination = True
-                    for i in range(1, len(combination)):
-                        if combination[i] != combination[0]:
-                            matching_combination = False
-                            break
-                    if matching_combination:
-                        # print('Discovered {} matching card sets. Revealing {} for player {}', length, combination[0], self.player_id))
-                        cards_to_reveal.update(combination[0])
-
-            # It is possible that the same card is marked to be revealed multiple times. So make sure the card still needs to be revealed
-            for card_to_reveal in cards_to_reveal:
-                rank = card_to_reveal.rank
-                if rank not in self.public_cards or card_to_reveal not in self.public_cards[rank]:
-                    self._print('By process of elimination, revealing {} for player {}', card_to_reveal, self.player_id)
-                    self._reveal_card(card_to_reveal)
+            while cards_to_reveal:
+                bit = cards_to_reveal & -cards_to_reveal
+                cards_to_reveal ^= bit
+                # It is possible that the same card is marked to be revealed multiple times. So make sure the card still needs to be revealed
+                if self.non_public_cards_in_hand.mask & bit:
+                    card = Card.from_index(bit.bit_length() - 1)
+                    self._print('By process of elimination, revealing {} for player {}', card, self.player_id)
+                    cards_to_reveal |= self._reveal_card(card)
+
+            cards_to_reveal = self._cards_of_one_possible_rank() | self._cards_of_matching_possible_sets()
 
             # Keep iterating until there are no more cards to reveal
-            if len(cards_to_reveal) == 0:
+            if not cards_to_reveal:
                 break
 
+    def _cards_of_one_possible_rank(self):
+        ''' Returns the mask of the cards that can only be one possible rank based on what they can't be
+        '''
+        # A card has to be in all the not possible sets of cards but one, so there must be enough of them
+        num_remaining_ranks = len(self.remaining_ranks) # TODO: Ideally any ranks with all 4 cards fully accounted for should be excluded from this list, but that requires more information from other players
+        if num_remaining_ranks == 0 or len(self.public_not_possible_cards_of_rank) < num_remaining_ranks - 1:
+            return 0
+
+        # Count the not possible sets each card is in, one bit of the count per mask
+        count_bits = [0] * 4
+        for not_possible_cards in self.public_not_possible_cards_of_rank.values():
+            carry = not_possible_cards.mask
+            for i in range(4):
+                if not carry:
+                    break
+                count_bits[i], carry = count_bits[i] ^ carry, count_bits[i] & carry
+
+        cards = self.non_public_cards_in_hand.mask
+        for i, count_bit in enumerate(count_bits):
+            cards &= count_bit if (num_remaining_ranks - 1) >> i & 1 else ~count_bit
+        return cards
+
+    def _cards_of_matching_possible_sets(self):
+        ''' Returns the mask of the cards of matching possible card sets (e.g. if there are 2 possible card sets each with
+            only the same two cards, those cards can be revealed)
+        '''
+        num_sets_by_mask = {} # mask -> [length, number of sets]
+        for card_set in self.public_possible_cards_of_rank.values():
+            num_sets = num_sets_by_mask.get(card_set.mask)
+            if num_sets is None:
+                num_sets_by_mask[card_set.mask] = [len(card_set), 1]
+            else:
+                num_sets[1] += 1
+
+        cards = 0
+        for mask, (length, num_sets) in num_sets_by_mask.items():
+            if num_sets >= length:
+                cards |= mask
+        return cards
 
     def _clean_up_card(self, card):
         ''' Removes the card from any possible and not possible sets of cards.
-            It is possible that this leaves one or more single remaining card in possible rank sets. The remaining card will be revealed.
+            It is possible that this leaves one or more single remaining card in possible rank sets. Returns the mask of
+            these cards, which are left to be revealed.
         '''
-        additional_cards_to_reveal = set()
-        for rank, possible_cards in dict(self.public_possible_cards_of_rank).items():
-            if card in possible_cards:
+        bit = 1 << card.get_numeric_index()
+        additional_cards_to_reveal = 0
+        emptied_ranks = []
+        for rank, possible_cards in self.public_possible_cards_of_rank.items():
+            if possible_cards.mask & bit:
                 self._print('Removing {} from public possible cards of rank {} for player {}', card, rank, self.player_id)
-                self.public_possible_cards_of_rank[rank].remove(card)
+                possible_cards.mask ^= bit
             if len(possible_cards) == 1:
-                last_possible_card, = possible_cards
-                self._print('Removing {} from public possible cards of rank {} for player {} and marking it to be revealed', last_possible_card, rank, self.player_id)
-                del self.public_possible_cards_of_rank[rank]
-                additional_cards_to_reveal.add(last_possible_card)
-        for rank, not_possible_cards in dict(self.public_not_possible_cards_of_rank).items():
-            if card in not_possible_cards:
+                self._print('Removing {} from public possible cards of rank {} for player {} and marking it to be revealed', possible_cards, rank, self.player_id)
+                emptied_ranks.append(rank)
+                additional_cards_to_reveal |= possible_cards.mask
+        for rank in emptied_ranks:
+            del self.public_possible_cards_of_rank[rank]
+        emptied_ranks = []
+        for rank, not_possible_cards in self.public_not_possible_cards_of_rank.items():
+            if not_possible_cards.mask & bit:
                 self._print('Removing {} from public not possible cards of rank {} for player {}', card, rank, self.player_id)
-                self.public_not_possible_cards_of_rank[rank].remove(card)
-            if len(not_possible_cards) == 0:
+                not_possible_cards.mask ^= bit
+            if not not_possible_cards:
                 self._print('Clearning empty public not possible cards of rank {} for player {}', rank, self.player_id)
-                del self.public_not_possible_cards_of_rank[rank]
-        # Additional cards to reveal should not be revealed until the end to avoid nested manipulating of the public and non public sets while iterating through them.
-        for additional_card_to_reveal in additional_cards_to_reveal:
-            # It is possible that the same card is marked to be revealed multiple times. So make sure the card still needs to be revealed
-            rank = additional_card_to_reveal.rank
-            if rank not in self.public_cards or additional_card_to_reveal not in self.public_cards[rank]:
-                self.reveal_card(additional_card_to_reveal)
+                emptied_ranks.append(rank)
+        for rank in emptied_ranks:
+            del self.public_not_possible_cards_of_rank[rank]
+        # Additional cards are not revealed here to avoid nested manipulating of the public and non public sets while iterating through them.
+        return additional_cards_to_reveal
 
     def _print(self, message, *args):
         if self.debug:
@@ -1,8 +1,10 @@
-import random
+import numpy as np
 
 from rlcard.games.hearts import Dealer
 from rlcard.games.hearts import Player
-from rlcard.games.base import Card
+from rlcard.games.base import Card, CardSet
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+from rlcard.utils.worlds import WorldConstraints, relabel_card_set
 from rlcard.utils import init_standard_deck
 
 class HeartsGame:
@@ -10,6 +12,9 @@ class HeartsGame:
     def __init__(self, allow_step_back=False):
         ''' Initialize the class Hearts Game
         '''
+        self.allow_step_back = allow_step_back
+        self.np_random = np.random.RandomState()
+        self.deck_batch = None # A DeckBatch to take the shuffles of the decks from
 
     def configure(self, game_config):
         ''' Specifiy some game specific parameters, such as number of players
@@ -35,22 +40,23 @@ class HeartsGame:
             player_id (int): current player's id
         '''
         self._legal_actions_dirty = True
+        self.history = []
 
         # Setup players
         self.players = []
         for i in range(self.num_players):
             player = Player(i)
-            player.game_score = 0 if not self.is_round_mode else random.randrange(100)
+            player.game_score = 0 if not self.is_round_mode else self.np_random.randint(100)
             self.players.append(player)
 
         # Setup dealer
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.deck_batch)
 
         # Setup passing
-        self.passing_cards_players_to_left = random.randrange(self.num_players)
+        self.passing_cards_players_to_left = self.np_random.randint(self.num_players)
 
         # Choose a random starting player
-        self.starting_player = random.randrange(self.num_players)
+        self.starting_player = self.np_random.randint(self.num_players)
         self.current_player_turn = self.starting_player
 
         self._init_round()
@@ -95,6 +101,9 @@ class HeartsGame:
             dict: next player's state
             int: next plater's id
         '''
+        if self.allow_step_back:
+            self.history.append(self.snapshot())
+
         self._legal_actions_dirty = True
 
         player = self._get_current_player()
@@ -178,6 +187,88 @@ class HeartsGame:
     def _advance_to_next_player(self):
         self.current_player_turn = (self.current_player_turn + 1) % self.num_players
 
+    def step_back(self):
+        ''' Return to the previous state of the game
+
+        Returns:
+            Status (bool): check if the step back is success or not
+        '''
+        if not self.history:
+            return False
+        self.restore(self.history.pop())
+        return True
+
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.dealer] + self.players, skip=('history', 'action_list', 'action_space'))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
+    def get_world_constraints(self, player_id):
+        ''' Get the cards hidden from a player and where they may be, to
+        sample worlds with `rlcard.utils.worlds.sample_worlds`
+
+        The hidden cards are the cards of the other players, except the
+        cards the player passed to them, and the cards the other players are
+        passing while the passes are not done. A card of another player can
+        not be of a suit the player is publicly known to be void of.
+
+        Args:
+            player_id (int): The id of the player
+
+        Returns:
+            (WorldConstraints): The constraints
+        '''
+        passed_cards = self.players[player_id].passed_cards
+        hidden_cards = [] # card id[]
+        void_suits = [] # [suit index -> boolean][]
+        for player in self.players:
+            if player.player_id == player_id:
+                continue
+            player_void_suits = [player.public_void_suits[suit] for suit in Card.valid_suit[:4]]
+            for card in player.hand - passed_cards:
+                hidden_cards.append(card.get_numeric_index())
+                void_suits.append(player_void_suits)
+            if self.passing_cards:
+                for card in player.passed_cards:
+                    hidden_cards.append(card.get_numeric_index())
+                    void_suits.append([False] * 4)
+
+        hidden_cards = np.array(hidden_cards, dtype=np.intp)
+        allowed = ~np.array(void_suits, dtype=bool).reshape(len(hidden_cards), 4)[:, hidden_cards // 13]
+        return WorldConstraints(hidden_cards, allowed)
+
+    def apply_world(self, world):
+        ''' Replace the cards of the game by the cards that take their places in a world
+
+        A world sampled for a player with `get_world_constraints` keeps the
+        game consistent with what the player knows.
+
+        Args:
+            world (numpy.array): The ids of the cards that take the place of each card
+        '''
+        world = np.asarray(world).tolist()
+        for player in self.players:
+            for card_set in (player.hand, player.played_cards, player.passed_cards):
+                relabel_card_set(card_set, world)
+            for suit in player.hand_by_suit:
+                player.hand_by_suit[suit] = 0
+            for card in player.hand:
+                player.hand_by_suit[card.suit] += 1
+        self.current_trick[:] = [Card.from_index(world[card.get_numeric_index()]) for card in self.current_trick]
+        self.dealer.deck[:] = [Card.from_index(world[card.get_numeric_index()]) for card in self.dealer.deck]
+        self._legal_actions_dirty = True
+
     def get_num_players(self):
         ''' Return the number of players in hearts
 
@@ -215,19 +306,14 @@ class HeartsGame:
             return self._legal_actions
 
         player = self.players[player_id]
-        playable_cards = set()
         if self.passing_cards:
             playable_cards = player.hand
         elif self.current_trick_suit == None:
-            for card in player.hand:
-                if self.hearts_are_broken or not card.is_a_heart():
-                    playable_cards.add(card)
+            playable_cards = player.hand if self.hearts_are_broken else player.hand - CardSet.of_suit('H')
             if len(playable_cards) == 0: # The player only has hearts
                 playable_cards = player.hand
         elif not player.is_void_of_suit(self.current_trick_suit):
-            for card in player.hand:
-                if card.suit == self.current_trick_suit:
-                    playable_cards.add(card)
+            playable_cards = player.hand & CardSet.of_suit(self.current_trick_suit)
         else:
             playable_cards = player.hand
 
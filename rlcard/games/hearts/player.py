@@ -1,4 +1,4 @@
-from rlcard.games.base import Card
+from rlcard.games.base import Card, CardSet
 import itertools
 
 class HeartsPlayer:
@@ -10,9 +10,9 @@ class HeartsPlayer:
             player_id (int): id for the player
         '''
         self.player_id = player_id
-        self.hand = set() # {Card} - Cards in this player's hand
-        self.played_cards = set() # {Card} - Cards played by this player
-        self.passed_cards = set() # {Card} - Cards passed by this player to another player
+        self.hand = CardSet() # {Card} - Cards in this player's hand
+        self.played_cards = CardSet() # {Card} - Cards played by this player
+        self.passed_cards = CardSet() # {Card} - Cards passed by this player to another player
         self.game_score = 0
         self._init_round()
 
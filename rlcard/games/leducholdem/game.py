@@ -1,5 +1,4 @@
 import numpy as np
-from copy import copy
 
 from rlcard.games.leducholdem import Dealer
 from rlcard.games.leducholdem import Player
@@ -108,15 +107,7 @@ class LeducholdemGame(Game):
         '''
         if self.allow_step_back:
             # First snapshot the current state
-            r = copy(self.round)
-            r_raised = copy(self.round.raised)
-            gp = self.game_pointer
-            r_c = self.round_counter
-            d_deck = copy(self.dealer.deck)
-            p = copy(self.public_card)
-            ps = [copy(self.players[i]) for i in range(self.num_players)]
-            ps_hand = [copy(self.players[i].hand) for i in range(self.num_players)]
-            self.history.append((r, r_raised, gp, r_c, d_deck, p, ps, ps_hand))
+            self.history.append(self.snapshot())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -184,10 +175,6 @@ class LeducholdemGame(Game):
             (bool): True if the game steps back successfully
         '''
         if len(self.history) > 0:
-            self.round, r_raised, self.game_pointer, self.round_counter, d_deck, self.public_card, self.players, ps_hand = self.history.pop()
-            self.round.raised = r_raised
-            self.dealer.deck = d_deck
-            for i, hand in enumerate(ps_hand):
-                self.players[i].hand = hand
+            self.restore(self.history.pop())
             return True
         return False
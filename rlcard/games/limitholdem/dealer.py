@@ -1,11 +1,11 @@
-from rlcard.utils.utils import init_standard_deck
+from rlcard.utils.dealing import shuffle_deck_ids, cards_from_ids
 
 
 class LimitHoldemDealer:
-    def __init__(self, np_random):
+    def __init__(self, np_random, deck_batch=None):
         self.np_random = np_random
-        self.deck = init_standard_deck()
-        self.shuffle()
+        # The same cards as shuffling init_standard_deck() with the random state
+        self.deck = cards_from_ids(shuffle_deck_ids(np_random, deck_batch=deck_batch))
         self.pot = 0
 
     def shuffle(self):
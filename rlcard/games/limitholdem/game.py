@@ -1,6 +1,7 @@
-from copy import deepcopy, copy
 import numpy as np
 
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+
 from rlcard.games.limitholdem import Dealer
 from rlcard.games.limitholdem import Player, PlayerStatus
 from rlcard.games.limitholdem import Judger
@@ -12,6 +13,8 @@ class LimitHoldemGame:
         """Initialize the class limit holdem game"""
         self.allow_step_back = allow_step_back
         self.np_random = np.random.RandomState()
+        # A DeckBatch to take the shuffles of the decks from
+        self.deck_batch = None
 
         # Some configurations of the game
         # These arguments can be specified for creating new games
@@ -37,7 +40,6 @@ class LimitHoldemGame:
         self.round = None
         self.round_counter = None
         self.history = None
-        self.history_raises_nums = None
 
     def configure(self, game_config):
         """Specify some game specific parameters, such as number of players"""
@@ -56,7 +58,7 @@ class LimitHoldemGame:
                 (int): Current player's id
         """
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.deck_batch)
 
         # Initialize two players to play the game
         self.players = [Player(i, self.np_random) for i in range(self.num_players)]
@@ -117,14 +119,7 @@ class LimitHoldemGame:
         """
         if self.allow_step_back:
             # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            rn = copy(self.history_raise_nums)
-            self.history.append((r, b, r_c, d, p, ps, rn))
+            self.history.append(self.snapshot())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -163,11 +158,28 @@ class LimitHoldemGame:
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
-                self.players, self.history_raises_nums = self.history.pop()
+            self.restore(self.history.pop())
             return True
         return False
 
+    def snapshot(self):
+        """
+        Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        """
+        return take_snapshot([self, self.dealer, self.round, self.judger] + self.players, skip=('history',))
+
+    def restore(self, snapshot):
+        """
+        Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        """
+        restore_snapshot(snapshot)
+
     def get_num_players(self):
         """
         Return the number of players in limit texas holdem
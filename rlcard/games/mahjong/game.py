@@ -1,10 +1,10 @@
 import numpy as np
-from copy import deepcopy
 
 from rlcard.games.mahjong import Dealer
 from rlcard.games.mahjong import Player
 from rlcard.games.mahjong import Round
 from rlcard.games.mahjong import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 class MahjongGame:
 
@@ -61,10 +61,7 @@ class MahjongGame:
         '''
         # First snapshot the current state
         if self.allow_step_back:
-            hist_dealer = deepcopy(self.dealer)
-            hist_round = deepcopy(self.round)
-            hist_players = deepcopy(self.players)
-            self.history.append((hist_dealer, hist_players, hist_round))
+            self.history.append(self.snapshot())
         self.round.proceed_round(self.players, action)
         state = self.get_state(self.round.current_player)
         self.cur_state = state
@@ -78,9 +75,25 @@ class MahjongGame:
         '''
         if not self.history:
             return False
-        self.dealer, self.players, self.round = self.history.pop()
+        self.restore(self.history.pop())
         return True
 
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.dealer, self.round] + self.players, skip=('history',))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
     def get_state(self, player_id):
         ''' Return player's state
 
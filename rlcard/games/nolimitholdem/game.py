@@ -1,7 +1,6 @@
 from enum import Enum
 
 import numpy as np
-from copy import deepcopy
 from rlcard.games.limitholdem import Game
 from rlcard.games.limitholdem import PlayerStatus
 
@@ -63,7 +62,7 @@ class NolimitholdemGame(Game):
             self.dealer_id = self.np_random.randint(0, self.num_players)
 
         # Initialize a dealer that can deal cards
-        self.dealer = Dealer(self.np_random)
+        self.dealer = Dealer(self.np_random, self.deck_batch)
 
         # Initialize players to play the game
         self.players = [Player(i, self.init_chips[i], self.np_random) for i in range(self.num_players)]
@@ -134,13 +133,7 @@ class NolimitholdemGame(Game):
 
         if self.allow_step_back:
             # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            self.history.append((r, b, r_c, d, p, ps))
+            self.history.append(self.snapshot())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -208,19 +201,6 @@ class NolimitholdemGame(Game):
         state['stage'] = self.stage
         return state
 
-    def step_back(self):
-        """
-        Return to the previous state of the game
-
-        Returns:
-            (bool): True if the game steps back successfully
-        """
-        if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
-            self.stage = Stage(self.round_counter)
-            return True
-        return False
-
     def get_num_players(self):
         """
         Return the number of players in no limit texas holdem
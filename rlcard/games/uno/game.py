@@ -1,9 +1,9 @@
-from copy import deepcopy
 import numpy as np
 
 from rlcard.games.uno import Dealer
 from rlcard.games.uno import Player
 from rlcard.games.uno import Round
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 
 class UnoGame:
@@ -34,6 +34,9 @@ class UnoGame:
         # Initialize a dealer that can deal cards
         self.dealer = Dealer(self.np_random)
 
+        # The color of a wild card is chosen when it is played, so it is part of the game state
+        self.wild_cards = [card for card in self.dealer.deck if card.type == 'wild']
+
         # Initialize four players to play the game
         self.players = [Player(i, self.np_random) for i in range(self.num_players)]
 
@@ -70,10 +73,7 @@ class UnoGame:
 
         if self.allow_step_back:
             # First snapshot the current state
-            his_dealer = deepcopy(self.dealer)
-            his_round = deepcopy(self.round)
-            his_players = deepcopy(self.players)
-            self.history.append((his_dealer, his_players, his_round))
+            self.history.append(self.snapshot())
 
         self.round.proceed_round(self.players, action)
         player_id = self.round.current_player
@@ -88,9 +88,46 @@ class UnoGame:
         '''
         if not self.history:
             return False
-        self.dealer, self.players, self.round = self.history.pop()
+        self.restore(self.history.pop())
         return True
 
+    def snapshot(self):
+        ''' Take a snapshot of the current state of the game
+
+        Returns:
+            (Snapshot): The snapshot, which can be restored any number of times
+        '''
+        return take_snapshot([self, self.dealer, self.round] + self.players + self.wild_cards, skip=('history',))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot
+
+        Args:
+            snapshot (Snapshot): A snapshot returned by `snapshot`
+        '''
+        restore_snapshot(snapshot)
+
+    def shuffle_hidden_cards(self, player_id, np_random):
+        ''' Deal the cards hidden from a player again at random, keeping the
+        number of cards of each hand and of the deck
+
+        The hidden cards are the cards of the other players and the deck, and
+        nothing public tells where they are, so every deal of them is as
+        likely as the others.
+
+        Args:
+            player_id (int): The id of the player
+            np_random (numpy.random.RandomState): The random state to shuffle with
+        '''
+        piles = [player.hand for player in self.players if player.player_id != player_id]
+        piles.append(self.dealer.deck)
+        hidden_cards = [card for pile in piles for card in pile]
+        np_random.shuffle(hidden_cards)
+        start = 0
+        for pile in piles:
+            pile[:] = hidden_cards[start:start + len(pile)]
+            start += len(pile)
+
     def get_state(self, player_id):
         ''' Return player's state
 
@@ -41,3 +41,15 @@ register(
 register(
     model_id = 'go-fish-v3',
     entry_point='rlcard.models.go_fish_rule_models:GoFishRuleModelV3')
+
+register(
+    model_id = 'go-fish-vector-v1',
+    entry_point='rlcard.models.go_fish_rule_models:GoFishVectorRuleModelV1')
+
+register(
+    model_id = 'go-fish-vector-v2',
+    entry_point='rlcard.models.go_fish_rule_models:GoFishVectorRuleModelV2')
+
+register(
+    model_id = 'go-fish-vector-v3',
+    entry_point='rlcard.models.go_fish_rule_models:GoFishVectorRuleModelV3')
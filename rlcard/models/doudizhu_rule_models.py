@@ -6,13 +6,21 @@ import numpy as np
 import rlcard
 from rlcard.games.doudizhu.utils import CARD_TYPE, INDEX
 from rlcard.models.model import Model
+from rlcard.utils import seeding
 
 class DouDizhuRuleAgentV1(object):
     ''' Dou Dizhu Rule agent version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = True
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
     def step(self, state):
         ''' Predict the action given raw state. A naive rule.
@@ -52,7 +60,7 @@ class DouDizhuRuleAgentV1(object):
             landlord = state['landlord']
             if target_player != landlord and state['self'] != landlord:
                 return 'pass'
-            return np.random.choice(state['actions'])
+            return self.np_random.choice(state['actions'])
 
     def eval_step(self, state):
         ''' Step for evaluation. The same to step
@@ -159,13 +167,18 @@ class DouDizhuRuleModelV1(Model):
     ''' Dou Dizhu Rule Model version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
         env = rlcard.make('doudizhu')
 
-        rule_agent = DouDizhuRuleAgentV1()
-        self.rule_agents = [rule_agent for _ in range(env.num_players)]
+        seeds = [None] * env.num_players if seed is None else seeding.spawn_seeds(seed, env.num_players)
+        self.rule_agents = [DouDizhuRuleAgentV1(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
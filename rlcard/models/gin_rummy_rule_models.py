@@ -19,6 +19,7 @@ import numpy as np
 import rlcard
 
 from rlcard.models.model import Model
+from rlcard.utils import seeding
 
 from rlcard.games.gin_rummy.utils.action_event import *
 
@@ -31,11 +32,17 @@ class GinRummyNoviceRuleAgent(object):
         Agent always discards highest deadwood value card
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = False  # FIXME: should this be True ?
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
-    @staticmethod
-    def step(state):
+    def step(self, state):
         ''' Predict the action given the current state.
             Novice strategy:
                 Case where can gin:
@@ -73,7 +80,7 @@ class GinRummyNoviceRuleAgent(object):
                 actions = [DiscardAction(card=card).action_id for card in best_discards]
         if type(actions) == OrderedDict:
             actions = list(actions.keys())
-        return np.random.choice(actions)
+        return self.np_random.choice(actions)
 
     def eval_step(self, state):
         ''' Predict the action given the current state for evaluation.
@@ -117,13 +124,18 @@ class GinRummyNoviceRuleModel(Model):
     ''' Gin Rummy Rule Model
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pre-trained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
         super().__init__()
         env = rlcard.make('gin-rummy')
-        rule_agent = GinRummyNoviceRuleAgent()
-        self.rule_agents = [rule_agent for _ in range(env.num_players)]
+        seeds = [None] * env.num_players if seed is None else seeding.spawn_seeds(seed, env.num_players)
+        self.rule_agents = [GinRummyNoviceRuleAgent(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
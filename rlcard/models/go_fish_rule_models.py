@@ -5,14 +5,23 @@ import numpy as np
 
 import rlcard
 from rlcard.models.model import Model
+from rlcard.utils import seeding
+from rlcard.utils.utils import random_argmax
 from collections import OrderedDict
 
 class GoFishRuleAgentV1(object):
     ''' GoFish Rule agent version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = True
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
     def step(self, state):
         '''
@@ -35,7 +44,7 @@ class GoFishRuleAgentV1(object):
 
 
         # Otherwise we randomly choose one
-        action = np.random.choice(legal_actions)
+        action = self.np_random.choice(legal_actions)
         return action
 
     def eval_step(self, state):
@@ -47,11 +56,16 @@ class GoFishRuleModelV1(Model):
     ''' GoFish Rule Model version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
-        rule_agent = GoFishRuleAgentV1()
-        self.rule_agents = [rule_agent for _ in range(4)]
+        seeds = [None] * 4 if seed is None else seeding.spawn_seeds(seed, 4)
+        self.rule_agents = [GoFishRuleAgentV1(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
@@ -78,8 +92,15 @@ class GoFishRuleAgentV2(object):
     ''' GoFish Rule agent version 2
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = True
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
     def step(self, state):
         '''
@@ -94,7 +115,7 @@ class GoFishRuleAgentV2(object):
         other_player_indexs = range(1, len(state['public_cards']))
 
         # If we have a card that we known another player has and combined they make a book, take them.
-        hand_by_rank = state['current_player_hand_by_rank']
+        hand_by_rank = state['player_hand_by_rank']
         for rank, num_cards_in_hand_of_rank in hand_by_rank.items():
             for target_player_index in other_player_indexs:
                 target_player_hand = state['public_cards'][target_player_index]
@@ -107,23 +128,24 @@ class GoFishRuleAgentV2(object):
             public_ranks_by_quantity[quantity_of_rank].append(rank)
         for ranks in public_ranks_by_quantity.values():
             if len(ranks) > 0:
-                rank = np.random.choice(ranks)
-                player_index = np.random.choice(other_player_indexs)
+                rank = self.np_random.choice(ranks)
+                player_index = self.np_random.choice(other_player_indexs)
                 return '{}-{}'.format(player_index, rank)
 
         # Ask for a card we have the most of from a random player
         ranks_by_quantity = OrderedDict({ 3: [], 2: [], 1: []})
         for rank, num_cards_in_hand_of_rank in hand_by_rank.items():
-            ranks_by_quantity[num_cards_in_hand_of_rank].append(rank)
+            if num_cards_in_hand_of_rank > 0:
+                ranks_by_quantity[num_cards_in_hand_of_rank].append(rank)
         for ranks in ranks_by_quantity.values():
             if len(ranks) > 0:
-                rank = np.random.choice(ranks)
-                player_index = np.random.choice(other_player_indexs)
+                rank = self.np_random.choice(ranks)
+                player_index = self.np_random.choice(other_player_indexs)
                 return '{}-{}'.format(player_index, rank)
 
         # Otherwise we randomly choose one (this shouldn't happen)
         raise 'error'
-        action = np.random.choice(legal_actions)
+        action = self.np_random.choice(legal_actions)
         return action
 
     def eval_step(self, state):
@@ -135,11 +157,16 @@ class GoFishRuleModelV2(Model):
     ''' GoFish Rule Model version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
-        rule_agent = GoFishRuleAgentV2()
-        self.rule_agents = [rule_agent for _ in range(4)]
+        seeds = [None] * 4 if seed is None else seeding.spawn_seeds(seed, 4)
+        self.rule_agents = [GoFishRuleAgentV2(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
@@ -166,8 +193,15 @@ class GoFishRuleAgentV3(object):
     ''' GoFish Rule agent version 3
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = True
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
     def step(self, state):
         '''
@@ -193,7 +227,7 @@ class GoFishRuleAgentV3(object):
             if expected_quantity == top_actions_value:
                 top_actions.append(action)
 
-        action = np.random.choice(top_actions)
+        action = self.np_random.choice(top_actions)
         return action
 
     def eval_step(self, state):
@@ -205,11 +239,16 @@ class GoFishRuleModelV3(Model):
     ''' GoFish Rule Model version 3
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
-        rule_agent = GoFishRuleAgentV3()
-        self.rule_agents = [rule_agent for _ in range(4)]
+        seeds = [None] * 4 if seed is None else seeding.spawn_seeds(seed, 4)
+        self.rule_agents = [GoFishRuleAgentV3(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
@@ -232,5 +271,179 @@ class GoFishRuleModelV3(Model):
         '''
         return True
 
+# The arrays of the states that the vector rule agents act on
+_RANK_ARRAY_KEYS = ('rank_expected_values', 'public_rank_counts', 'hand_rank_counts')
+
+class GoFishVectorRuleAgent(object):
+    ''' Base of the GoFish rule agents that act on a batch of games at once
+
+    The rules are written as scores of the actions, laid out like the actions
+    of the game, i.e. (players to the left - 1) * 13 + rank index. The agent
+    picks the legal action with the highest score with a single argmax, and
+    breaks the ties at random. The scores are computed from the arrays of
+    the states (see `GoFishGame.get_rank_arrays`), stacked over the batch.
+    '''
+
+    def __init__(self, np_random=None, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            np_random (numpy.random.RandomState): The random state to break the
+                ties with. The global random state of numpy is used if it is None.
+            seed (int or numpy.random.SeedSequence): The seed of a random state
+                of the agent's own, if np_random is None
+        '''
+        self.use_raw = False
+        if np_random is None and seed is not None:
+            np_random = seeding.np_random(seed)[0]
+        self.np_random = np_random
+
+    def get_scores(self, arrays):
+        ''' Score the actions of a batch of games
+
+        Args:
+            arrays (dict): The arrays of the states, stacked over the batch
+
+        Returns:
+            (numpy.array): A (batch, num_actions) array of scores
+        '''
+        raise NotImplementedError
+
+    def act(self, arrays, legal_mask):
+        ''' Pick the actions of a batch of games
+
+        Args:
+            arrays (dict): The arrays of the states, stacked over the batch
+            legal_mask (numpy.array): A (batch, num_actions) boolean mask of the legal actions
+
+        Returns:
+            (numpy.array): The (batch,) action ids
+        '''
+        return random_argmax(self.get_scores(arrays), legal_mask, self.np_random)
+
+    def step(self, state):
+        '''
+        Args:
+            state (dict): An extracted state of the environment
+
+        Returns:
+            action (int): Predicted action id
+        '''
+        arrays = {key: state[key][None] for key in _RANK_ARRAY_KEYS}
+        return int(self.act(arrays, state['legal_mask'][None])[0])
+
+    def eval_step(self, state):
+        ''' Step for evaluation. The same to step
+        '''
+        return self.step(state), []
+
+    def step_batch(self, states):
+        '''
+        Args:
+            states (list): A list of extracted states of the environment
+
+        Returns:
+            actions (list): Predicted action ids
+        '''
+        arrays = {key: np.stack([state[key] for state in states]) for key in _RANK_ARRAY_KEYS}
+        legal_mask = np.stack([state['legal_mask'] for state in states])
+        return self.act(arrays, legal_mask).tolist()
+
+    def eval_step_batch(self, states):
+        ''' Step for evaluation. The same to step_batch
+        '''
+        return self.step_batch(states), [[] for _ in states]
+
+class GoFishVectorRuleAgentV1(GoFishVectorRuleAgent):
+    ''' GoFish Rule agent version 1, for a batch of games
+
+    Requests a rank of the hand from a player known to hold it, if any,
+    otherwise plays at random.
+    '''
+
+    def get_scores(self, arrays):
+        other_public_counts = arrays['public_rank_counts'][:, 1:]
+        return (other_public_counts > 0).reshape(len(other_public_counts), -1)
+
+class GoFishVectorRuleAgentV2(GoFishVectorRuleAgent):
+    ''' GoFish Rule agent version 2, for a batch of games
+
+    Requests a rank from a player known to hold the cards that complete
+    its book, otherwise the rank of the hand that is publicly known in the
+    largest quantity, otherwise the rank of the hand held in the largest
+    quantity, from a random player.
+    '''
+
+    def get_scores(self, arrays):
+        public_counts = arrays['public_rank_counts']
+        other_public_counts = public_counts[:, 1:]
+        hand_counts = arrays['hand_rank_counts'][:, None, :]
+        own_public_counts = public_counts[:, :1]
+        completes_book = (other_public_counts > 0) & (other_public_counts + hand_counts == 4)
+        # The hand holds at most 3 cards of a rank, so the tiers do not overlap
+        scores = np.where(completes_book, 20, np.where(own_public_counts > 0, 10 + own_public_counts, hand_counts))
+        return scores.reshape(len(public_counts), -1)
+
+class GoFishVectorRuleAgentV3(GoFishVectorRuleAgent):
+    ''' GoFish Rule agent version 3, for a batch of games
+
+    Requests the rank from the player with the highest expected quantity
+    of the rank to end up with.
+    '''
+
+    def get_scores(self, arrays):
+        rank_expected_values = arrays['rank_expected_values']
+        return rank_expected_values.reshape(len(rank_expected_values), -1)
+
+class GoFishVectorRuleModel(Model):
+    ''' Base of the GoFish vector rule models
+    '''
+
+    agent_class = None
+
+    def __init__(self, seed=None):
+        ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
+        '''
+        seeds = [None] * 4 if seed is None else seeding.spawn_seeds(seed, 4)
+        self.rule_agents = [self.agent_class(seed=agent_seed) for agent_seed in seeds]
+
+    @property
+    def agents(self):
+        ''' Get a list of agents for each position in a the game
+
+        Returns:
+            agents (list): A list of agents
+
+        Note: Each agent should be just like RL agent with step and eval_step
+              functioning well.
+        '''
+        return self.rule_agents
+
+    @property
+    def use_raw(self):
+        ''' Indicate whether use raw state and action
+
+        Returns:
+            use_raw (boolean): True if using raw state and action
+        '''
+        return False
+
+class GoFishVectorRuleModelV1(GoFishVectorRuleModel):
+    ''' GoFish Vector Rule Model version 1
+    '''
+    agent_class = GoFishVectorRuleAgentV1
 
+class GoFishVectorRuleModelV2(GoFishVectorRuleModel):
+    ''' GoFish Vector Rule Model version 2
+    '''
+    agent_class = GoFishVectorRuleAgentV2
 
+class GoFishVectorRuleModelV3(GoFishVectorRuleModel):
+    ''' GoFish Vector Rule Model version 3
+    '''
+    agent_class = GoFishVectorRuleAgentV3
@@ -11,16 +11,23 @@ class ModelSpec(object):
             entry_point (string): a string that indicates the location of the model class
         '''
         self.model_id = model_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self.entry_point = entry_point
+        self._mod_name, self._class_name = entry_point.split(':')
+        self._model_class = None
 
-    def load(self):
-        ''' Instantiates an instance of the model
+    def load(self, **kwargs):
+        ''' Instantiates an instance of the model. The module of the model
+        is imported the first time the model is loaded.
+
+        Args:
+            kwargs: The arguments of the model class, e.g. the seed of the rule models
 
         Returns:
             Model (Model): an instance of the Model
         '''
-        model = self._entry_point()
+        if self._model_class is None:
+            self._model_class = getattr(importlib.import_module(self._mod_name), self._class_name)
+        model = self._model_class(**kwargs)
         return model
 
 
@@ -44,15 +51,16 @@ class ModelRegistry(object):
             raise ValueError('Cannot re-register model_id: {}'.format(model_id))
         self.model_specs[model_id] = ModelSpec(model_id, entry_point)
 
-    def load(self, model_id):
+    def load(self, model_id, **kwargs):
         ''' Create a model instance
 
         Args:
             model_id (string): the name of the model
+            kwargs: the arguments of the model class
         '''
         if model_id not in self.model_specs:
             raise ValueError('Cannot find model_id: {}'.format(model_id))
-        return self.model_specs[model_id].load()
+        return self.model_specs[model_id].load(**kwargs)
 
 # Have a global registry
 model_registry = ModelRegistry()
@@ -67,10 +75,11 @@ def register(model_id, entry_point):
     '''
     return model_registry.register(model_id, entry_point)
 
-def load(model_id):
+def load(model_id, **kwargs):
     ''' Create and model instance
 
     Args:
         model_id (string): the name of the model
+        kwargs: the arguments of the model class, e.g. `seed` for the rule models
     '''
-    return model_registry.load(model_id)
+    return model_registry.load(model_id, **kwargs)
@@ -5,13 +5,21 @@ import numpy as np
 
 import rlcard
 from rlcard.models.model import Model
+from rlcard.utils import seeding
 
 class UNORuleAgentV1(object):
     ''' UNO Rule agent version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
+        ''' Initialize the agent
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed of the agent's own
+                random stream. The global numpy random state is used if it is None.
+        '''
         self.use_raw = True
+        self.np_random = np.random if seed is None else seeding.np_random(seed)[0]
 
     def step(self, state):
         ''' Predict the action given raw state. A naive rule. Choose the color
@@ -40,7 +48,7 @@ class UNORuleAgentV1(object):
                 return action
 
         # Without wild-4, we randomly choose one
-        action = np.random.choice(self.filter_wild(legal_actions))
+        action = self.np_random.choice(self.filter_wild(legal_actions))
         return action
 
     def eval_step(self, state):
@@ -91,13 +99,18 @@ class UNORuleModelV1(Model):
     ''' UNO Rule Model version 1
     '''
 
-    def __init__(self):
+    def __init__(self, seed=None):
         ''' Load pretrained model
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The seed from which the
+                seeds of the agents of the positions are spawned. The agents
+                use the global numpy random state if it is None.
         '''
         env = rlcard.make('uno')
 
-        rule_agent = UNORuleAgentV1()
-        self.rule_agents = [rule_agent for _ in range(env.num_players)]
+        seeds = [None] * env.num_players if seed is None else seeding.spawn_seeds(seed, env.num_players)
+        self.rule_agents = [UNORuleAgentV1(agent_seed) for agent_seed in seeds]
 
     @property
     def agents(self):
@@ -1,3 +1,8 @@
 from rlcard.utils.logger import Logger
+from rlcard.utils.trajectory_buffer import TrajectoryBuffer
+from rlcard.utils.profiler import Profiler, merge_profiles
+from rlcard.utils.game_log import GameRecord, GameLog, GameLogWriter, replay
 from rlcard.utils import seeding
 from rlcard.utils.utils import *
+from rlcard.utils.dealing import DeckBatch
+from rlcard.utils.worlds import sample_worlds
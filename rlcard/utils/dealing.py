@@ -0,0 +1,101 @@
+''' Shuffling and dealing decks of cards by their ids.
+
+A deck is shuffled as an array of positions, which is mapped to the ids of
+its cards (see `Card.from_index`) and only then to the interned cards, so
+no list of cards is built or shuffled. A random state shuffles the
+positions exactly as it would shuffle the list of cards, so the same seed
+deals the same games.
+
+The copies of a vectorized environment can instead each take their decks
+from a `DeckBatch`, which shuffles the decks of many of their games with a
+single call.
+'''
+import numpy as np
+
+from rlcard.games.base import Card
+from rlcard.utils.utils import init_standard_deck
+
+# The ids of the cards of init_standard_deck, in its order
+STANDARD_DECK_IDS = np.array([card.get_numeric_index() for card in init_standard_deck()])
+
+# The interned cards by id, to map arrays of ids to cards at once
+_CARDS = np.empty(len(Card._cards_by_index), dtype=object)
+_CARDS[:] = Card._cards_by_index
+
+# The unshuffled positions of the decks of each size
+_positions = {}
+
+def _get_positions(num_cards):
+    positions = _positions.get(num_cards)
+    if positions is None:
+        positions = _positions[num_cards] = np.arange(num_cards)
+        positions.flags.writeable = False
+    return positions
+
+def shuffle_deck_ids(np_random, deck_ids=STANDARD_DECK_IDS, deck_batch=None):
+    ''' Shuffle a deck given by the ids of its cards
+
+    Args:
+        np_random (numpy.random.RandomState): The random state of the game
+        deck_ids (numpy.array): The ids of the cards of the deck, in order
+        deck_batch (DeckBatch): A batch to take the shuffle from instead of the random state
+
+    Returns:
+        (numpy.array): The ids of the shuffled deck, in the order that
+            shuffling the list of the cards of the deck with the random state gives
+    '''
+    if deck_batch is not None:
+        return deck_ids[deck_batch.next_permutation(len(deck_ids))]
+    positions = _get_positions(len(deck_ids)).copy()
+    np_random.shuffle(positions)
+    return deck_ids[positions]
+
+def cards_from_ids(card_ids):
+    ''' Get the interned cards of ids
+
+    Args:
+        card_ids (numpy.array): The ids of the cards
+
+    Returns:
+        (list): A list of Card object
+    '''
+    return _CARDS[card_ids].tolist()
+
+class DeckBatch(object):
+    ''' Shuffle the decks of the next games of an environment at once
+
+    The decks are dealt one after the other from a block of permutations,
+    made by sorting one array of random keys for the whole batch, which is
+    refilled when it runs out. Each copy of a vectorized environment has a
+    batch of its own, so its deals only depend on its seed, and not on when
+    the other copies deal theirs.
+    '''
+
+    def __init__(self, batch_size, seed=None):
+        ''' Initialize the batch
+
+        Args:
+            batch_size (int): The number of decks shuffled at once
+            seed (int or numpy.random.SeedSequence): The seed of the shuffles. A random seed is used if it is None.
+        '''
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self._permutations = None
+        self._next = 0
+
+    def next_permutation(self, num_cards):
+        ''' Get the next shuffle
+
+        Args:
+            num_cards (int): The number of cards of the deck
+
+        Returns:
+            (numpy.array): A permutation of the positions of the deck
+        '''
+        if self._permutations is None or self._next == self.batch_size or self._permutations.shape[1] != num_cards:
+            # Generator.permuted would shuffle in place, but it needs numpy 1.20
+            self._permutations = self.rng.random((self.batch_size, num_cards)).argsort(axis=1)
+            self._next = 0
+        permutation = self._permutations[self._next]
+        self._next += 1
+        return permutation
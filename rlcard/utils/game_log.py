@@ -0,0 +1,206 @@
+''' Compact binary logs of games.
+
+A game is recorded by its environment id, its game configuration, the seed
+its environment was reset with, the ids of the actions taken and the
+payoffs. Since the games are deterministic given the seed and the actions,
+this is enough for `replay` to rebuild any state of the game.
+
+The records are appended to a file, each one as a single write, so several
+environments (or the workers of a vectorized environment) can log to the
+same file. A record is laid out as follows, in little endian:
+
+    4 bytes   magic b'RLG1'
+    uint32    size of the rest of the record
+    uint8     size of the environment id, then the id in UTF-8
+    uint16    size of the configuration, then the configuration as UTF-8 JSON
+    uint64    seed
+    uint8     number of players, then the payoffs as float64
+    uint8     size in bytes of an action id (1, 2 or 4)
+    uint32    number of actions, then the action ids
+'''
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b'RLG1'
+
+class GameRecord(object):
+    ''' The record of one game
+    '''
+
+    def __init__(self, env_id, config, seed, payoffs, actions):
+        ''' Initialize the record
+
+        Args:
+            env_id (string): The name of the environment
+            config (dict): The game configuration, i.e. the fields starting with 'game_'
+            seed (int): The seed the environment was reset with
+            payoffs (numpy.array): The payoffs of the players
+            actions (numpy.array): The ids of the actions taken, in order
+        '''
+        self.env_id = env_id
+        self.config = config
+        self.seed = seed
+        self.payoffs = payoffs
+        self.actions = actions
+
+    def to_bytes(self):
+        ''' Encode the record
+
+        Returns:
+            (bytes): The record, with its magic and size
+        '''
+        env_id = self.env_id.encode('utf8')
+        config = json.dumps(self.config, sort_keys=True, separators=(',', ':')).encode('utf8')
+        payoffs = np.asarray(self.payoffs, dtype='<f8')
+        actions = np.asarray(self.actions)
+        max_action = int(actions.max()) if len(actions) > 0 else 0
+        dtype = '<u1' if max_action < 2 ** 8 else '<u2' if max_action < 2 ** 16 else '<u4'
+        payload = b''.join([
+            struct.pack('<B', len(env_id)), env_id,
+            struct.pack('<H', len(config)), config,
+            struct.pack('<QB', self.seed, len(payoffs)), payoffs.tobytes(),
+            struct.pack('<BI', np.dtype(dtype).itemsize, len(actions)), actions.astype(dtype).tobytes(),
+        ])
+        return MAGIC + struct.pack('<I', len(payload)) + payload
+
+    @staticmethod
+    def from_buffer(buffer, offset=0):
+        ''' Decode a record
+
+        Args:
+            buffer (bytes-like): A buffer holding the record, e.g. a memory-mapped log
+            offset (int): The position of the record in the buffer
+
+        Returns:
+            (tuple): The record and the position of the next record. The
+                actions are a view of the buffer, not a copy.
+        '''
+        if bytes(buffer[offset:offset + 4]) != MAGIC:
+            raise ValueError('No game record at offset {}'.format(offset))
+        size, = struct.unpack_from('<I', buffer, offset + 4)
+        end = offset + 8 + size
+        position = offset + 8
+
+        length, = struct.unpack_from('<B', buffer, position)
+        env_id = bytes(buffer[position + 1:position + 1 + length]).decode('utf8')
+        position += 1 + length
+        length, = struct.unpack_from('<H', buffer, position)
+        config = json.loads(bytes(buffer[position + 2:position + 2 + length]).decode('utf8'))
+        position += 2 + length
+        seed, num_players = struct.unpack_from('<QB', buffer, position)
+        position += 9
+        payoffs = np.frombuffer(buffer, dtype='<f8', count=num_players, offset=position)
+        position += 8 * num_players
+        itemsize, num_actions = struct.unpack_from('<BI', buffer, position)
+        position += 5
+        actions = np.frombuffer(buffer, dtype='<u{}'.format(itemsize), count=num_actions, offset=position)
+        if position + itemsize * num_actions != end:
+            raise ValueError('Corrupted game record at offset {}'.format(offset))
+
+        return GameRecord(env_id, config, seed, payoffs, actions), end
+
+class GameLogWriter(object):
+    ''' Append game records to a file
+    '''
+
+    def __init__(self, path):
+        ''' Open the log
+
+        Args:
+            path (string): The path of the log. The records are appended if it exists.
+        '''
+        self.path = path
+        self._file = open(path, 'ab', buffering=0)
+
+    def write(self, record):
+        ''' Append a record
+
+        Args:
+            record (GameRecord): The record of a game
+        '''
+        self._file.write(record.to_bytes())
+
+    def close(self):
+        self._file.close()
+
+    def __getstate__(self):
+        # A writer is reopened in append mode when an environment is sent to another process
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+class GameLog(object):
+    ''' Read a log of games. The file is memory-mapped, and the actions of
+    the records are views of it, so large logs are not loaded in memory.
+    '''
+
+    def __init__(self, path):
+        ''' Open the log and index its records
+
+        Args:
+            path (string): The path of the log
+        '''
+        self.path = path
+        self._file = open(path, 'rb')
+        self._offsets = []
+        self._buffer = b''
+        if self._file.seek(0, 2) > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = 0
+        while offset < len(self._buffer):
+            if self._buffer[offset:offset + 4] != MAGIC:
+                raise ValueError('No game record at offset {}'.format(offset))
+            self._offsets.append(offset)
+            offset += 8 + struct.unpack_from('<I', self._buffer, offset + 4)[0]
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        return GameRecord.from_buffer(self._buffer, self._offsets[index])[0]
+
+    def __iter__(self):
+        for offset in self._offsets:
+            yield GameRecord.from_buffer(self._buffer, offset)[0]
+
+    def close(self):
+        ''' Close the log. The records that were read should not be used after.
+        '''
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Some records still view the map. It is closed when they are freed.
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def replay(record, num_steps=None):
+    ''' Rebuild a state of a logged game
+
+    Args:
+        record (GameRecord): The record of the game
+        num_steps (int): The number of actions to replay. All the actions are replayed if it is None.
+
+    Returns:
+        (Env): An environment in the state of the game after num_steps actions
+    '''
+    from rlcard.envs.registration import make
+
+    config = dict(record.config)
+    config['seed'] = int(record.seed)
+    env = make(record.env_id, config)
+    env.reset()
+    actions = record.actions if num_steps is None else record.actions[:num_steps]
+    for action in actions:
+        env.step(int(action))
+    return env
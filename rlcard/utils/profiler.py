@@ -0,0 +1,81 @@
+import time
+
+
+class Profiler(object):
+    ''' Record the cumulative time and the number of calls of functions.
+
+    The functions are wrapped with `wrap`, so nothing is timed, and nothing
+    costs anything, unless profiling is turned on. The times are inclusive:
+    a profiled function that calls another one is also charged for it.
+    '''
+
+    def __init__(self):
+        self.calls = {}
+        self.times = {}
+
+    def wrap(self, name, function):
+        ''' Wrap a function so that its calls are recorded under a name
+
+        Args:
+            name (str): The name of the record
+            function (callable): The function to time
+
+        Returns:
+            (callable): The timed function
+        '''
+        calls = self.calls
+        times = self.times
+        calls.setdefault(name, 0)
+        times.setdefault(name, 0.0)
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                times[name] += perf_counter() - start
+                calls[name] += 1
+        return timed
+
+    def record(self, name, elapsed):
+        ''' Record one call that took some time
+
+        Args:
+            name (str): The name of the record
+            elapsed (float): The time of the call in seconds
+        '''
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.times[name] = self.times.get(name, 0.0) + elapsed
+
+    def get_profile(self):
+        ''' Get the records
+
+        Returns:
+            (dict): For each name, a dictionary with the number of 'calls' and the total 'time' in seconds
+        '''
+        return {name: {'calls': self.calls[name], 'time': self.times[name]} for name in self.calls}
+
+    def reset(self):
+        ''' Set all the records to zero
+        '''
+        for name in self.calls:
+            self.calls[name] = 0
+            self.times[name] = 0.0
+
+def merge_profiles(profiles):
+    ''' Sum the records of several profiles, e.g. of the copies of a vectorized environment
+
+    Args:
+        profiles (list): A list of profiles returned by `get_profile`
+
+    Returns:
+        (dict): The merged profile
+    '''
+    merged = {}
+    for profile in profiles:
+        for name, record in profile.items():
+            total = merged.setdefault(name, {'calls': 0, 'time': 0.0})
+            total['calls'] += record['calls']
+            total['time'] += record['time']
+    return merged
@@ -31,15 +31,54 @@ def error(msg, *args):
     print(colorize('%s: %s'%('ERROR', msg % args), 'red'))
 
 def np_random(seed=None):
+    ''' Create a random number generator
+
+    Args:
+        seed (int or numpy.random.SeedSequence): An integer seed, which is
+            hashed, or a seed sequence, e.g. one of those made by `spawn_seeds`.
+            A random seed is used if it is None.
+
+    Returns:
+        (tuple): The numpy.random.RandomState and the seed
+    '''
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.RandomState(np.random.MT19937(seed)), seed
     if seed is not None and not (isinstance(seed, int) and 0 <= seed):
         raise error.Error('Seed must be a non-negative integer or omitted, not {}'.format(seed))
 
     seed = create_seed(seed)
 
     rng = np.random.RandomState()
-    rng.seed(_int_list_from_bigint(hash_seed(seed)))
+    reseed(rng, seed)
     return rng, seed
 
+def reseed(rng, seed):
+    ''' Seed a random state in place, as `np_random` seeds a new one
+
+    Args:
+        rng (numpy.random.RandomState): The random state, e.g. shared by a game and its dealer
+        seed (int): A non-negative integer seed
+    '''
+    rng.seed(_int_list_from_bigint(hash_seed(seed)))
+
+def spawn_seeds(seed, n):
+    ''' Spawn independent seeds from one seed, e.g. one for each copy of an
+    environment and one for each agent. The i-th seed only depends on the
+    seed and on i, so the streams do not change with the number of workers
+    that run them.
+
+    Args:
+        seed (int or numpy.random.SeedSequence): The seed to spawn from
+        n (int): The number of seeds
+
+    Returns:
+        (list): A list of numpy.random.SeedSequence, to be passed as the
+            'seed' of `rlcard.make` or of an agent
+    '''
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
 def hash_seed(seed=None, max_bytes=8):
     """Any given evaluation is likely to have many PRNG's active at
     once. (Most commonly, because the environment is running in
@@ -0,0 +1,114 @@
+''' Snapshots of the mutable state of a game.
+
+A snapshot records the attributes of a list of objects (the game, its
+dealer, round, players, ...). The lists, dicts, sets, card sets and arrays
+they hold are copied, while cards and the other objects are only
+referenced, so a snapshot costs a few list copies instead of a deepcopy of
+the game.
+Restoring writes the saved values back into the same objects and
+containers, so the references between them stay valid, and the same
+snapshot can be restored any number of times.
+'''
+import numpy as np
+
+from rlcard.games.base import CardSet
+
+_MUTABLE_TYPES = (list, dict, set, CardSet, np.ndarray, np.random.RandomState)
+
+class Snapshot(object):
+    ''' The saved state of a list of objects
+    '''
+
+    __slots__ = ('objects',)
+
+    def __init__(self, objects):
+        self.objects = objects
+
+class _SavedContainer(object):
+    __slots__ = ('container', 'content')
+
+    def __init__(self, container, content):
+        self.container = container
+        self.content = content
+
+def take_snapshot(objects, skip=()):
+    ''' Save the attributes of a list of objects
+
+    Args:
+        objects (list): The objects to save. Objects that are only referenced
+            by their attributes are not saved, so every mutable object of the
+            game must be listed.
+        skip (tuple): The names of attributes that are not saved, e.g. the
+            history of a game or its configuration
+
+    Returns:
+        (Snapshot): The snapshot, to be passed to `restore_snapshot`
+    '''
+    memo = {}
+    saved_objects = []
+    for obj in objects:
+        attributes = {}
+        for key, value in obj.__dict__.items():
+            if key not in skip:
+                attributes[key] = _save(value, memo)
+        saved_objects.append((obj, attributes, skip))
+    return Snapshot(saved_objects)
+
+def restore_snapshot(snapshot):
+    ''' Restore the objects of a snapshot to the saved state
+
+    Args:
+        snapshot (Snapshot): A snapshot returned by `take_snapshot`
+    '''
+    restored = set()
+    for obj, attributes, skip in snapshot.objects:
+        state = obj.__dict__
+        for key in [key for key in state if key not in attributes and key not in skip]:
+            del state[key]
+        for key, value in attributes.items():
+            state[key] = _restore(value, restored)
+
+def _save(value, memo):
+    if isinstance(value, _MUTABLE_TYPES):
+        saved = memo.get(id(value))
+        if saved is None:
+            if isinstance(value, list):
+                content = [_save(item, memo) if isinstance(item, _MUTABLE_TYPES) else item for item in value]
+            elif isinstance(value, dict):
+                content = [(key, _save(item, memo)) for key, item in value.items()]
+            elif isinstance(value, set):
+                content = list(value)
+            elif isinstance(value, CardSet):
+                content = value.mask
+            elif isinstance(value, np.ndarray):
+                content = value.copy()
+            else:
+                content = value.get_state()
+            saved = memo[id(value)] = _SavedContainer(value, content)
+        return saved
+    return value
+
+def _restore(value, restored):
+    if type(value) is not _SavedContainer:
+        return value
+    container = value.container
+    if id(value) in restored:
+        return container
+    restored.add(id(value))
+    content = value.content
+    if isinstance(container, list):
+        container[:] = [_restore(item, restored) if type(item) is _SavedContainer else item for item in content]
+    elif isinstance(container, dict):
+        container.clear()
+        for key, item in content:
+            container[key] = _restore(item, restored)
+    elif isinstance(container, set):
+        container.clear()
+        container.update(content)
+    elif isinstance(container, CardSet):
+        container.mask = content
+    elif isinstance(container, np.ndarray):
+        container[...] = content
+    else:
+        container.set_state(content)
+    return container
@@ -0,0 +1,161 @@
+import numpy as np
+
+
+class TrajectoryBuffer(object):
+    ''' Record the steps of games in preallocated NumPy columns.
+
+    Every decision of a player is stored as one row with the observation, the
+    legal action mask, the player id and the action. At the end of a game the
+    final state of each player is stored as a row with action -1. The
+    transitions (obs, action, reward, next_obs, next_legal_mask, done) are
+    then built for all the games at once, which is what `reorganize` does for
+    the lists returned by `Env.run`.
+    '''
+
+    def __init__(self, state_shape, num_actions, capacity=1024, obs_dtype=np.float32):
+        ''' Initialize the buffer
+
+        Args:
+            state_shape (list): The shape of the observations
+            num_actions (int): The number of actions
+            capacity (int): The number of rows to preallocate. The columns
+                grow when they are full.
+            obs_dtype (numpy.dtype): The type of the observations
+        '''
+        self.state_shape = list(state_shape)
+        self.num_actions = num_actions
+        capacity = max(1, capacity)
+        self.obs = np.zeros([capacity] + self.state_shape, dtype=obs_dtype)
+        self.legal_masks = np.zeros((capacity, num_actions), dtype=bool)
+        self.player_ids = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.episode_ids = np.zeros(capacity, dtype=np.int64)
+        self.payoffs = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, obs, legal_mask, player_id, action=-1):
+        ''' Add a row to the current game
+
+        Args:
+            obs (numpy.array): The observation of the player
+            legal_mask (numpy.array): The legal action mask of the player
+            player_id (int): The id of the player
+            action (int): The action id taken by the player, or -1 for a final state
+        '''
+        if self.size == len(self.actions):
+            self._grow()
+        i = self.size
+        self.obs[i] = obs
+        self.legal_masks[i] = legal_mask
+        self.player_ids[i] = player_id
+        self.actions[i] = action
+        self.episode_ids[i] = len(self.payoffs)
+        self.size += 1
+
+    def end_episode(self, payoffs):
+        ''' Finish the current game
+
+        Args:
+            payoffs (list): The payoffs of the players
+        '''
+        self.payoffs.append(np.asarray(payoffs, dtype=np.float32))
+
+    def record(self, env, is_training=False, player_ids=None):
+        ''' Run a complete game with the agents of the environment and record it
+
+        Args:
+            env (Env): The environment, with its agents set
+            is_training (boolean): True if for training purpose
+            player_ids (list): The players to record. All the players are recorded if it is None.
+
+        Returns:
+            (list): A list payoffs. Each entry corresponds to one player.
+        '''
+        if player_ids is None:
+            player_ids = range(env.num_players)
+        recorded = set(player_ids)
+        state, player_id = env.reset()
+
+        # Loop to play the game
+        while not env.is_over():
+            action = env._act(player_id, state, is_training)
+            if player_id in recorded:
+                if env.agents[player_id].use_raw:
+                    raise ValueError('Cannot record the raw actions of player {}'.format(player_id))
+                self.add(state['obs'], state['legal_mask'], player_id, action)
+            state, player_id = env.step(action, env.agents[player_id].use_raw)
+
+        # Add a final state to the recorded players
+        payoffs = env._get_run_payoffs(is_training)
+        for player_id in sorted(recorded):
+            state = env.get_state(player_id)
+            self.add(state['obs'], state['legal_mask'], player_id)
+        self.end_episode(payoffs)
+
+        return payoffs
+
+    def transitions(self, player_id=None):
+        ''' Get the transitions of the finished games
+
+        Args:
+            player_id (int): Only get the transitions of this player if it is not None
+
+        Returns:
+            (dict): The columns 'obs', 'actions', 'rewards', 'next_obs',
+                'next_legal_masks', 'dones' and 'player_ids'. The transitions
+                are ordered by game, then by player, then by time.
+        '''
+        rows = np.flatnonzero(self.episode_ids[:self.size] < len(self.payoffs))
+        episode_ids = self.episode_ids[rows]
+        player_ids = self.player_ids[rows]
+        rows = rows[np.lexsort((rows, player_ids, episode_ids))]
+
+        # Every row is followed by the next row of the same player in the same game
+        episode_ids = self.episode_ids[rows]
+        player_ids = self.player_ids[rows]
+        same_player = (episode_ids[1:] == episode_ids[:-1]) & (player_ids[1:] == player_ids[:-1])
+        current, following = rows[:-1][same_player], rows[1:][same_player]
+        if player_id is not None:
+            selected = self.player_ids[current] == player_id
+            current, following = current[selected], following[selected]
+
+        # The transition into a final state gets the payoff
+        dones = self.actions[following] < 0
+        if len(self.payoffs) > 0:
+            payoffs = np.stack(self.payoffs)[self.episode_ids[current], self.player_ids[current]]
+        else:
+            payoffs = np.zeros(len(current), dtype=np.float32)
+        rewards = np.where(dones, payoffs, 0).astype(np.float32)
+
+        return {
+            'obs': self.obs[current],
+            'actions': self.actions[current],
+            'rewards': rewards,
+            'next_obs': self.obs[following],
+            'next_legal_masks': self.legal_masks[following],
+            'dones': dones,
+            'player_ids': self.player_ids[current],
+        }
+
+    def save(self, path, player_id=None):
+        ''' Save the transitions of the finished games to a .npz file
+
+        Args:
+            path (str): The path of the file
+            player_id (int): Only save the transitions of this player if it is not None
+        '''
+        np.savez(path, **self.transitions(player_id))
+
+    def clear(self):
+        ''' Remove all the games from the buffer
+        '''
+        self.payoffs = []
+        self.size = 0
+
+    def _grow(self):
+        for name in ('obs', 'legal_masks', 'player_ids', 'actions', 'episode_ids'):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
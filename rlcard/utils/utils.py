@@ -2,14 +2,18 @@ import numpy as np
 
 from rlcard.games.base import Card
 
+def is_torch_available():
+    ''' Check if torch is installed, without importing it
+
+    Returns:
+        (boolean): True if torch can be imported
+    '''
+    import importlib.util
+    return importlib.util.find_spec('torch') is not None
+
 def set_seed(seed):
     if seed is not None:
-        import subprocess
-        import sys
-
-        reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-        installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-        if 'torch' in installed_packages:
+        if is_torch_available():
             import torch
             torch.backends.cudnn.deterministic = True
             torch.manual_seed(seed)
@@ -34,10 +38,7 @@ def init_standard_deck():
     Returns:
         (list): A list of Card object
     '''
-    suit_list = ['S', 'H', 'D', 'C']
-    rank_list = ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']
-    res = [Card(suit, rank) for suit in suit_list for rank in rank_list]
-    return res
+    return _STANDARD_DECK.copy()
 
 def init_54_deck():
     ''' Initialize a standard deck of 52 cards, BJ and RJ
@@ -45,12 +46,11 @@ def init_54_deck():
     Returns:
         (list): Alist of Card object
     '''
-    suit_list = ['S', 'H', 'D', 'C']
-    rank_list = ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']
-    res = [Card(suit, rank) for suit in suit_list for rank in rank_list]
-    res.append(Card('BJ', ''))
-    res.append(Card('RJ', ''))
-    return res
+    return _STANDARD_DECK + _JOKERS
+
+# The interned cards are shared by all the decks, in the order S, H, D, C and A, 2, ..., K
+_STANDARD_DECK = [Card(suit, rank) for suit in ['S', 'H', 'D', 'C'] for rank in ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']]
+_JOKERS = [Card('BJ', ''), Card('RJ', '')]
 
 def rank2int(rank):
     ''' Get the coresponding number of a rank.
@@ -175,25 +175,66 @@ def reorganize(trajectories, payoffs):
             new_trajectories[player].append(transition)
     return new_trajectories
 
+def get_legal_mask(state, num_actions):
+    ''' Get the legal actions of a state as a boolean mask
+
+    Args:
+        state (dict): The extracted state
+        num_actions (int): The number of actions of the environment
+
+    Returns:
+        legal_mask (numpy.array): A boolean array of length num_actions
+    '''
+    if 'legal_mask' in state:
+        return state['legal_mask']
+    legal_mask = np.zeros(num_actions, dtype=bool)
+    legal_mask[list(state['legal_actions'])] = True
+    return legal_mask
+
 def remove_illegal(action_probs, legal_actions):
     ''' Remove illegal actions and normalize the
         probability vector
 
     Args:
         action_probs (numpy.array): A 1 dimention numpy array.
-        legal_actions (list): A list of indices of legal actions.
+        legal_actions (numpy.array or list): A boolean mask of the legal actions,
+            or a list of indices of legal actions.
 
     Returns:
         probd (numpy.array): A normalized vector without legal actions.
     '''
-    probs = np.zeros(action_probs.shape[0])
-    probs[legal_actions] = action_probs[legal_actions]
-    if np.sum(probs) == 0:
-        probs[legal_actions] = 1 / len(legal_actions)
+    legal_mask = np.asarray(legal_actions)
+    if legal_mask.dtype != np.bool_:
+        legal_mask = np.zeros(action_probs.shape[0], dtype=bool)
+        legal_mask[legal_actions] = True
+    probs = np.where(legal_mask, action_probs, 0.0)
+    total = np.sum(probs)
+    if total == 0:
+        probs = legal_mask / np.count_nonzero(legal_mask)
     else:
-        probs /= sum(probs)
+        probs /= total
     return probs
 
+def random_argmax(scores, legal_mask, np_random=None):
+    ''' Pick the legal action with the highest score in each row of a batch,
+        breaking the ties at random
+
+    Args:
+        scores (numpy.array): A (batch, num_actions) array of scores
+        legal_mask (numpy.array): A (batch, num_actions) boolean mask of the legal actions
+        np_random (numpy.random.RandomState): The random state to break the
+            ties with. The global random state of numpy is used if it is None.
+
+    Returns:
+        (numpy.array): The (batch,) action ids
+    '''
+    if np_random is None:
+        np_random = np.random
+    scores = np.where(legal_mask, scores, -np.inf)
+    is_top = legal_mask & (scores == scores.max(axis=1, keepdims=True))
+    keys = np_random.random_sample(scores.shape)
+    return np.where(is_top, keys, -1.0).argmax(axis=1)
+
 def tournament(env, num):
     ''' Evaluate he performance of the agents in the environment
 
@@ -223,6 +264,105 @@ def tournament(env, num):
         payoffs[i] /= counter
     return payoffs
 
+def run_batch(envs, is_training=False):
+    ''' Run a complete game in each of several environments concurrently. The
+        pending decisions of all the games are gathered so that an agent that
+        implements `eval_step_batch` (or `step_batch` for training) acts on all
+        of its states with a single call. Other agents act one state at a time.
+
+    Args:
+        envs (list): A list of environments of the same game, with agents set
+        is_training (boolean): True if for training purpose.
+
+    Returns:
+        (list): A list of (trajectories, payoffs) tuples, one per environment,
+            in the same format as returned by `Env.run`
+    '''
+    trajectories = [[[] for _ in range(env.num_players)] for env in envs]
+    states = []
+    player_ids = []
+    for i, env in enumerate(envs):
+        state, player_id = env.reset()
+        trajectories[i][player_id].append(state)
+        states.append(state)
+        player_ids.append(player_id)
+
+    # Loop to play the games
+    pending = [i for i, env in enumerate(envs) if not env.is_over()]
+    while pending:
+        actions = _act_batch(envs, pending, states, player_ids, is_training)
+        next_pending = []
+        for i in pending:
+            env = envs[i]
+            player_id = player_ids[i]
+            next_state, next_player_id = env.step(actions[i], env.agents[player_id].use_raw)
+            trajectories[i][player_id].append(actions[i])
+            states[i] = next_state
+            player_ids[i] = next_player_id
+            if not env.game.is_over():
+                trajectories[i][next_player_id].append(next_state)
+                next_pending.append(i)
+        pending = next_pending
+
+    results = []
+    for i, env in enumerate(envs):
+        # Add a final state to all the players
+        for player_id in range(env.num_players):
+            trajectories[i][player_id].append(env.get_state(player_id))
+        results.append((trajectories[i], env._get_run_payoffs(is_training)))
+    return results
+
+def _act_batch(envs, indices, states, player_ids, is_training):
+    ''' Get the actions of the pending decisions, grouped by agent
+
+    Returns:
+        (dict): The action of each environment index
+    '''
+    groups = {}
+    for i in indices:
+        agent = envs[i].agents[player_ids[i]]
+        if id(agent) not in groups:
+            groups[id(agent)] = (agent, [])
+        groups[id(agent)][1].append(i)
+
+    actions = {}
+    for agent, group in groups.values():
+        group_states = [states[i] for i in group]
+        if is_training:
+            if hasattr(agent, 'step_batch'):
+                group_actions = agent.step_batch(group_states)
+            else:
+                group_actions = [agent.step(state) for state in group_states]
+        else:
+            if hasattr(agent, 'eval_step_batch'):
+                group_actions, _ = agent.eval_step_batch(group_states)
+            else:
+                group_actions = [agent.eval_step(state)[0] for state in group_states]
+        actions.update(zip(group, group_actions))
+    return actions
+
+def tournament_batch(envs, num):
+    ''' Evaluate the performance of the agents by playing games in several
+        environments concurrently with `run_batch`
+
+    Args:
+        envs (list): A list of environments of the same game, with agents set
+        num (int): The number of games to play. It is rounded up to a multiple of len(envs).
+
+    Returns:
+        A list of avrage payoffs for each player
+    '''
+    payoffs = [0 for _ in range(envs[0].num_players)]
+    counter = 0
+    while counter < num:
+        for _, _payoffs in run_batch(envs, is_training=False):
+            for i, _ in enumerate(payoffs):
+                payoffs[i] += _payoffs[i]
+            counter += 1
+    for i, _ in enumerate(payoffs):
+        payoffs[i] /= counter
+    return payoffs
+
 def tournament_random_opponents(env, num, primary_agent, opponent_agents):
     payoffs = [0 for _ in range(env.num_players)]
     counter = 0
@@ -245,6 +385,37 @@ def tournament_random_opponents(env, num, primary_agent, opponent_agents):
         payoffs[i] /= counter
     return payoffs
 
+def tournament_random_opponents_batch(envs, num, primary_agent, opponent_agents):
+    ''' Evaluate an agent against opponents drawn at random for each game, like
+        `tournament_random_opponents`, by playing games in several environments
+        concurrently with `run_batch`, so that the agents that implement
+        `eval_step_batch` act on all the games at once
+
+    Args:
+        envs (list): A list of environments of the same game
+        num (int): The number of games to play. It is rounded up to a multiple of len(envs).
+        primary_agent (object): The agent of the first player
+        opponent_agents (list): The agents to draw the other players from
+
+    Returns:
+        A list of avrage payoffs for each player
+    '''
+    payoffs = [0 for _ in range(envs[0].num_players)]
+    counter = 0
+    while counter < num:
+        for env in envs:
+            agents = [primary_agent]
+            for i in range(env.num_players - 1):
+                agents.append(np.random.choice(opponent_agents))
+            env.set_agents(agents)
+        for _, _payoffs in run_batch(envs, is_training=False):
+            for i, _ in enumerate(payoffs):
+                payoffs[i] += _payoffs[i]
+            counter += 1
+    for i, _ in enumerate(payoffs):
+        payoffs[i] /= counter
+    return payoffs
+
 def plot_curve(csv_path, save_path, algorithm):
     ''' Read data from csv file and plot the results
     '''
@@ -0,0 +1,187 @@
+''' Sampling the hidden cards of a game consistently with what a player knows.
+
+A world is a deal of the cards that a player can not see, given as an array
+`world` of the 52 card ids, `world[i]` being the id of the card that takes
+the place of card i. The cards the player can see map to themselves, and
+the hidden cards (the other hands, the deck, ...) are permuted among their
+places, so applying a world to a game keeps the sizes of the hands and of
+the deck, and every public record of the game that refers to a hidden card
+refers to the card that replaces it.
+
+A game that supports sampling describes the hidden cards of a player with
+`get_world_constraints` and applies a world with `apply_world`.
+
+The worlds are drawn for all the samples at once: the hidden places are
+filled one after the other, the most constrained first, each with one of the
+cards still allowed there. The constraints across places are checked as the
+places are filled: a place of a set of places that must hold a card of a
+rank picks among the cards of the rank half of the time, and the last place
+of the set only allows them, so a sample is only redrawn if it runs out of
+allowed cards. Since the places are
+not filled uniformly among all the consistent deals, each world comes with an
+importance weight, and the weights give unbiased averages over the deals.
+'''
+import numpy as np
+
+class WorldConstraints(object):
+    ''' The cards hidden from a player and where they may be
+    '''
+
+    def __init__(self, hidden_cards, allowed, at_least_one=(), at_most=()):
+        ''' Initialize the constraints
+
+        Args:
+            hidden_cards (numpy.array): The ids of the n hidden cards, which are also their n places
+            allowed (numpy.array): An (n, n) boolean array, allowed[i, j] being True if
+                hidden card j may take the place of hidden card i
+            at_least_one (list): (places, cards) pairs, where at least one of the
+                places must take one of the cards. The places are indices of
+                hidden cards, and the cards are (n,) boolean masks of hidden cards.
+            at_most (list): (places, cards, limit) triples, where at most limit of
+                the places may take one of the cards
+        '''
+        self.hidden_cards = np.asarray(hidden_cards, dtype=np.intp)
+        num_cards = len(self.hidden_cards)
+        self.allowed = np.asarray(allowed, dtype=bool).reshape(num_cards, num_cards)
+        self.at_least_one = [(np.asarray(places, dtype=np.intp), np.asarray(cards, dtype=bool)) for places, cards in at_least_one]
+        self.at_most = [(np.asarray(places, dtype=np.intp), np.asarray(cards, dtype=bool), limit) for places, cards, limit in at_most]
+
+def sample_worlds(game, player_id, num_worlds, np_random=None, max_rounds=100):
+    ''' Sample deals of the cards hidden from a player that are consistent
+    with everything the player knows
+
+    Args:
+        game (object): A game with `get_world_constraints`, e.g. Go Fish or Hearts
+        player_id (int): The id of the player
+        num_worlds (int): The number of worlds to sample
+        np_random (numpy.random.RandomState): The random state to sample
+            with. The global random state of numpy is used if it is None, so
+            the random state of the game is not disturbed.
+        max_rounds (int): The number of times samples are redrawn before giving up
+
+    Returns:
+        (tuple): An (num_worlds, 52) array of worlds, and their (num_worlds,)
+            importance weights, which sum to 1
+    '''
+    constraints = game.get_world_constraints(player_id)
+    hidden_cards = constraints.hidden_cards
+    permutations, weights = sample_permutations(constraints, num_worlds, np_random, max_rounds)
+    worlds = np.tile(np.arange(52), (num_worlds, 1))
+    worlds[:, hidden_cards] = hidden_cards[permutations]
+    return worlds, weights
+
+def sample_permutations(constraints, num_samples, np_random=None, max_rounds=100):
+    ''' Sample permutations of the hidden cards of constraints among their places
+
+    Args:
+        constraints (WorldConstraints): The constraints
+        num_samples (int): The number of permutations to sample
+        np_random (numpy.random.RandomState): The random state to sample with
+        max_rounds (int): The number of times samples are redrawn before giving up
+
+    Returns:
+        (tuple): An (num_samples, n) array of permutations, the index of the
+            hidden card taking each place, and their (num_samples,) importance
+            weights, which sum to 1
+    '''
+    if np_random is None:
+        np_random = np.random
+    num_cards = len(constraints.hidden_cards)
+    permutations = np.empty((num_samples, num_cards), dtype=np.intp)
+    log_weights = np.empty(num_samples)
+
+    num_missing = num_samples
+    acceptance = 1.0
+    for _ in range(max_rounds):
+        if num_missing == 0:
+            break
+        num_proposed = min(int(np.ceil(num_missing / acceptance)), 16 * num_samples)
+        proposed, proposed_log_weights, is_complete = _propose_permutations(constraints, num_proposed, np_random)
+        accepted = np.flatnonzero(is_complete)[:num_missing]
+        start = num_samples - num_missing
+        permutations[start:start + len(accepted)] = proposed[accepted]
+        log_weights[start:start + len(accepted)] = proposed_log_weights[accepted]
+        num_missing -= len(accepted)
+        acceptance = max(is_complete.mean(), 1 / 16)
+    if num_missing > 0:
+        raise ValueError('Could not sample permutations that satisfy the constraints in {} rounds'.format(max_rounds))
+
+    weights = np.exp(log_weights - log_weights.max()) if num_samples > 0 else log_weights
+    return permutations, weights / weights.sum()
+
+def _propose_permutations(constraints, num_samples, np_random):
+    ''' Fill the places in order, each with an allowed card left
+
+    Returns:
+        (tuple): The permutations, the logarithms of the inverses of their
+            probabilities, and whether each of them could be completed
+    '''
+    allowed = constraints.allowed
+    num_cards = len(allowed)
+    # The places of the smallest sets that must hold a card come first, then the places with the fewest allowed cards
+    set_sizes = np.full(num_cards, num_cards + 1)
+    for places, _ in constraints.at_least_one:
+        set_sizes[places] = np.minimum(set_sizes[places], len(places))
+    order = np.lexsort((allowed.sum(axis=1), set_sizes))
+    step_of_place = np.empty(num_cards, dtype=np.intp)
+    step_of_place[order] = np.arange(num_cards)
+    at_least_one_by_place = [[] for _ in range(num_cards)] # (cards, is last place, index)[][]
+    for i, (places, cards) in enumerate(constraints.at_least_one):
+        last_place = places[step_of_place[places].argmax()]
+        for place in places:
+            at_least_one_by_place[place].append((cards, place == last_place, i))
+    at_most_by_place = [[] for _ in range(num_cards)] # (cards, limit, index)[][]
+    for i, (places, cards, limit) in enumerate(constraints.at_most):
+        for place in places:
+            at_most_by_place[place].append((cards, limit, i))
+
+    samples = np.arange(num_samples)
+    permutations = np.empty((num_samples, num_cards), dtype=np.intp)
+    is_used = np.zeros((num_samples, num_cards), dtype=bool)
+    has_one = np.zeros((len(constraints.at_least_one), num_samples), dtype=bool)
+    counts = np.zeros((len(constraints.at_most), num_samples), dtype=np.intp)
+    log_weights = np.zeros(num_samples)
+    is_complete = np.ones(num_samples, dtype=bool)
+    for place in order:
+        choices = allowed[place] & ~is_used
+        for cards, limit, i in at_most_by_place[place]:
+            choices[counts[i] >= limit] &= ~cards
+        wanted = np.zeros((num_samples, num_cards), dtype=bool)
+        for cards, is_last_place, i in at_least_one_by_place[place]:
+            if is_last_place:
+                choices[~has_one[i]] &= cards
+            wanted[~has_one[i]] |= cards
+        wanted &= choices
+        num_choices = choices.sum(axis=1)
+        num_wanted = wanted.sum(axis=1)
+        is_complete &= num_choices > 0
+
+        # Half of the samples that can take a wanted card pick among the wanted cards
+        picks_wanted = (num_wanted > 0) & (np_random.random_sample(num_samples) < 0.5)
+        keys = np_random.random_sample((num_samples, num_cards))
+        keys[~np.where(picks_wanted[:, None], wanted, choices)] = -1
+        chosen = keys.argmax(axis=1)
+        permutations[:, place] = chosen
+        is_used[samples, chosen] = True
+        for cards, limit, i in at_most_by_place[place]:
+            counts[i] += cards[chosen]
+        for cards, is_last_place, i in at_least_one_by_place[place]:
+            has_one[i] |= cards[chosen]
+
+        # The probability of the card, picked either way
+        probabilities = 1 / np.maximum(num_choices, 1)
+        probabilities = np.where(num_wanted > 0, probabilities / 2 + wanted[samples, chosen] / (2 * np.maximum(num_wanted, 1)), probabilities)
+        log_weights -= np.log(probabilities)
+    return permutations, log_weights, is_complete
+
+def relabel_card_set(card_set, world):
+    ''' Replace the cards of a card set, in place, by the cards that take their places in a world
+
+    Args:
+        card_set (CardSet): The card set
+        world (list): The ids of the cards that take the place of each card
+    '''
+    mask = 0
+    for card in card_set:
+        mask |= 1 << world[card.get_numeric_index()]
+    card_set.mask = mask
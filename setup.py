@@ -38,10 +38,13 @@ setuptools.setup(
                    'games/uno/jsondata/*',
                    ]},
     install_requires=[
-        'numpy>=1.16.3',
+        'numpy>=1.17',
         'termcolor'
     ],
     extras_require=extras,
+    entry_points={
+        'console_scripts': ['rlcard-bench=rlcard.bench:main'],
+    },
     requires_python='>=3.7',
     classifiers=[
         "Programming Language :: Python :: 3.10",
@@ -51,3 +51,47 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+    def test_batch(self):
+        agent = DQNAgent(state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+        states = [{'obs': np.random.random_sample((2,)), 'legal_actions': {1: None}, 'raw_legal_actions': ['raise']} for _ in range(4)]
+        actions, infos = agent.eval_step_batch(states)
+        self.assertEqual(actions, [1, 1, 1, 1])
+        self.assertEqual(len(infos), 4)
+        self.assertEqual(agent.step_batch(states), [1, 1, 1, 1])
+        predicted_action, _ = agent.eval_step(states[0])
+        self.assertEqual(predicted_action, 1)
+
+    def test_feed_batch(self):
+        agent = DQNAgent(replay_memory_init_size=4,
+                         batch_size=4,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+        transitions = {
+            'obs': np.random.random_sample((6, 2)),
+            'actions': np.array([0, 1, 0, 1, 0, 1]),
+            'rewards': np.array([0, 0, 1, 0, 0, -1], dtype=np.float32),
+            'next_obs': np.random.random_sample((6, 2)),
+            'next_legal_masks': np.ones((6, 2), dtype=bool),
+            'dones': np.array([False, False, True, False, False, True]),
+        }
+        agent.feed_batch(transitions)
+        self.assertEqual(agent.total_t, 6)
+        self.assertEqual(len(agent.memory.memory), 6)
+        self.assertEqual(agent.train_t, 3)
+
+    def test_legal_mask(self):
+        agent = DQNAgent(replay_memory_init_size=4,
+                         batch_size=4,
+                         state_shape=[2],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+        state = {'obs': np.random.random_sample((2,)), 'legal_mask': np.array([False, True])}
+        self.assertEqual(agent.step(state), 1)
+        self.assertEqual(agent.predict(state)[0], -np.inf)
+        for _ in range(8):
+            agent.feed([state, 1, 0, state, False])
+        self.assertEqual(agent.memory.memory[0].legal_mask.tolist(), [False, True])
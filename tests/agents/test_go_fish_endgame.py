@@ -0,0 +1,31 @@
+import unittest
+
+import rlcard
+from rlcard.agents import GoFishEndgameAgent, RandomAgent
+
+class TestGoFishEndgameAgent(unittest.TestCase):
+
+    def test_run(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        agent = GoFishEndgameAgent(env)
+        env.set_agents([agent] + [RandomAgent(env.num_actions, seed=i) for i in range(2)])
+        for _ in range(5):
+            _, payoffs = env.run()
+            self.assertEqual(len(payoffs), 3)
+        self.assertTrue(agent.solver.table)
+
+    def test_eval_step(self):
+        env = rlcard.make('go_fish', config={'seed': 0})
+        agent = GoFishEndgameAgent(env)
+        state, player_id = env.reset()
+        while len(env.game.dealer.deck) > 0:
+            action, info = agent.eval_step(state)
+            self.assertEqual(info, {})
+            state, player_id = env.step(action)
+        if not env.is_over():
+            action, info = agent.eval_step(state)
+            self.assertIn(action, state['legal_actions'])
+            self.assertIn(env.game.action_list[action], info['values'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import gc
+import time
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents import ISMCTSAgent, RandomAgent
+
+def reset_to_choice(env):
+    ''' Reset the environment and play at random until there are several legal actions
+    '''
+    np_random = np.random.RandomState(0)
+    state, player_id = env.reset()
+    while len(state['legal_actions']) < 2:
+        state, player_id = env.step(np_random.choice(list(state['legal_actions'])))
+    return state, player_id
+
+class TestISMCTS(unittest.TestCase):
+
+    def _test_search_leaves_env_unchanged(self, env_id, config=None):
+        env = rlcard.make(env_id, config=dict(seed=0, **(config or {})))
+        state, player_id = reset_to_choice(env)
+        agent = ISMCTSAgent(env, num_iterations=20, seed=0)
+        snapshot = env.game.snapshot()
+        obs = state['obs'].copy()
+
+        action, info = agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+        self.assertEqual(sum(info['visits'].values()), 20)
+        self.assertEqual(env.get_player_id(), player_id)
+        self.assertTrue(np.array_equal(env.get_state(player_id)['obs'], obs))
+        # The random state of the game is untouched, so the game goes on as if it was not searched
+        env.step(action)
+        next_state = env.get_state(env.get_player_id())
+        env.game.restore(snapshot)
+        env._invalidate_states()
+        env.step(action)
+        self.assertTrue(np.array_equal(env.get_state(env.get_player_id())['obs'], next_state['obs']))
+
+    def test_go_fish(self):
+        self._test_search_leaves_env_unchanged('go_fish', {'game_num_players': 3})
+
+    def test_hearts(self):
+        self._test_search_leaves_env_unchanged('hearts', {'game_is_round_mode': True})
+
+    def test_uno(self):
+        self._test_search_leaves_env_unchanged('uno')
+
+    def test_gin_rummy(self):
+        self._test_search_leaves_env_unchanged('gin-rummy')
+
+    def test_run(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        agent = ISMCTSAgent(env, num_iterations=10, seed=0)
+        env.set_agents([agent] + [RandomAgent(env.num_actions, seed=i) for i in range(2)])
+        _, payoffs = env.run()
+        self.assertEqual(len(payoffs), 3)
+
+    def test_time_limit(self):
+        env = rlcard.make('uno', config={'seed': 0})
+        state, _ = reset_to_choice(env)
+        agent = ISMCTSAgent(env, num_iterations=None, time_limit=0.2, seed=0)
+        start = time.perf_counter()
+        _, info = agent.eval_step(state)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertGreater(sum(info['visits'].values()), 0)
+        with self.assertRaises(ValueError):
+            ISMCTSAgent(env, num_iterations=None)
+
+    def _test_parallel(self, env_id, config=None):
+        env = rlcard.make(env_id, config=dict(seed=0, **(config or {})))
+        state, _ = reset_to_choice(env)
+        with ISMCTSAgent(env, num_iterations=10, num_workers=2, seed=0) as agent:
+            action, info = agent.eval_step(state)
+            executor = agent._executor
+        self.assertIsNone(agent._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(len, [])
+        self.assertIn(action, state['legal_actions'])
+        self.assertEqual(sum(info['visits'].values()), 20)
+
+    def test_parallel_without_close(self):
+        env = rlcard.make('uno', config={'seed': 0})
+        state, _ = reset_to_choice(env)
+        agent = ISMCTSAgent(env, num_iterations=10, num_workers=2, seed=0)
+        agent.eval_step(state)
+        executor = agent._executor
+        del agent
+        gc.collect()
+        with self.assertRaises(RuntimeError):
+            executor.submit(len, [])
+
+    def test_parallel(self):
+        self._test_parallel('go_fish', {'game_num_players': 3})
+        self._test_parallel('hearts', {'game_is_round_mode': True})
+        self._test_parallel('uno')
+        self._test_parallel('gin-rummy')
+
+    def test_step_back(self):
+        for env_id in ['go_fish', 'hearts', 'uno', 'gin-rummy']:
+            env = rlcard.make(env_id, config={'seed': 0, 'allow_step_back': True})
+            state, player_id = reset_to_choice(env)
+            obs = state['obs'].copy()
+            num_history = len(env.game.history)
+            action, _ = ISMCTSAgent(env, num_iterations=20, seed=0).eval_step(state)
+            # The search leaves no steps of its own to step back
+            self.assertEqual(len(env.game.history), num_history)
+            self.assertTrue(env.game.allow_step_back)
+            env.step(action)
+            state, _ = env.step_back()
+            self.assertEqual(env.get_player_id(), player_id)
+            self.assertTrue(np.array_equal(state['obs'], obs))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import rlcard
+import rlcard.agents
+
+# The time allowed to import rlcard and make an environment in a new interpreter
+COLD_START_BUDGET = 2.0
+
+def run_python(code):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(rlcard.__file__)))
+    return subprocess.check_output([sys.executable, '-c', code], cwd=root, universal_newlines=True)
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_agents_import(self):
+        output = run_python("import sys, rlcard, rlcard.agents, rlcard.utils; "
+                            "print('torch' in sys.modules, 'subprocess' in sys.modules)")
+        self.assertEqual(output.split(), ['False', 'False'])
+
+    def test_lazy_agent(self):
+        from rlcard.agents import LeducholdemHumanAgent
+        from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent
+        self.assertIs(LeducholdemHumanAgent, HumanAgent)
+        self.assertIn('DQNAgent', dir(rlcard.agents))
+        with self.assertRaises(AttributeError):
+            rlcard.agents.NotAnAgent
+
+    def test_missing_modules(self):
+        lazy_agents = {'FakeAgent': ('rlcard.agents.random_agent:RandomAgent', ('git', 'rlcard_missing_module'))}
+        with mock.patch.dict(rlcard.agents._LAZY_AGENTS, lazy_agents), \
+                mock.patch.dict(rlcard.agents._INSTALL_NAMES, {'git': 'GitPython'}), \
+                mock.patch('importlib.util.find_spec', return_value=None):
+            with self.assertRaises(ImportError) as context:
+                rlcard.agents.FakeAgent
+        self.assertIn('git, rlcard_missing_module', str(context.exception))
+        self.assertIn('pip install GitPython rlcard_missing_module', str(context.exception))
+
+    def test_cold_start(self):
+        code = ("import time; start = time.perf_counter()\n"
+                "import rlcard; rlcard.make('leduc-holdem')\n"
+                "print(time.perf_counter() - start)")
+        elapsed = min(float(run_python(code)) for _ in range(3))
+        self.assertLess(elapsed, COLD_START_BUDGET)
+
+if __name__ == '__main__':
+    unittest.main()
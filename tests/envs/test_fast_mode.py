@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+
+import rlcard
+
+class MaskAgent(object):
+    ''' Play at random from the legal mask, so that fast and slow states give the same actions
+    '''
+
+    def __init__(self, seed):
+        self.use_raw = False
+        self.np_random = np.random.RandomState(seed)
+
+    def step(self, state):
+        return int(self.np_random.choice(np.flatnonzero(state['legal_mask'])))
+
+    def eval_step(self, state):
+        return self.step(state), {}
+
+def _get_key(action):
+    # The Mahjong cards are compared by their names
+    return action.get_str() if hasattr(action, 'get_str') else action
+
+def run(env_id, fast_mode):
+    env = rlcard.make(env_id, config={'seed': 0, 'fast_mode': fast_mode})
+    env.set_agents([MaskAgent(i) for i in range(env.num_players)])
+    trajectories, _ = env.run()
+    return [trajectory[::2] for trajectory in trajectories]
+
+class TestFastMode(unittest.TestCase):
+
+    def _test_trajectory_states(self, env_id):
+        trajectories = run(env_id, False)
+        fast_trajectories = run(env_id, True)
+        self.assertEqual([len(states) for states in fast_trajectories], [len(states) for states in trajectories])
+        for states, fast_states in zip(trajectories, fast_trajectories):
+            # The legal actions of the final states, taken after the game is over, are not meaningful
+            for fast_state in fast_states[-1:]:
+                self.assertIsNotNone(fast_state['raw_obs'])
+                self.assertIsNotNone(fast_state['raw_legal_actions'])
+            self._test_states(states[:-1], fast_states[:-1])
+
+    def _test_states(self, states, fast_states):
+        # The fields of the states are read after the game is over
+        for state, fast_state in zip(states, fast_states):
+            self.assertTrue(np.array_equal(fast_state['obs'], state['obs']))
+            self.assertTrue(np.array_equal(fast_state['legal_mask'], state['legal_mask']))
+            self.assertEqual(sorted(fast_state['legal_actions']), sorted(state['legal_actions']))
+            if isinstance(state['raw_obs'], dict):
+                self.assertEqual(fast_state['raw_obs'].keys(), state['raw_obs'].keys())
+            else:
+                self.assertTrue(np.array_equal(fast_state['raw_obs'], state['raw_obs']))
+            raw_legal_actions = [_get_key(action) for action in state['raw_legal_actions']]
+            fast_raw_legal_actions = [_get_key(action) for action in fast_state['raw_legal_actions']]
+            if len(raw_legal_actions) == len(state['legal_actions']):
+                self.assertEqual(dict(zip(fast_state['legal_actions'], fast_raw_legal_actions)),
+                                 dict(zip(state['legal_actions'], raw_legal_actions)))
+            else:
+                self.assertEqual(fast_raw_legal_actions, raw_legal_actions)
+
+    def test_blackjack(self):
+        self._test_trajectory_states('blackjack')
+
+    def test_doudizhu(self):
+        self._test_trajectory_states('doudizhu')
+
+    def test_limit_holdem(self):
+        self._test_trajectory_states('limit-holdem')
+
+    def test_no_limit_holdem(self):
+        self._test_trajectory_states('no-limit-holdem')
+
+    def test_leduc_holdem(self):
+        self._test_trajectory_states('leduc-holdem')
+
+    def test_uno(self):
+        self._test_trajectory_states('uno')
+
+    def test_mahjong(self):
+        self._test_trajectory_states('mahjong')
+
+    def test_gin_rummy(self):
+        self._test_trajectory_states('gin-rummy')
+
+    def test_go_fish(self):
+        self._test_trajectory_states('go_fish')
+
+    def test_hearts(self):
+        self._test_trajectory_states('hearts')
+
+if __name__ == '__main__':
+    unittest.main()
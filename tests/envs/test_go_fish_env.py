@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.games.go_fish.beliefs import GoFishBeliefs
+from rlcard.utils import reorganize
+
+
+class TestGoFishEnv(unittest.TestCase):
+
+    def test_reset_and_extract_state(self):
+        env = rlcard.make('go_fish', config={'game_num_players': 3})
+        state, _ = env.reset()
+        self.assertEqual(state['obs'].size, env.state_shape[0][0])
+        self.assertEqual(state['obs'].dtype, np.int8)
+        for action in state['legal_actions']:
+            self.assertLess(action, env.num_actions)
+
+    def test_encode_into(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        state, player_id = env.reset()
+        buffer = np.zeros((2, env.state_shape[0][0]), dtype=np.int8)
+        out = env.encode_into(buffer[1])
+        self.assertTrue(np.shares_memory(out, buffer))
+        self.assertTrue(np.array_equal(buffer[1], state['obs']))
+        self.assertFalse(buffer[0].any())
+
+    def test_rollout(self):
+        transitions = []
+        for stream in (False, True):
+            env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+            env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+            np.random.seed(0)
+            if stream:
+                player_transitions = [[] for _ in range(env.num_players)]
+                for player_id, transition in env.rollout(is_training=True):
+                    player_transitions[player_id].append(transition)
+            else:
+                trajectories, payoffs = env.run(is_training=True)
+                player_transitions = reorganize(trajectories, payoffs)
+            transitions.append(player_transitions)
+        for expected, streamed in zip(*transitions):
+            self.assertEqual(len(expected), len(streamed))
+            for (state, action, reward, next_state, done), transition in zip(expected, streamed):
+                obs, streamed_action, streamed_reward, next_obs, next_legal_mask, streamed_done = transition
+                self.assertTrue(np.array_equal(obs, state['obs']))
+                self.assertEqual(streamed_action, action)
+                self.assertEqual(streamed_reward, reward)
+                self.assertTrue(np.array_equal(next_obs, next_state['obs']))
+                self.assertTrue(np.array_equal(next_legal_mask, next_state['legal_mask']))
+                self.assertEqual(streamed_done, done)
+
+    def test_fast_mode(self):
+        config = {'seed': 0, 'game_num_players': 3}
+        env = rlcard.make('go_fish', config=config)
+        fast_env = rlcard.make('go_fish', config=dict(config, fast_mode=True))
+        state, _ = env.reset()
+        fast_state, _ = fast_env.reset()
+        while not env.is_over():
+            self.assertTrue(np.array_equal(state['obs'], fast_state['obs']))
+            self.assertEqual(set(np.flatnonzero(fast_state['legal_mask'])), set(state['legal_actions']))
+            self.assertEqual(list(fast_state['legal_actions']), sorted(state['legal_actions']))
+            raw_actions = dict(zip(fast_state['legal_actions'], fast_state['raw_legal_actions']))
+            self.assertEqual(raw_actions, dict(zip(state['legal_actions'], state['raw_legal_actions'])))
+            self.assertEqual(fast_state['raw_obs'], state['raw_obs'])
+            action = min(state['legal_actions'])
+            state, _ = env.step(action)
+            fast_state, _ = fast_env.step(action)
+        self.assertTrue(fast_env.is_over())
+
+    def test_stored_rank_arrays(self):
+        config = {'seed': 0, 'game_num_players': 3}
+        env = rlcard.make('go_fish', config=config)
+        fast_env = rlcard.make('go_fish', config=dict(config, fast_mode=True))
+        state, _ = env.reset()
+        fast_state, _ = fast_env.reset()
+        states = []
+        while not env.is_over():
+            states.append((state, fast_state))
+            action = min(state['legal_actions'])
+            state, _ = env.step(action)
+            fast_state, _ = fast_env.step(action)
+        # The arrays of a state are the ones of its position, even when read after the game
+        for state, fast_state in states:
+            for key in ['rank_expected_values', 'public_rank_counts', 'hand_rank_counts']:
+                self.assertTrue(np.array_equal(fast_state[key], state[key]))
+            self.assertEqual(set(fast_state), {'obs', 'legal_mask', 'rank_expected_values', 'public_rank_counts', 'hand_rank_counts'})
+
+    def test_step_back(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'allow_step_back': True})
+        state, player_id = env.reset()
+        states = []
+        while not env.is_over():
+            states.append((state, player_id))
+            state, player_id = env.step(min(state['legal_actions']))
+        for state, player_id in reversed(states):
+            next_state, next_player_id = env.step_back()
+            self.assertEqual(next_player_id, player_id)
+            self.assertTrue(np.array_equal(next_state['obs'], state['obs']))
+        self.assertFalse(env.step_back())
+
+    def test_legal_actions_do_not_depend_on_hash_seed(self):
+        code = ("import rlcard; env = rlcard.make('go_fish', config={'seed': 0}); "
+                "state, _ = env.reset(); print(state['raw_legal_actions'])")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(rlcard.__file__)))
+        outputs = set()
+        for hash_seed in ('1', '2', '3'):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            outputs.add(subprocess.check_output([sys.executable, '-c', code], cwd=root, env=env, universal_newlines=True))
+        self.assertEqual(len(outputs), 1)
+
+    def test_state_cache(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'allow_step_back': True, 'profile': True})
+        state, player_id = env.reset()
+        first = env.get_state(player_id)
+        self.assertIs(env.get_state(player_id), first)
+        self.assertTrue(np.array_equal(env.encode_into(np.zeros_like(first['obs']), player_id), first['obs']))
+        self.assertEqual(env.get_profile()['game.get_state']['calls'], 2)
+
+        version = env.state_version
+        env.step(list(state['legal_actions'])[0])
+        self.assertGreater(env.state_version, version)
+        after_step = env.get_state(player_id)
+        self.assertIsNot(after_step, first)
+        env.step_back()
+        self.assertTrue(np.array_equal(env.get_state(player_id)['obs'], first['obs']))
+
+    def test_incremental_rank_expected_values(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 4, 'allow_step_back': True})
+        game = env.game
+        np_random = np.random.RandomState(0)
+        state, player_id = env.reset()
+        num_steps = 0
+        while not env.is_over():
+            current_player = game.players[player_id]
+            beliefs = GoFishBeliefs(game.players)
+            expected_values = beliefs.get_players_rank_expected_values(current_player, game._get_other_players(), len(game.dealer.deck))
+            self.assertEqual(state['raw_obs']['players_rank_expected_values'], expected_values)
+            for player_expected_values in expected_values:
+                for rank, expected_value in player_expected_values.items():
+                    self.assertGreaterEqual(expected_value, current_player.hand_by_rank[rank])
+            num_steps += 1
+            if num_steps % 5 == 0:
+                env.step(np_random.choice(list(state['legal_actions'])))
+                state, player_id = env.step_back()
+            state, player_id = env.step(np_random.choice(list(state['legal_actions'])))
+
+    def test_run(self):
+        env = rlcard.make('go_fish', config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        trajectories, payoffs = env.run(is_training=False)
+        self.assertEqual(len(trajectories), 2)
+        self.assertIn(100, payoffs)
+        trajectories, payoffs = env.run(is_training=True)
+        self.assertAlmostEqual(sum(payoffs), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from .determism_util import is_deterministic
+
+
+class TestHeartsEnv(unittest.TestCase):
+
+    def test_reset_and_extract_state(self):
+        env = rlcard.make('hearts', config={'game_num_players': 4})
+        state, _ = env.reset()
+        self.assertEqual(state['obs'].size, 161 + 58 * 4)
+        self.assertEqual(state['obs'].dtype, np.int8)
+        for action in state['legal_actions']:
+            self.assertLess(action, env.num_actions)
+
+    def test_encode_into(self):
+        env = rlcard.make('hearts', config={'seed': 0, 'game_num_players': 4})
+        state, player_id = env.reset()
+        out = np.ones(env.state_shape[0][0], dtype=np.float32)
+        env.encode_into(out, player_id)
+        self.assertTrue(np.array_equal(out, state['obs']))
+
+    def test_snapshot(self):
+        env = rlcard.make('hearts', config={'seed': 0, 'game_num_players': 4})
+        state, player_id = env.reset()
+        snapshot = env.snapshot()
+        for _ in range(2):
+            for _ in range(10):
+                env.step(min(env.get_state(env.get_player_id())['legal_actions']))
+            env.restore(snapshot)
+            self.assertEqual(env.get_player_id(), player_id)
+            self.assertTrue(np.array_equal(env.get_state(player_id)['obs'], state['obs']))
+            self.assertEqual(env.action_recorder, [])
+
+    def test_is_deterministic(self):
+        self.assertTrue(is_deterministic('hearts'))
+
+    def test_seeded_agents(self):
+        payoffs = []
+        for global_seed in range(2):
+            np.random.seed(global_seed)
+            env = rlcard.make('hearts', config={'seed': 7})
+            env.set_agents([RandomAgent(env.num_actions, seed=i) for i in range(env.num_players)])
+            payoffs.append([tuple(env.run()[1]) for _ in range(2)])
+        self.assertEqual(payoffs[0], payoffs[1])
+
+    def test_run(self):
+        env = rlcard.make('hearts', config={'seed': 0, 'game_is_round_mode': True})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        trajectories, payoffs = env.run(is_training=False)
+        self.assertEqual(len(trajectories), 2)
+        self.assertEqual(sum(payoffs), 26)
+
+if __name__ == '__main__':
+    unittest.main()
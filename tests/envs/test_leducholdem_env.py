@@ -15,6 +15,38 @@ class TestLeducholdemEnv(unittest.TestCase):
         for action in state['legal_actions']:
             self.assertLess(action, env.num_actions)
 
+    def test_encode_into(self):
+        env = rlcard.make('leduc-holdem')
+        state, _ = env.reset()
+        out = np.ones(36, dtype=np.float32)
+        env.encode_into(out)
+        self.assertTrue(np.array_equal(out, state['obs']))
+
+    def test_fast_mode(self):
+        env = rlcard.make('leduc-holdem', config={'fast_mode': True})
+        state, _ = env.reset()
+        self.assertEqual(set(state.keys()), {'obs', 'legal_mask'})
+        self.assertEqual(list(state['legal_actions']), list(np.flatnonzero(state['legal_mask'])))
+        self.assertEqual(len(state['raw_legal_actions']), len(state['legal_actions']))
+        self.assertIn('raw_obs', state)
+        self.assertIsNone(state.get('not_a_field'))
+
+    def test_profile(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'profile': True})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        trajectories, _ = env.run(is_training=False)
+        profile = env.get_profile()
+        num_steps = sum((len(trajectory) - 1) // 2 for trajectory in trajectories)
+        self.assertEqual(profile['game.step']['calls'], num_steps)
+        agent_calls = sum(record['calls'] for name, record in profile.items() if name.startswith('agent'))
+        self.assertEqual(agent_calls, num_steps)
+        self.assertEqual(profile['_extract_state']['calls'], num_steps + 3)
+        self.assertGreater(profile['game.step']['time'], 0)
+        env.reset_profile()
+        self.assertEqual(env.get_profile()['game.step']['calls'], 0)
+        with self.assertRaises(Exception):
+            rlcard.make('leduc-holdem').get_profile()
+
     def test_is_deterministic(self):
         self.assertTrue(is_deterministic('leduc-holdem'))
 
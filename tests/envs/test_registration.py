@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 
 import rlcard
@@ -23,5 +26,24 @@ class TestRegistration(unittest.TestCase):
     def test_make_modes(self):
         register(env_id='test_env', entry_point='rlcard.envs.blackjack:BlackjackEnv')
 
+    def test_lazy_entry_point(self):
+        register(env_id='test_lazy', entry_point='rlcard.envs.not_a_game:NotAGameEnv')
+        with self.assertRaises(ImportError):
+            rlcard.make('test_lazy')
+
+    def test_import_does_not_load_games(self):
+        code = ("import sys, rlcard; "
+                "print(sorted(m for m in sys.modules if m.startswith('rlcard.'))); "
+                "rlcard.make('leduc-holdem'); "
+                "print(sorted(m for m in sys.modules if m.startswith('rlcard.')))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(rlcard.__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=root, universal_newlines=True)
+        before, after = [eval(line) for line in output.splitlines()]
+        # Only the base classes of the games are loaded with rlcard
+        self.assertEqual([m for m in before if m.startswith('rlcard.games.') and m != 'rlcard.games.base'], [])
+        self.assertIn('rlcard.envs.leducholdem', after)
+        self.assertNotIn('rlcard.games.doudizhu', after)
+        self.assertNotIn('rlcard.envs.mahjong', after)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+
+import rlcard
+
+
+class TestVectorEnv(unittest.TestCase):
+
+    def test_reset(self):
+        env = rlcard.make_vec('go_fish', 4, config={'seed': 0})
+        obs, legal_masks, player_ids = env.reset()
+        self.assertEqual(obs.shape, (4, env.state_shape[0]))
+        self.assertEqual(legal_masks.shape, (4, env.num_actions))
+        self.assertEqual(player_ids.shape, (4,))
+        self.assertTrue(legal_masks.any(axis=1).all())
+
+    def test_copies_are_seeded_differently(self):
+        env = rlcard.make_vec('go_fish', 2, config={'seed': 0})
+        obs, _, _ = env.reset()
+        self.assertFalse(np.array_equal(obs[0], obs[1]))
+
+    def test_step_and_auto_reset(self):
+        env = rlcard.make_vec('hearts', 3, config={'seed': 1, 'game_is_round_mode': True})
+        _, legal_masks, _ = env.reset()
+        num_done = 0
+        for _ in range(200):
+            actions = [np.random.choice(np.flatnonzero(mask)) for mask in legal_masks]
+            obs, legal_masks, player_ids, payoffs, dones = env.step(actions)
+            self.assertTrue(legal_masks.any(axis=1).all())
+            self.assertTrue((payoffs[~dones] == 0).all())
+            num_done += dones.sum()
+        self.assertGreater(num_done, 0)
+        for vec_env in env.envs:
+            self.assertFalse(vec_env.is_over())
+
+    def test_state_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            rlcard.make_vec('doudizhu', 2)
+
+    def test_batch_deals(self):
+        decks = []
+        for _ in range(2):
+            env = rlcard.make_vec('limit-holdem', 3, config={'seed': 2}, batch_deals=True)
+            env.reset()
+            decks.append([[str(card) for card in vec_env.game.dealer.deck] for vec_env in env.envs])
+        self.assertEqual(decks[0], decks[1])
+        self.assertEqual(len(set(map(tuple, decks[0]))), 3)
+
+        with self.assertRaises(ValueError):
+            rlcard.make_vec('leduc-holdem', 2, batch_deals=True)
+
+class TestSubprocVectorEnv(unittest.TestCase):
+
+    def test_matches_vector_env(self):
+        config = {'seed': 3, 'game_num_players': 3}
+        local_env = rlcard.make_vec('go_fish', 5, config=config)
+        subproc_env = rlcard.make_vec('go_fish', 5, config=config, num_workers=2)
+        try:
+            self.assertEqual(subproc_env.num_workers, 2)
+            local_results = local_env.reset()
+            subproc_results = subproc_env.reset()
+            for _ in range(50):
+                for local_array, subproc_array in zip(local_results, subproc_results):
+                    self.assertTrue(np.array_equal(local_array, subproc_array))
+                actions = [np.flatnonzero(mask)[0] for mask in local_results[1]]
+                local_results = local_env.step(actions)
+                subproc_results = subproc_env.step(actions)
+        finally:
+            subproc_env.close()
+
+    def test_batch_deals(self):
+        # Each copy deals from its own batch, so the games do not depend on the number of workers
+        config = {'seed': 3, 'game_is_round_mode': True}
+        for num_workers in (1, 2, 3):
+            local_env = rlcard.make_vec('hearts', 4, config=config, batch_deals=True)
+            env = rlcard.make_vec('hearts', 4, config=config, num_workers=num_workers, batch_deals=True)
+            try:
+                local_results = local_env.reset()
+                results = env.reset()
+                for _ in range(100):
+                    for local_array, array in zip(local_results, results):
+                        self.assertTrue(np.array_equal(local_array, array))
+                    actions = [np.flatnonzero(mask)[0] for mask in local_results[1]]
+                    local_results = local_env.step(actions)
+                    results = env.step(actions)
+            finally:
+                env.close()
+
+    def test_profile(self):
+        config = {'seed': 3, 'profile': True}
+        local_env = rlcard.make_vec('leduc-holdem', 4, config=config)
+        subproc_env = rlcard.make_vec('leduc-holdem', 4, config=config, num_workers=2)
+        try:
+            for env in (local_env, subproc_env):
+                _, legal_masks, _ = env.reset()
+                for _ in range(10):
+                    actions = [np.flatnonzero(mask)[0] for mask in legal_masks]
+                    _, legal_masks, _, _, _ = env.step(actions)
+            local_profile = local_env.get_profile()
+            subproc_profile = subproc_env.get_profile()
+            self.assertEqual(local_profile['game.step']['calls'], 40)
+            for name in local_profile:
+                self.assertEqual(local_profile[name]['calls'], subproc_profile[name]['calls'])
+            subproc_env.reset_profile()
+            self.assertEqual(subproc_env.get_profile()['game.step']['calls'], 0)
+        finally:
+            subproc_env.close()
+
+    def test_worker_error(self):
+        env = rlcard.make_vec('go_fish', 2, num_workers=1)
+        env.reset()
+        with self.assertRaises(RuntimeError):
+            env.step([10000, 10000])
+        self.assertTrue(env.closed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import copy
+import pickle
+import unittest
+import numpy as np
+
+from rlcard.games.base import Card, CardSet
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+from rlcard.utils.utils import init_54_deck
+
+
+class TestCard(unittest.TestCase):
+
+    def test_interned(self):
+        self.assertIs(Card('S', 'A'), Card('S', 'A'))
+        self.assertIs(Card(rank='T', suit='H'), Card('H', 'T'))
+        for card in init_54_deck():
+            self.assertIs(Card.from_index(card.get_numeric_index()), card)
+            self.assertIs(copy.deepcopy(card), card)
+            self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+    def test_from_index(self):
+        self.assertEqual(str(Card.from_index(0)), '2S')
+        self.assertEqual(str(Card.from_index(51)), 'AC')
+        self.assertEqual(Card.from_index(52).suit, 'BJ')
+        self.assertEqual(Card.from_index(53).suit, 'RJ')
+        self.assertEqual([card.get_numeric_index() for card in map(Card.from_index, range(54))], list(range(54)))
+
+    def test_compare(self):
+        self.assertLess(Card('C', '2'), Card('S', '3'))
+        self.assertLess(Card('S', 'K'), Card('H', 'K'))
+        self.assertLess(Card('C', 'A'), Card('BJ', ''))
+        self.assertEqual(sorted([Card('H', 'A'), Card('S', 'T'), Card('D', '2')]), [Card('D', '2'), Card('S', 'T'), Card('H', 'A')])
+        self.assertNotEqual(Card('S', 'A'), 'AS')
+        self.assertEqual(len({Card('S', 'A'), Card('S', 'A'), Card('H', 'A')}), 2)
+
+    def test_immutable(self):
+        card = Card('S', 'A')
+        with self.assertRaises(AttributeError):
+            card.rank = 'K'
+        with self.assertRaises(AttributeError):
+            card.owner = 0
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Card('S', '1')
+
+class TestCardSet(unittest.TestCase):
+
+    def test_set_operations(self):
+        cards = [Card('S', 'A'), Card('H', '2'), Card('C', 'K')]
+        card_set = CardSet(cards)
+        self.assertEqual(len(card_set), 3)
+        self.assertEqual(card_set, set(cards))
+        self.assertEqual(list(card_set), sorted(cards, key=lambda card: card.get_numeric_index()))
+        self.assertIn(Card('H', '2'), card_set)
+        self.assertNotIn(Card('D', '2'), card_set)
+        self.assertEqual(card_set & CardSet.of_rank('A'), CardSet([Card('S', 'A')]))
+        self.assertEqual(card_set - CardSet.of_suit('S'), {Card('H', '2'), Card('C', 'K')})
+        self.assertEqual(len(card_set | CardSet.of_rank('A')), 6)
+        card_set.remove(Card('S', 'A'))
+        card_set.discard(Card('S', 'A'))
+        with self.assertRaises(KeyError):
+            card_set.remove(Card('S', 'A'))
+        card_set.update([Card('BJ', '')])
+        self.assertEqual(len(card_set), 3)
+        card_set.clear()
+        self.assertFalse(card_set)
+
+    def test_one_hot(self):
+        card_set = CardSet([Card('S', '2'), Card('C', 'A'), Card('RJ', '')])
+        one_hot = card_set.to_one_hot(54)
+        self.assertEqual(one_hot.dtype, np.int8)
+        self.assertEqual(one_hot.nonzero()[0].tolist(), [0, 51, 53])
+        out = np.ones(52, dtype=np.float32)
+        card_set.encode_into(out)
+        self.assertEqual(out.nonzero()[0].tolist(), [0, 51])
+
+    def test_snapshot(self):
+        class Holder(object):
+            pass
+        holder = Holder()
+        holder.hand = CardSet([Card('S', 'A')])
+        hand = holder.hand
+        snapshot = take_snapshot([holder])
+        hand.add(Card('H', 'A'))
+        restore_snapshot(snapshot)
+        self.assertIs(holder.hand, hand)
+        self.assertEqual(hand, CardSet([Card('S', 'A')]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,6 +79,18 @@ class TestGinRummyGame(unittest.TestCase):
             _, _ = game.step(action)
         self.assertEqual(game.actions[-1].action_id, score_player_1_action_id)
 
+    def test_step_back(self):
+        game = Game(allow_step_back=True)
+        _, current_player = game.init_game()
+        self.assertEqual(game.step_back(), False)
+        state = game.get_state(current_player)
+        action = np.random.choice(game.judge.get_legal_actions())
+        game.step(action)
+        self.assertEqual(game.step_back(), True)
+        self.assertEqual(game.get_player_id(), current_player)
+        self.assertEqual(game.get_state(current_player), state)
+        self.assertEqual(len(game.actions), 0)
+
     def test_get_state(self):
         game = Game()
         state, _ = game.init_game()
@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard import models
+from rlcard.games.base import Card, CardSet
+from rlcard.games.go_fish.endgame import GoFishEndgameSolver
+from rlcard.games.go_fish.player import GoFishPlayer as Player
+
+class TestGoFishPlayerMethods(unittest.TestCase):
+
+    def test_reveal_matching_possible_sets(self):
+        player = Player(0, np.random.RandomState(0), False)
+        two, three, nine = Card('S', '2'), Card('S', '3'), Card('H', '9')
+        player.receive_cards([two, three, nine], False)
+        player.mark_rank_as_requested('2')
+        self.assertEqual(player.public_possible_cards_of_rank['2'], CardSet([two, three, nine]))
+        player.remove_cards_of_rank('9')
+        player.mark_rank_as_requested('3')
+        # Two ranks are known to be among the same two cards
+        self.assertEqual(player.public_cards, {'2': CardSet([two]), '3': CardSet([three])})
+        self.assertEqual(player.public_possible_cards_of_rank, {})
+        self.assertFalse(player.non_public_cards_in_hand)
+
+    def test_reveal_card_of_one_possible_rank(self):
+        player = Player(0, np.random.RandomState(0), False)
+        king = Card('S', 'K')
+        player.receive_cards([king], False)
+        other_ranks = [rank for rank in Card.valid_rank if rank != 'K']
+        for rank in other_ranks[:-1]:
+            player.remove_cards_of_rank(rank)
+        self.assertIn(king, player.non_public_cards_in_hand)
+        player.remove_cards_of_rank(other_ranks[-1])
+        self.assertEqual(player.public_cards, {'K': CardSet([king])})
+        self.assertEqual(player.public_not_possible_cards_of_rank, {})
+
+    def test_reveal_card_of_one_possible_rank_after_book(self):
+        player = Player(0, np.random.RandomState(0), False)
+        king = Card('S', 'K')
+        player.receive_cards([king], False)
+        for rank in ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J']:
+            player.remove_cards_of_rank(rank)
+        self.assertIn(king, player.non_public_cards_in_hand)
+        # Once the queens are in a book, the king can only be a king
+        player.mark_book_completed('Q')
+        player.mark_book_completed('A')
+        self.assertEqual(player.public_cards, {'K': CardSet([king])})
+
+def play_to_endgame(env, solver):
+    ''' Play with the V3 rule agent until the endgame can be solved
+    '''
+    agent = models.load('go-fish-v3').agents[0]
+    state, _ = env.reset()
+    while not env.is_over() and not solver.can_solve(env.game):
+        state, _ = env.step(agent.step(state), agent.use_raw)
+
+class TestGoFishEndgameSolver(unittest.TestCase):
+
+    def test_values(self):
+        for num_players in [2, 3, 4]:
+            env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': num_players})
+            solver = GoFishEndgameSolver()
+            play_to_endgame(env, solver)
+            game = env.game
+            player_id = game.get_player_id()
+            values = solver.get_values(game)
+            expected_values = solver.get_expected_values(game, player_id)
+            self.assertEqual(values.sum(), 13)
+            self.assertAlmostEqual(expected_values.sum(), 13)
+            action_values = solver.get_action_values(game)
+            self.assertTrue(set(action_values) <= set(game.get_legal_actions()))
+            self.assertAlmostEqual(max(action_values.values()), expected_values[player_id])
+
+            # Every player playing the solved requests makes the books of the actual deal
+            while not game.is_over():
+                action_values = solver.get_action_values(game)
+                game.step(max(action_values, key=action_values.get))
+            self.assertEqual([len(player.books) for player in game.players], values.tolist())
+
+    def test_table_size(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        for max_table_size, is_cleared in [(0, True), (100000, False)]:
+            solver = GoFishEndgameSolver(max_table_size=max_table_size)
+            play_to_endgame(env, solver)
+            values = solver.get_values(env.game)
+            table = solver.table
+            self.assertTrue(table)
+            # A table that grew past the size is cleared before the next solve
+            self.assertTrue(np.array_equal(solver.get_values(env.game), values))
+            self.assertEqual(solver.table is not table, is_cleared)
+
+    def test_deck_not_empty(self):
+        env = rlcard.make('go_fish', config={'seed': 0})
+        env.reset()
+        solver = GoFishEndgameSolver()
+        self.assertFalse(solver.can_solve(env.game))
+        with self.assertRaises(ValueError):
+            solver.get_values(env.game)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -99,6 +99,23 @@ class TestLimitHoldemMethods(unittest.TestCase):
             action = np.random.choice(legal_actions)
             game.step(action)
 
+    def test_snapshot(self):
+        game = Game()
+        game.init_game()
+        game.step('raise')
+        snapshot = game.snapshot()
+        state = game.get_state(game.get_player_id())
+        player_id = game.get_player_id()
+        deck_size = len(game.dealer.deck)
+        for _ in range(2):
+            while not game.is_over():
+                game.step(np.random.choice(game.get_legal_actions()))
+            game.restore(snapshot)
+            self.assertEqual(game.get_player_id(), player_id)
+            self.assertEqual(game.get_state(player_id), state)
+            self.assertEqual(len(game.dealer.deck), deck_size)
+            self.assertEqual(game.history_raise_nums, [1, 0, 0, 0])
+
     def test_payoffs(self):
         game = Game()
         np.random.seed(0)
@@ -8,6 +8,10 @@ from rlcard.models.limitholdem_rule_models import LimitholdemRuleModelV1
 from rlcard.models.doudizhu_rule_models import DouDizhuRuleModelV1
 
 from rlcard.models.gin_rummy_rule_models import GinRummyNoviceRuleModel
+from rlcard.models.go_fish_rule_models import GoFishVectorRuleModelV1, GoFishVectorRuleModelV2, GoFishVectorRuleModelV3
+
+import numpy as np
+import rlcard
 
 
 class TestModel(unittest.TestCase):
@@ -21,6 +25,20 @@ class TestModel(unittest.TestCase):
         self.assertIsInstance(model, LeducHoldemCFRModel)
         self.assertIsInstance(model.agents, list)
 
+    def test_leduc_holdem_cfr_model_policy(self):
+        # The policy is keyed on the observations whatever their dtype
+        agent = LeducHoldemCFRModel().agents[0]
+        env = agent.env
+        np_random = np.random.RandomState(0)
+        num_states, num_hits = 0, 0
+        for _ in range(20):
+            state, player_id = env.reset()
+            while not env.is_over():
+                num_states += 1
+                num_hits += agent.get_state(player_id)[0] in agent.average_policy
+                state, player_id = env.step(np_random.choice(list(state['legal_actions'])))
+        self.assertEqual(num_hits, num_states)
+
     def test_leduc_holdem_rule_model_v1(self):
         model = LeducHoldemRuleModelV1()
         self.assertIsInstance(model, LeducHoldemRuleModelV1)
@@ -112,6 +130,47 @@ class TestModel(unittest.TestCase):
         self.assertIsInstance(model, GinRummyNoviceRuleModel)
         self.assertIsInstance(model.agents, list)
 
+    def test_go_fish_vector_rule_models(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        agents = [model().agents[0] for model in (GoFishVectorRuleModelV1, GoFishVectorRuleModelV2, GoFishVectorRuleModelV3)]
+        np_random = np.random.RandomState(0)
+        states = []
+        state, _ = env.reset()
+        while not env.is_over():
+            for agent in agents:
+                self.assertIn(agent.step(state), state['legal_actions'])
+            # The version 3 agent requests a rank of the highest expected quantity
+            raw_obs = state['raw_obs']
+            action = env.game.action_list[agents[2].step(state)]
+            expected_values = {legal_action: raw_obs['players_rank_expected_values'][int(legal_action[0]) - 1][legal_action[2]] for legal_action in state['raw_legal_actions']}
+            self.assertEqual(expected_values[action], max(expected_values.values()))
+            states.append(state)
+            state, _ = env.step(np_random.choice(list(state['legal_actions'])))
+
+        for agent in agents:
+            actions, _ = agent.eval_step_batch(states)
+            self.assertEqual(len(actions), len(states))
+            for action, state in zip(actions, states):
+                self.assertIn(action, state['legal_actions'])
+
+    def test_seeded_rule_models(self):
+        def play(model_id, env_id, global_seed):
+            np.random.seed(global_seed)
+            env = rlcard.make(env_id, config={'seed': 0})
+            agents = rlcard.models.load(model_id, seed=0).agents
+            actions = []
+            state, player_id = env.reset()
+            while not env.is_over():
+                agent = agents[player_id]
+                action = agent.step(state)
+                actions.append(str(action))
+                state, player_id = env.step(action, agent.use_raw)
+            return actions
+
+        # The agents draw from their own streams, whatever the global random state
+        for model_id, env_id in (('go-fish-v1', 'go_fish'), ('go-fish-v2', 'go_fish'), ('go-fish-v3', 'go_fish'),
+                                 ('go-fish-vector-v1', 'go_fish'), ('uno-rule-v1', 'uno'), ('gin-rummy-novice-rule', 'gin-rummy')):
+            self.assertEqual(play(model_id, env_id, 1), play(model_id, env_id, 2))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+
+from rlcard.bench import bench_env, run_benchmarks, compare_reports, main
+
+
+class TestBench(unittest.TestCase):
+
+    def test_bench_env(self):
+        result = bench_env('leduc-holdem', num_games=5, alloc_games=1)
+        self.assertEqual(result['num_players'], 2)
+        self.assertEqual(result['num_games'], 5)
+        self.assertGreaterEqual(result['num_steps'], 5)
+        self.assertGreater(result['steps_per_second'], 0)
+        self.assertGreater(result['alloc_peak_bytes_per_step'], 0)
+
+    def test_is_deterministic(self):
+        first = bench_env('go_fish', num_games=3, alloc_games=0, seed=1)
+        second = bench_env('go_fish', num_games=3, alloc_games=0, seed=1)
+        self.assertEqual(first['num_steps'], second['num_steps'])
+
+    def test_num_players(self):
+        report = run_benchmarks(['go_fish'], num_games=2, alloc_games=0, isolate=False, num_players=[4, 6])
+        self.assertEqual(sorted(report['envs']), ['go_fish-4p', 'go_fish-6p'])
+        self.assertEqual(report['envs']['go_fish-6p']['num_players'], 6)
+        self.assertEqual(report['meta']['num_players'], [4, 6])
+
+    def test_report(self):
+        report = run_benchmarks(['blackjack', 'not-an-env'], num_games=2, alloc_games=1, isolate=False)
+        self.assertEqual(report['meta']['num_games'], 2)
+        self.assertIn('steps_per_second', report['envs']['blackjack'])
+        self.assertIn('error', report['envs']['not-an-env'])
+        ratios = compare_reports(report, report)
+        self.assertEqual(list(ratios), ['blackjack'])
+        self.assertAlmostEqual(ratios['blackjack']['steps_per_second'], 1)
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            main(['--env', 'leduc-holdem', '--games', '2', '--alloc-games', '1', '--output', path])
+            with open(path) as f:
+                report = json.load(f)
+            self.assertIn('leduc-holdem', report['envs'])
+            self.assertNotIn('error', report['envs']['leduc-holdem'])
+            main(['--env', 'leduc-holdem', '--games', '2', '--alloc-games', '1', '--no-isolate', '--output', path, '--baseline', path])
+
+if __name__ == '__main__':
+    unittest.main()
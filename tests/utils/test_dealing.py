@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+
+from rlcard.games.base import Card
+from rlcard.utils.dealing import STANDARD_DECK_IDS, DeckBatch, shuffle_deck_ids, cards_from_ids
+from rlcard.utils.utils import init_standard_deck
+
+
+class TestDealing(unittest.TestCase):
+
+    def test_same_as_shuffling_cards(self):
+        deck = init_standard_deck()
+        np.random.RandomState(5).shuffle(deck)
+        card_ids = shuffle_deck_ids(np.random.RandomState(5))
+        self.assertEqual(cards_from_ids(card_ids), deck)
+        self.assertIs(cards_from_ids(card_ids)[0], Card.from_index(int(card_ids[0])))
+
+    def test_multiple_decks(self):
+        card_ids = shuffle_deck_ids(np.random.RandomState(0), np.tile(STANDARD_DECK_IDS, 2))
+        self.assertEqual(sorted(card_ids.tolist()), sorted(STANDARD_DECK_IDS.tolist() * 2))
+
+    def test_deck_batch(self):
+        deck_batch = DeckBatch(3, seed=0)
+        decks = [shuffle_deck_ids(None, deck_batch=deck_batch) for _ in range(7)]
+        for card_ids in decks:
+            self.assertEqual(sorted(card_ids.tolist()), list(range(52)))
+        self.assertEqual(len(set(map(tuple, decks))), 7)
+        other_batch = DeckBatch(3, seed=0)
+        self.assertTrue(np.array_equal(shuffle_deck_ids(None, deck_batch=other_batch), decks[0]))
+
+if __name__ == '__main__':
+    unittest.main()
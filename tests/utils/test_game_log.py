@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.models import load
+from rlcard.utils import GameRecord, GameLog, replay
+
+
+class TestGameLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        record = GameRecord('uno', {'game_num_players': 2}, 2 ** 63 - 1, [1.5, -1.5], [3, 60, 0])
+        data = record.to_bytes()
+        decoded, end = GameRecord.from_buffer(data)
+        self.assertEqual(end, len(data))
+        self.assertEqual(decoded.env_id, 'uno')
+        self.assertEqual(decoded.config, {'game_num_players': 2})
+        self.assertEqual(decoded.seed, 2 ** 63 - 1)
+        self.assertEqual(decoded.payoffs.tolist(), [1.5, -1.5])
+        self.assertEqual(decoded.actions.tolist(), [3, 60, 0])
+        self.assertEqual(decoded.actions.dtype, np.uint8)
+        record.actions = [300]
+        self.assertEqual(GameRecord.from_buffer(record.to_bytes())[0].actions.dtype, np.uint16)
+        with self.assertRaises(ValueError):
+            GameRecord.from_buffer(b'XXXX' + data[4:])
+
+    def test_replay(self):
+        env = rlcard.make('hearts', config={'seed': 3, 'game_log': self.path})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        observations = []
+        for _ in range(3):
+            state, _ = env.reset()
+            game_observations = [state['obs'].copy()]
+            while not env.is_over():
+                state, _ = env.step(np.random.choice(list(state['legal_actions'])))
+                game_observations.append(state['obs'].copy())
+            observations.append(game_observations)
+
+        with GameLog(self.path) as log:
+            self.assertEqual(len(log), 3)
+            for record, game_observations in zip(log, observations):
+                self.assertEqual(record.env_id, 'hearts')
+                self.assertEqual(len(record.actions), len(game_observations) - 1)
+                for num_steps in (0, 10, len(record.actions)):
+                    replayed_env = replay(record, num_steps)
+                    player_id = replayed_env.get_player_id()
+                    # The observation after a step is that of the next player
+                    self.assertTrue(np.array_equal(replayed_env.get_state(player_id)['obs'], game_observations[num_steps]))
+                self.assertTrue(replayed_env.is_over())
+                self.assertTrue(np.allclose(replayed_env.get_payoffs(), record.payoffs))
+
+    def test_raw_actions(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 3, 'game_log': self.path})
+        env.set_agents(load('leduc-holdem-rule-v1').agents)
+        env.run()
+        with GameLog(self.path) as log:
+            replayed_env = replay(log[0])
+        self.assertEqual(replayed_env.action_recorder, env.action_recorder)
+
+    def test_step_back(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 3, 'game_log': self.path, 'allow_step_back': True})
+        env.reset()
+        env.step(0)
+        env.step_back()
+        self.assertEqual(env.logged_actions, [])
+
+    def test_close(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 3, 'game_log': self.path})
+        env.set_agents(load('leduc-holdem-rule-v1').agents)
+        env.run()
+        writer = env.game_log
+        env.close()
+        self.assertTrue(writer._file.closed)
+        env.run()
+        with GameLog(self.path) as log:
+            self.assertEqual(len(log), 1)
+
+        vec_env = rlcard.make_vec('leduc-holdem', 2, config={'seed': 3, 'game_log': self.path})
+        writers = [env.game_log for env in vec_env.envs]
+        vec_env.close()
+        self.assertTrue(all(writer._file.closed for writer in writers))
+
+        subproc_env = rlcard.make_vec('leduc-holdem', 2, config={'seed': 3, 'game_log': self.path}, num_workers=2)
+        _, legal_masks, _ = subproc_env.reset()
+        num_games = 0
+        for _ in range(20):
+            _, legal_masks, _, _, dones = subproc_env.step([np.flatnonzero(mask)[0] for mask in legal_masks])
+            num_games += dones.sum()
+        subproc_env.close()
+        with GameLog(self.path) as log:
+            self.assertEqual(len(log), 1 + num_games)
+
+    def test_empty_log(self):
+        open(self.path, 'wb').close()
+        with GameLog(self.path) as log:
+            self.assertEqual(len(log), 0)
+
+if __name__ == '__main__':
+    unittest.main()
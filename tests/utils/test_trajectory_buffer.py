@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils import TrajectoryBuffer, reorganize
+
+
+class TestTrajectoryBuffer(unittest.TestCase):
+
+    def _make_env(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 3})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        return env
+
+    def test_matches_reorganize(self):
+        env = self._make_env()
+        np.random.seed(0)
+        expected = []
+        for _ in range(2):
+            trajectories, payoffs = env.run(is_training=True)
+            expected.append(reorganize(trajectories, payoffs))
+
+        env = self._make_env()
+        np.random.seed(0)
+        buffer = TrajectoryBuffer(env.state_shape[0], env.num_actions, capacity=4, obs_dtype=env.obs_dtype)
+        for _ in range(2):
+            buffer.record(env, is_training=True)
+        transitions = buffer.transitions()
+
+        i = 0
+        for player_transitions in expected:
+            for player_id, player_trajectory in enumerate(player_transitions):
+                for state, action, reward, next_state, done in player_trajectory:
+                    self.assertEqual(transitions['player_ids'][i], player_id)
+                    self.assertTrue(np.array_equal(transitions['obs'][i], state['obs']))
+                    self.assertEqual(transitions['actions'][i], action)
+                    self.assertAlmostEqual(transitions['rewards'][i], reward, places=5)
+                    self.assertTrue(np.array_equal(transitions['next_obs'][i], next_state['obs']))
+                    self.assertTrue(np.array_equal(transitions['next_legal_masks'][i], next_state['legal_mask']))
+                    self.assertEqual(transitions['dones'][i], done)
+                    i += 1
+        self.assertEqual(i, len(transitions['actions']))
+
+    def test_record_one_player(self):
+        env = self._make_env()
+        buffer = TrajectoryBuffer(env.state_shape[0], env.num_actions, obs_dtype=env.obs_dtype)
+        payoffs = buffer.record(env, player_ids=[1])
+        transitions = buffer.transitions()
+        self.assertTrue((transitions['player_ids'] == 1).all())
+        self.assertEqual(transitions['dones'].sum(), 1)
+        self.assertEqual(transitions['rewards'][-1], payoffs[1])
+        self.assertEqual(len(buffer.transitions(player_id=0)['actions']), 0)
+
+    def test_unfinished_game_and_clear(self):
+        buffer = TrajectoryBuffer([2], 3)
+        buffer.add(np.ones(2), np.array([True, False, True]), 0, 2)
+        buffer.add(np.zeros(2), np.array([True, True, True]), 0, 1)
+        self.assertEqual(len(buffer.transitions()['actions']), 0)
+        buffer.add(np.zeros(2), np.array([False, False, False]), 0)
+        buffer.end_episode([1, -1])
+        transitions = buffer.transitions()
+        self.assertEqual(transitions['actions'].tolist(), [2, 1])
+        self.assertEqual(transitions['rewards'].tolist(), [0, 1])
+        self.assertEqual(transitions['dones'].tolist(), [False, True])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(len(buffer.transitions()['actions']), 0)
+
+    def test_save(self):
+        env = self._make_env()
+        buffer = TrajectoryBuffer(env.state_shape[0], env.num_actions, obs_dtype=env.obs_dtype)
+        buffer.record(env)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'transitions.npz')
+            buffer.save(path)
+            with np.load(path) as data:
+                transitions = buffer.transitions()
+                for key in transitions:
+                    self.assertTrue(np.array_equal(data[key], transitions[key]))
+
+if __name__ == '__main__':
+    unittest.main()
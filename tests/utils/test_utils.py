@@ -1,11 +1,20 @@
 import unittest
 import numpy as np
-from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament
+from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament, run_batch, tournament_batch, tournament_random_opponents_batch, remove_illegal, get_legal_mask, random_argmax
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
 
 class TestUtils(unittest.TestCase):
 
+    def test_spawn_seeds(self):
+        from rlcard.utils.seeding import spawn_seeds, np_random
+        first = [np_random(seed)[0].randint(1000000) for seed in spawn_seeds(3, 4)]
+        second = [np_random(seed)[0].randint(1000000) for seed in spawn_seeds(3, 4)]
+        self.assertEqual(first, second)
+        self.assertEqual(len(set(first)), 4)
+        # The first streams do not change with the number of streams
+        self.assertEqual(first[:2], [np_random(seed)[0].randint(1000000) for seed in spawn_seeds(3, 2)])
+
     def test_init_standard_deck(self):
         self.assertEqual(len(init_standard_deck()), 52)
 
@@ -35,11 +44,59 @@ class TestUtils(unittest.TestCase):
         trajectories = reorganize([[[1,2],1,[4,5]]], [1])
         self.assertEqual(np.array(trajectories).shape, (1, 1, 5))
 
+    def test_remove_illegal(self):
+        action_probs = np.array([0.2, 0.3, 0.5])
+        probs = remove_illegal(action_probs, [0, 1])
+        self.assertTrue(np.allclose(probs, [0.4, 0.6, 0]))
+        probs = remove_illegal(action_probs, np.array([False, True, True]))
+        self.assertTrue(np.allclose(probs, [0, 0.375, 0.625]))
+        probs = remove_illegal(np.zeros(3), np.array([True, False, True]))
+        self.assertTrue(np.allclose(probs, [0.5, 0, 0.5]))
+
+    def test_random_argmax(self):
+        scores = np.array([[1, 3, 3, 5], [2, 2, 0, 2]])
+        legal_mask = np.array([[True, True, True, False], [True, False, True, True]])
+        actions = np.array([random_argmax(scores, legal_mask, np.random.RandomState(seed)) for seed in range(100)])
+        self.assertEqual(set(actions[:, 0]), {1, 2})
+        self.assertEqual(set(actions[:, 1]), {0, 3})
+
+    def test_get_legal_mask(self):
+        env = rlcard.make('leduc-holdem')
+        state, _ = env.reset()
+        self.assertEqual(state['legal_mask'].dtype, np.bool_)
+        self.assertEqual(list(np.flatnonzero(state['legal_mask'])), sorted(state['legal_actions']))
+        legal_mask = get_legal_mask({'legal_actions': {1: None, 3: None}}, 4)
+        self.assertEqual(legal_mask.tolist(), [False, True, False, True])
+
     def test_tournament(self):
         env = rlcard.make('leduc-holdem')
         env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
         payoffs = tournament(env,1000)
         self.assertEqual(len(payoffs), 2)
 
+    def test_run_batch(self):
+        envs = [rlcard.make('go_fish', config={'seed': i}) for i in range(3)]
+        for env in envs:
+            env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        results = run_batch(envs)
+        self.assertEqual(len(results), 3)
+        for env, (trajectories, payoffs) in zip(envs, results):
+            self.assertTrue(env.is_over())
+            self.assertEqual(len(trajectories), 2)
+            self.assertEqual(len(payoffs), 2)
+
+    def test_tournament_batch(self):
+        envs = [rlcard.make('leduc-holdem', config={'seed': i}) for i in range(4)]
+        for env in envs:
+            env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        payoffs = tournament_batch(envs, 100)
+        self.assertEqual(len(payoffs), 2)
+
+    def test_tournament_random_opponents_batch(self):
+        envs = [rlcard.make('go_fish', config={'seed': i, 'game_num_players': 3}) for i in range(4)]
+        opponents = [RandomAgent(envs[0].num_actions, seed=i) for i in range(2)]
+        payoffs = tournament_random_opponents_batch(envs, 10, RandomAgent(envs[0].num_actions), opponents)
+        self.assertEqual(len(payoffs), 3)
+
 if __name__ == '__main__':
     unittest.main()
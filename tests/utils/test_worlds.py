@@ -0,0 +1,106 @@
+import itertools
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.games.base import Card
+from rlcard.utils.worlds import WorldConstraints, sample_worlds, sample_permutations
+
+
+def _play(env, num_steps, seed):
+    np_random = np.random.RandomState(seed)
+    state, player_id = env.reset()
+    for _ in range(num_steps):
+        if env.is_over():
+            break
+        state, player_id = env.step(np_random.choice(list(state['legal_actions'])))
+    return player_id
+
+def _public_state(env, player_id):
+    state = env.game.get_state(player_id)
+    return {key: value for key, value in state.items() if key != 'players_rank_expected_values'}
+
+
+class TestWorlds(unittest.TestCase):
+
+    def test_weights_are_unbiased(self):
+        allowed = np.array([[1, 1, 0, 1],
+                            [1, 1, 1, 1],
+                            [0, 1, 1, 1],
+                            [1, 1, 1, 0]], dtype=bool)
+        # Places 0 and 1 must take one of items 2 and 3, and places 1 and 3 at most one of items 0 and 1
+        constraints = WorldConstraints(np.arange(4), allowed, [([0, 1], [False, False, True, True])], [([1, 3], [True, True, False, False], 1)])
+        permutations, weights = sample_permutations(constraints, 20000, np.random.RandomState(0))
+        valid = [p for p in itertools.permutations(range(4)) if all(allowed[i, j] for i, j in enumerate(p))
+                 and (p[0] >= 2 or p[1] >= 2) and (p[1] < 2) + (p[3] < 2) <= 1]
+        self.assertAlmostEqual(weights.sum(), 1)
+        frequencies = {}
+        for permutation, weight in zip(map(tuple, permutations), weights):
+            frequencies[permutation] = frequencies.get(permutation, 0) + weight
+        self.assertEqual(set(frequencies), set(valid))
+        for frequency in frequencies.values():
+            self.assertAlmostEqual(frequency, 1 / len(valid), delta=0.02)
+
+    def test_go_fish_worlds(self):
+        env = rlcard.make('go_fish', config={'seed': 0, 'game_num_players': 4})
+        for seed in range(5):
+            player_id = _play(env, 15 + 5 * seed, seed)
+            game = env.game
+            observer = game.players[player_id]
+            worlds, weights = sample_worlds(game, player_id, 50, np.random.RandomState(seed))
+            self.assertEqual(worlds.shape, (50, 52))
+            self.assertAlmostEqual(weights.sum(), 1)
+            public_state = _public_state(env, player_id)
+            snapshot = game.snapshot()
+            for world in worlds:
+                self.assertEqual(sorted(world), list(range(52)))
+                game.apply_world(world)
+                self.assertEqual(_public_state(env, player_id), public_state)
+                for player in game.players:
+                    for rank, cards in player.public_not_possible_cards_of_rank.items():
+                        self.assertTrue(all(card.rank != rank for card in cards))
+                    for rank, cards in player.public_possible_cards_of_rank.items():
+                        self.assertTrue(any(card.rank == rank for card in cards))
+                    self.assertTrue(all(quantity < 4 for quantity in player.hand_by_rank.values()))
+                game.restore(snapshot)
+            self.assertEqual(observer.hand, public_state['player_hand'])
+
+    def test_hearts_worlds(self):
+        env = rlcard.make('hearts', config={'seed': 0, 'game_num_players': 4})
+        for seed in range(5):
+            player_id = _play(env, 12 * seed, seed)
+            game = env.game
+            worlds, _ = sample_worlds(game, player_id, 50, np.random.RandomState(seed))
+            state = game.get_state(player_id)
+            snapshot = game.snapshot()
+            hand_sizes = [len(player.hand) for player in game.players]
+            for world in worlds:
+                game.apply_world(world)
+                self.assertEqual(game.get_state(player_id), state)
+                self.assertEqual([len(player.hand) for player in game.players], hand_sizes)
+                for player in game.players:
+                    for suit in Card.valid_suit[:4]:
+                        if player.public_void_suits[suit]:
+                            self.assertTrue(player.is_void_of_suit(suit))
+                game.restore(snapshot)
+
+    def test_gin_rummy_worlds(self):
+        env = rlcard.make('gin-rummy', config={'seed': 0})
+        for seed in range(5):
+            player_id = _play(env, 10 * seed, seed)
+            game = env.game
+            worlds, _ = sample_worlds(game, player_id, 20, np.random.RandomState(seed))
+            state = game.get_state(player_id)
+            snapshot = game.snapshot()
+            opponent = game.round.players[(player_id + 1) % 2]
+            for world in worlds:
+                game.apply_world(world)
+                world_state = game.get_state(player_id)
+                self.assertEqual(sorted(world_state.pop('unknown_cards')), sorted(state['unknown_cards']))
+                self.assertEqual(world_state, {key: value for key, value in state.items() if key != 'unknown_cards'})
+                for card in opponent.known_cards:
+                    self.assertIn(card, opponent.hand)
+                game.restore(snapshot)
+
+if __name__ == '__main__':
+    unittest.main()